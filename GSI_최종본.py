@@ -1,100 +1,95 @@
 import sqlite3
+import time
+from collections import deque
+import numpy as np
 import streamlit as st
 import pandas as pd
-from openpyxl import Workbook
-from openpyxl.styles import Border, Side, Alignment, Font
-
-# SQLite 데이터베이스와 연결하는 함수
-def connect_db():
-    return sqlite3.connect('restaurant_menu.db')
+from gsi_core.bulk_import import import_file
+from gsi_core.catalog_cache import attach_session, get_catalog_cache
+from gsi_core.catalog_sync import load_frames
+from gsi_core.cost_engine import CostEngine
+from gsi_core.db import get_repository
+from gsi_core.editor_window import changed_cells, editor_window
+from gsi_core.export import EXPORT_FORMATS, available_formats
+from gsi_core.export_queue import get_export_queue
+from gsi_core.labor import headcount_model
+from gsi_core.money import amounts, format_won, from_minor, percent_to_bp, quote_totals, to_minor
+from gsi_core.price_history import get_price_history
+from gsi_core.pricing import LABOR_COST_PER_PERSON
+from gsi_core.profiling import PROFILE_LOG, finish_rerun, latency_summary, record_frame, span, start_rerun
+from gsi_core.projects import DEFAULT_PROJECT, list_projects, open_project, project_db_path
+from gsi_core.quote_state import QuoteState
+from gsi_core.quotes import export_tasks, prepare_quote
+from gsi_core.repricing import changes_by_name, in_won, reprice
+from gsi_core.scenarios import scenario_frame, sweep
+from gsi_core.workbook_cache import get_workbook_cache
+
+# 유닛 추가 양식에서 한 번에 보여 줄 부품 검색 결과 수
+PART_PAGE_SIZE = 50
+# 부품 편집 표 한 페이지의 행 수
+EDITOR_PAGE_SIZE = 100
+# 성능 측정 패널에서 p50/p95 를 계산할 최근 재실행 수
+PROFILE_HISTORY = 200
+
+# 프로젝트를 바꿀 때 비우는 세션 값 (다른 프로젝트 카탈로그의 ID 를 들고 있음)
+PROJECT_SESSION_KEYS = ("quote", "unit_parts", "unit_part_page", "export_job")
+
+# 세션에서 고른 프로젝트의 DB 경로 (프로젝트마다 카탈로그와 견적이 별도 SQLite 파일)
+def project_path():
+    return project_db_path(st.session_state.get("project", DEFAULT_PROJECT))
+
+# SQLite 데이터베이스 접근 객체 (연결 풀은 프로젝트 DB 마다 프로세스 전체에서 공유)
+def get_repo():
+    return get_repository(project_path())
 
 # SQLite 데이터베이스 초기화 함수
 def reset_database():
-    conn = sqlite3.connect('restaurant_menu.db')
-    c = conn.cursor()
-
     # 기존 테이블 삭제 (데이터베이스를 초기화하기 위해)
-    c.execute('DROP TABLE IF EXISTS MenuIngredients')
-    c.execute('DROP TABLE IF EXISTS Menus')
-    c.execute('DROP TABLE IF EXISTS Ingredients')
-
-    conn.commit()
-    conn.close()
+    get_repo().drop_schema()
 
     # 데이터베이스 다시 생성
     create_database()
     insert_data()
 
 # SQLite 데이터베이스에 유닛를 삽입하는 함수
-def insert_menu(menu_name):
-    conn = connect_db()
-    c = conn.cursor()
-    c.execute('INSERT INTO Menus (MenuName) VALUES (?)', (menu_name,))
-    conn.commit()
-    conn.close()
+def insert_menu(menu_name, ingredient_quantities=(), date_submitted='2024-08-10', component_quantities=()):
+    return get_repo().insert_menu(menu_name, date_submitted, ingredient_quantities, component_quantities)
 
 # SQLite 데이터베이스에 부품를 삽입하는 함수
 def insert_ingredient(ingredient_name, price):
-    conn = connect_db()
-    c = conn.cursor()
-    c.execute('INSERT INTO Ingredients (IngredientName, Price) VALUES (?, ?)', (ingredient_name, price))
-    conn.commit()
-    conn.close()
+    return get_repo().insert_ingredient(ingredient_name, price)
 
 # SQLite 데이터베이스에서 유닛와 부품를 조회하는 함수
 def get_data():
-    conn = connect_db()
-    c = conn.cursor()
     try:
-        c.execute('SELECT * FROM Menus')
-        menus = c.fetchall()
-        c.execute('SELECT * FROM Ingredients')
-        ingredients = c.fetchall()
-        c.execute('''SELECT mi.MenuID, m.MenuName, mi.IngredientID, i.IngredientName, mi.Quantity, i.Price
-                     FROM MenuIngredients mi
-                     JOIN Menus m ON mi.MenuID = m.MenuID
-                     JOIN Ingredients i ON mi.IngredientID = i.IngredientID''')
-        menu_ingredients = c.fetchall()
-        conn.close()
-        return menus, ingredients, menu_ingredients
+        return get_repo().fetch_all()
     except sqlite3.Error as e:
         st.error(f"SQLite error: {e}")
         return [], [], []  # 에러 발생 시 빈 리스트 반환
 
+# 세션 데이터를 공유 카탈로그 스냅샷에 맞춘다 (세션에는 견적 입력(QuoteState)만 따로 보관)
+def refresh_catalog():
+    try:
+        with span("catalog"):
+            snapshot = get_catalog_cache(project_path()).get()
+    except sqlite3.Error as e:
+        st.error(f"SQLite error: {e}")
+        if "menu_df" not in st.session_state:
+            load_frames(st.session_state, [], [], [])
+        return
+    epoch = st.session_state.get("catalog_epoch")
+    if attach_session(st.session_state, snapshot):
+        st.session_state.cost_engine = snapshot.engine
+        st.session_state.labor_model = snapshot.labor
+        # DB 가 초기화되면 같은 ID 가 다른 항목을 가리키므로 견적 입력을 새로 시작
+        if epoch != snapshot.epoch:
+            st.session_state.quote = QuoteState()
+
 def create_database():
-    conn = sqlite3.connect('restaurant_menu.db')
-    c = conn.cursor()
-
-    # Menus 테이블 생성
-    c.execute('''CREATE TABLE IF NOT EXISTS Menus (
-                    MenuID INTEGER PRIMARY KEY AUTOINCREMENT,
-                    MenuName TEXT NOT NULL,
-                    DateSubmitted TEXT NOT NULL
-                )''')
-
-    # Ingredients 테이블 생성
-    c.execute('''CREATE TABLE IF NOT EXISTS Ingredients (
-                    IngredientID INTEGER PRIMARY KEY AUTOINCREMENT,
-                    IngredientName TEXT NOT NULL,
-                    Price REAL NOT NULL
-                )''')
-
-    # MenuIngredients 테이블 생성
-    c.execute('''CREATE TABLE IF NOT EXISTS MenuIngredients (
-                    MenuID INTEGER,
-                    IngredientID INTEGER,
-                    Quantity REAL NOT NULL,
-                    FOREIGN KEY (MenuID) REFERENCES Menus(MenuID),
-                    FOREIGN KEY (IngredientID) REFERENCES Ingredients(IngredientID)
-                )''')
-
-    conn.commit()
-    conn.close()
-
-def insert_data():
-    conn = sqlite3.connect('restaurant_menu.db')
-    c = conn.cursor()
+    get_repo().create_schema()
 
+def insert_data(repo=None):
+    repo = repo or get_repo()
     # 유닛 데이터 추가
     menus = [
         ('Microcontrollers and Processors', '2024-01-02'),
@@ -109,7 +104,6 @@ def insert_data():
         ('Mechanical and Assembly Components', '2024-01-11'),
         ('Control and Feedback', '2024-01-12')
     ]
-    c.executemany('INSERT INTO Menus (MenuName, DateSubmitted) VALUES (?, ?)', menus)
 
     # 부품 데이터 추가
     ingredients = [
@@ -155,7 +149,6 @@ def insert_data():
         ('Battery Holder', 0.1),
         ('Fuse', 0.05),
     ]
-    c.executemany('INSERT INTO Ingredients (IngredientName, Price) VALUES (?, ?)', ingredients)
 
     # 유닛-부품 관계 데이터 추가
     menu_ingredients = [
@@ -171,56 +164,255 @@ def insert_data():
         (10, 33, 0.3), (10, 34, 0.1), (10, 35, 0.05),
         (11, 36, 0.05), (11, 37, 0.1), (11, 38, 0.2)
     ]
-    c.executemany('INSERT INTO MenuIngredients (MenuID, IngredientID, Quantity) VALUES (?, ?, ?)', menu_ingredients)
 
-    conn.commit()
-    conn.close()
+    # 단가는 최소 단위 정수로 저장
+    ingredients = [(name, to_minor(price)) for name, price in ingredients]
+    repo.insert_many(menus, ingredients, menu_ingredients)
 
+    # 작업 역할 (시간당 단가)과 유닛별 작업 시간: (유닛 ID, 역할, 유닛 1개당 시간, 주문당 준비 시간)
+    roles = {name: repo.upsert_labor_role(name, to_minor(rate)) for name, rate in [('조립', 25000), ('검사', 30000)]}
+    unit_labor = [
+        (1, '조립', 0.5, 1.0), (1, '검사', 0.25, 0),
+        (3, '조립', 0.25, 0),
+        (5, '조립', 0.5, 0.5), (5, '검사', 0.5, 0),
+    ]
+    for menu_id, role, hours, setup_hours in unit_labor:
+        repo.set_unit_labor(menu_id, roles[role], hours, setup_hours)
 
-# 유닛 총 비용 계산 함수
+
+# 유닛 총 비용 계산 함수 (최소 단위 정수)
 def calculate_menu_costs(menu_df, menu_ingredients_df, ingredient_df):
-    menu_costs = []
-    for _, menu_row in menu_df.iterrows():
-        menu_id = menu_row["ID"]
-        quantity = menu_row["Quantity"]
-        total_cost = 0
-
-        # 유닛에 포함된 부품를 찾아서 총 비용 계산
-        menu_ingredients = menu_ingredients_df[menu_ingredients_df["MenuID"] == menu_id]
-        for _, mi_row in menu_ingredients.iterrows():
-            ingredient_id = mi_row["IngredientID"]
-            ingredient_price = ingredient_df[ingredient_df["ID"] == ingredient_id]["Price"].values[0]
-            ingredient_quantity = mi_row["Quantity"] * quantity
-            total_cost += ingredient_price * ingredient_quantity
-
-        menu_costs.append(total_cost)
-    
-    return menu_costs
+    engine = CostEngine.from_frames(menu_df, menu_ingredients_df, ingredient_df)
+    return engine.unit_costs(menu_df["Quantity"].to_numpy(), ingredient_df["Price"].to_numpy()).tolist()
+
+# 부품 표를 페이지 단위로 편집한다. 이름 검색 결과의 한 페이지와 수량/선택이 있는 행만 화면으로 보낸다.
+# 수량/합계/선택 열은 보낼 행에 대해서만 견적 상태에서 채운다.
+#   quantities: 부품 ID → 표시할 수량, included: 선택한 부품 ID, prices: 단가 (ingredient_df 행 순서, 최소 단위)
+#   단가/합계 열은 원 단위로 보여 준다
+#   rows: 편집 대상 행 마스크 (없으면 전체), editable: 편집할 수 있는 열
+# 반환값: {열: {부품 ID: 새 값}} (바뀐 칸만)
+def paged_part_editor(key, df, prices, quantities, included, rows=None, editable=("Quantity", "Include"), column_config=None):
+    query_col, page_col, active_col = st.columns([3, 1, 1])
+    query = query_col.text_input("부품명 검색", key=f"{key}_query")
+    page = page_col.number_input("페이지", min_value=1, step=1, key=f"{key}_page") - 1
+    active_only = active_col.toggle("입력한 행만", key=f"{key}_active")
+
+    engine = st.session_state.cost_engine
+    pinned = np.zeros(len(df), dtype=bool)
+    pinned[engine.part_positions(list(quantities.keys() | included))] = True
+    if rows is not None:
+        df, pinned = df[rows], pinned[rows]
+    window = editor_window(df[["ID", "IngredientName"]], page, EDITOR_PAGE_SIZE, query, active_only, pinned)
+    st.caption(f"{window.matched}개 중 {window.page + 1}/{window.pages}쪽 (선택/수량이 있는 행은 항상 표시)")
+
+    ids = window.frame["ID"].tolist()
+    part_prices = prices[engine.part_positions(ids)]
+    frame = window.frame.assign(Price=from_minor(part_prices))
+    frame["Quantity"] = np.array([quantities.get(i, 0) for i in ids], dtype=float)
+    frame["TotalCost"] = from_minor(amounts(frame["Quantity"].to_numpy(), part_prices))
+    frame["Include"] = np.array([i in included for i in ids], dtype=bool)
+    record_frame(key, frame)
+    # 키를 주지 않아야 보낸 표가 바뀔 때 편집기 상태가 초기화된다 (행 위치가 바뀌어도 편집이 엉뚱한 행에 붙지 않음)
+    edited = st.data_editor(frame, column_config=column_config,
+                            disabled=[c for c in frame.columns if c not in editable])
+    return {column: dict(zip(frame.loc[values.index, "ID"].tolist(), values.tolist()))
+            for column, values in changed_cells(frame, edited, editable).items()}
+
+# "1, 10, 100" 같은 쉼표 구분 숫자 목록 (잘못된 값이 있으면 None)
+def parse_numbers(text):
+    try:
+        return [float(item) for item in text.replace(" ", "").split(",") if item]
+    except ValueError:
+        return None
+
+# 현재 견적을 세트 수 × 단가 변동의 모든 조합으로 한 번에 계산해서 표와 그래프로 비교
+def scenario_panel(engine, prices, quote, labor, num_people, totals):
+    if not quote.units and not quote.parts:
+        st.write("유닛이나 부품을 선택하면 시나리오를 비교할 수 있습니다.")
+        return
+    scale_col, change_col = st.columns(2)
+    scales = parse_numbers(scale_col.text_input("세트 수 목록 (현재 수량 × N)", "1, 10, 100, 1000, 10000"))
+    changes = parse_numbers(change_col.text_input("단가 변동 (%) 목록", "0, 5, 10"))
+    if not scales or changes is None or not changes or min(scales) <= 0:
+        st.error("세트 수(0 보다 큰 값)와 단가 변동을 쉼표로 구분해서 입력하세요.")
+        return
+    # 단가 변동을 일부 부품에만 적용 (예: 한 공급사 부품). 비우면 전체 부품
+    materials = quote.materials_frame()
+    part_names = dict(zip(materials["IngredientName"], materials["ID"].tolist()))
+    changed = st.multiselect("단가 변동 적용 부품 (비우면 전체)", list(part_names))
+    changed_parts = engine.part_positions([part_names[name] for name in changed]) if changed else None
+
+    # 같은 값을 두 번 넣어도 한 번만 계산
+    scales, changes = list(dict.fromkeys(scales)), list(dict.fromkeys(changes))
+    result = sweep(engine, prices, engine.unit_positions(list(quote.units)), [line.quantity for line in quote.units.values()],
+                   scales, [percent_to_bp(change) for change in changes],
+                   engine.part_positions(list(quote.parts)), [line.quantity for line in quote.parts.values()],
+                   changed_parts, labor, num_people, totals.margin_rate, totals.tax_rate)
+    table = scenario_frame(result)
+    record_frame("scenarios", table)
+    money_columns = ["Material", "Labor", "Margin", "Tax", "Total", "PerSet"]
+    table[money_columns] = from_minor(table[money_columns])
+    table["PriceChange"] = table["PriceChange"] / 100
+    st.dataframe(table.rename(columns={"Scale": "세트 수", "PriceChange": "단가 변동 (%)", "Material": "부품비",
+                                       "Labor": "인건비", "Margin": "마진", "Tax": "부가세", "Total": "합계",
+                                       "PerSet": "세트당 합계"}),
+                 hide_index=True, width="stretch")
+    # 세트 수에 따른 세트당 합계 (단가 변동별 선)
+    chart = table.pivot(index="Scale", columns="PriceChange", values="PerSet")
+    chart.columns = [f"{change:+g}%" for change in chart.columns]
+    st.line_chart(chart, x_label="세트 수", y_label="세트당 합계 (원)")
+
+# 부품 단가를 여러 개 바꾸기 전에 영향 받는 유닛/견적을 보고, 확인하면 한 번에 반영
+def repricing_panel():
+    text = st.text_area("부품명, 새 단가 (한 줄에 하나)", placeholder="STM32, 0.75")
+    rows, invalid = [], []
+    for line in text.splitlines():
+        name, _, price = line.rpartition(",")
+        try:
+            rows.append((name.strip(), to_minor(float(price.replace(" ", "")))))
+        except ValueError:
+            if line.strip():
+                invalid.append(line.strip())
+    if invalid:
+        st.error(f"잘못된 줄: {', '.join(invalid)}")
+    preview_col, apply_col = st.columns(2)
+    preview = preview_col.button("영향 미리 보기")
+    apply = apply_col.button("단가 반영")
+    if not (preview or apply) or not rows:
+        return
+    changes, unknown = changes_by_name(st.session_state.ingredient_df, rows)
+    if unknown:
+        st.warning(f"없는 부품: {', '.join(unknown)}")
+    try:
+        report = reprice(get_catalog_cache(project_path()), changes, apply=apply)
+    except sqlite3.Error as e:
+        st.error(f"SQLite error: {e}")
+        return
+    if report.applied:
+        refresh_catalog()
+    st.write(f"단가 변경 {len(report.parts)}건, 영향 유닛 {len(report.units)}개, 영향 견적 {len(report.quotes)}건 "
+             f"({report.seconds * 1000:.1f} ms{', 반영함' if report.applied else ''})")
+    st.dataframe(in_won(report.units).rename(columns={"MenuName": "유닛", "OldPrice": "현재 1개 비용",
+                                                       "NewPrice": "새 1개 비용", "Delta": "차이"}),
+                 hide_index=True, width="stretch")
+    if len(report.quotes):
+        st.dataframe(in_won(report.quotes).rename(columns={"QuoteNumber": "견적번호", "Customer": "고객", "Project": "과제",
+                                                           "Lines": "영향 줄", "Delta": "부품비 차이"}),
+                     hide_index=True, width="stretch")
+
+# 내보내기 작업이 끝날 때까지 이 부분만 0.5초마다 다시 그리고, 끝나면 전체를 한 번 다시 실행해서 다운로드 버튼을 띄운다
+@st.fragment(run_every=0.5)
+def export_progress(job_id, quote_number):
+    job = get_export_queue().status(job_id)
+    if job is None or job.state == "done":
+        st.rerun()
+    st.progress(job.done / job.total, text=f"견적번호 {quote_number} 문서 만드는 중 ({job.done}/{job.total})")
+
+
+def export_panel(job_id, quote_number):
+    job = get_export_queue().status(job_id)
+    if job is None:
+        st.warning(f"견적번호 {quote_number} 내보내기 결과가 없습니다. 다시 저장해 주세요.")
+        return
+    if job.state != "done":
+        export_progress(job_id, quote_number)
+        return
+    st.success(f"견적번호 {quote_number} 문서가 생성되었습니다. ({job.seconds:.1f}초)")
+    columns = st.columns(max(len(job.files), 1))
+    for column, (format_name, data) in zip(columns, job.files.items()):
+        _, mime, suffix, _ = EXPORT_FORMATS[format_name]
+        column.download_button(f"{format_name.upper()} 다운로드", data, file_name=f"견적서_{quote_number}{suffix}",
+                               mime=mime, key=f"download_{format_name}")
+    for format_name, error in job.errors.items():
+        st.error(f"{format_name.upper()} 내보내기 실패: {error}")
+
+
+# 사이드바의 인건비 설정: 작업 역할(시간당 단가), 유닛별 작업 시간, 1인당 인건비/간접비율/기본 마진율
+def labor_settings_form(labor):
+    st.sidebar.header("인건비 설정")
+    with st.sidebar.form("작업 역할 양식"):
+        role_name = st.text_input("역할 이름")
+        hourly_rate = st.number_input("시간당 단가", min_value=0.0, step=1000.0)
+        role_submitted = st.form_submit_button("역할 저장")
+    if role_submitted and role_name.strip():
+        get_repo().upsert_labor_role(role_name.strip(), to_minor(hourly_rate))
+        st.sidebar.write("역할이 저장되었습니다!")
+        refresh_catalog()
+
+    if labor.n_roles:
+        menu_ids = dict(zip(st.session_state.menu_df["MenuName"], st.session_state.menu_df["ID"].tolist()))
+        role_ids = dict(zip(labor.role_names, labor.role_ids.tolist()))
+        with st.sidebar.form("유닛 작업 시간 양식"):
+            unit_name = st.selectbox("유닛", list(menu_ids))
+            role_name = st.selectbox("역할", list(role_ids))
+            hours = st.number_input("유닛 1개당 시간", min_value=0.0, step=0.25)
+            setup_hours = st.number_input("준비 시간 (주문당)", min_value=0.0, step=0.25)
+            hours_submitted = st.form_submit_button("작업 시간 저장")
+        if hours_submitted and unit_name is not None:
+            get_repo().set_unit_labor(menu_ids[unit_name], role_ids[role_name], hours, setup_hours)
+            st.sidebar.write("작업 시간이 저장되었습니다!")
+            refresh_catalog()
+
+    with st.sidebar.form("인건비 기본값 양식"):
+        per_person = st.number_input("1인당 인건비", min_value=0.0, step=1000.0, value=float(from_minor(labor.per_person_cost)))
+        overhead_percent = st.number_input("간접비율 (%)", min_value=0.0, step=1.0, value=labor.overhead_rate / 100)
+        margin_percent = st.number_input("기본 마진율 (%)", min_value=0.0, step=0.5, value=labor.margin_rate / 100)
+        settings_submitted = st.form_submit_button("기본값 저장")
+    if settings_submitted:
+        get_repo().update_labor_settings(to_minor(per_person), percent_to_bp(overhead_percent), percent_to_bp(margin_percent))
+        st.sidebar.write("인건비 기본값이 저장되었습니다!")
+        refresh_catalog()
+
+def switch_project():
+    for key in PROJECT_SESSION_KEYS:
+        st.session_state.pop(key, None)
+
+# 프로젝트 선택과 새 프로젝트 만들기. 새로 만든 프로젝트는 다음 재실행에서 선택 상자에 넣는다
+# (위젯이 만들어진 뒤에는 그 키의 값을 바꿀 수 없으므로)
+def project_selector():
+    if "project_pending" in st.session_state:
+        st.session_state.project = st.session_state.pop("project_pending")
+        switch_project()
+    projects = list_projects()
+    st.sidebar.selectbox("프로젝트", projects, key="project", on_change=switch_project)
+
+    with st.sidebar.expander("새 프로젝트"):
+        with st.form("새 프로젝트 양식"):
+            project_name = st.text_input("프로젝트 이름").strip()
+            with_sample = st.checkbox("예제 데이터로 시작")
+            project_submitted = st.form_submit_button("프로젝트 만들기")
+    if project_submitted:
+        if project_name in projects:
+            st.sidebar.error(f"이미 있는 프로젝트입니다: {project_name}")
+            return
+        try:
+            path = open_project(project_name, create=True)
+        except ValueError as e:
+            st.sidebar.error(str(e))
+            return
+        if with_sample:
+            insert_data(get_repository(path))
+        st.session_state.project_pending = project_name
+        st.rerun()
 
 def main():
     st.set_page_config(page_title="자동 견적")
     st.title("GSI 프로젝트 및 부품관리 시스템")
 
-    if st.sidebar.button("초기화"):
-        reset_database()
-        st.sidebar.success("데이터베이스가 초기화되었습니다!")
+    # 켜면 이번 재실행부터 구간별 시간을 재서 사이드바 맨 아래에 보여 준다
+    st.sidebar.toggle("성능 측정", key="profile_panel")
 
-    if "menu_df" not in st.session_state or "ingredient_df" not in st.session_state:
-        menus, ingredients, menu_ingredients = get_data()
+    project_selector()
 
-        # 필요 시 필요한 열만 선택하여 DataFrame 생성
-        if menus and len(menus[0]) == 3:
-            st.session_state.menu_df = pd.DataFrame(menus, columns=["ID", "MenuName", "DateSubmitted"]).drop(columns=["DateSubmitted"])
-        else:
-            st.session_state.menu_df = pd.DataFrame(menus, columns=["ID", "MenuName"])
+    # 초기화는 선택한 프로젝트의 DB 만 다시 만든다
+    if st.sidebar.button("초기화"):
+        with span("reset_database"):
+            reset_database()
+        st.sidebar.success(f"{st.session_state.project} 데이터베이스가 초기화되었습니다!")
 
-        st.session_state.ingredient_df = pd.DataFrame(ingredients, columns=["ID", "IngredientName", "Price"])
-        st.session_state.menu_ingredients_df = pd.DataFrame(menu_ingredients, columns=["MenuID", "MenuName", "IngredientID", "IngredientName", "Quantity", "Price"])
-        st.session_state.new_df=pd.DataFrame(ingredients, columns=["ID", "IngredientName", "Price"])
-        
-        # 유닛별 수량 및 총 비용 초기화
-        st.session_state.menu_df["Quantity"] = 0
-        st.session_state.menu_df["TotalCost"] = 0
+    refresh_catalog()
+    if "quote" not in st.session_state:
+        st.session_state.quote = QuoteState()
 
     st.sidebar.header("부품 추가")
     with st.sidebar.form("부품 추가 양식"):
@@ -229,399 +421,263 @@ def main():
         ingredient_submitted = st.form_submit_button("부품 추가")
 
     if ingredient_submitted:
-        insert_ingredient(ingredient_name, price)
+        insert_ingredient(ingredient_name, to_minor(price))
         st.sidebar.write("부품이 추가되었습니다!")
-        _, ingredients, _ = get_data()
-        st.session_state.ingredient_df = pd.DataFrame(ingredients, columns=["ID", "IngredientName", "Price"])
+        refresh_catalog()
 
     st.sidebar.header("유닛 추가")
+    # 부품 검색은 양식 밖에 두어야 검색어를 바꿀 때마다 결과가 갱신된다.
+    # 전체 부품 목록 대신 검색 결과 한 페이지만 화면으로 보낸다
+    if "unit_parts" not in st.session_state:
+        st.session_state.unit_parts = {}  # 선택한 부품 {ID: 이름} (검색어가 바뀌어도 유지)
+        st.session_state.unit_part_page = 0
+    part_query = st.sidebar.text_input("부품 검색", placeholder="부품명 일부 (3글자 이상이면 오타도 찾음)",
+                                       on_change=lambda: st.session_state.update(unit_part_page=0))
+    search_start = time.perf_counter()
+    with span("part_search"):
+        part_page = get_repo().search_ingredients(part_query, limit=PART_PAGE_SIZE,
+                                                  offset=st.session_state.unit_part_page * PART_PAGE_SIZE)
+    search_ms = (time.perf_counter() - search_start) * 1000
+    page_names = {ingredient_id: name for ingredient_id, name, _ in part_page.rows}
+    selected_parts = st.session_state.unit_parts
+    selected_ids = st.sidebar.multiselect(
+        "부품 선택", options=list(selected_parts) + [i for i in page_names if i not in selected_parts],
+        default=list(selected_parts), format_func=lambda i: selected_parts.get(i) or page_names[i],
+    )
+    st.session_state.unit_parts = {i: selected_parts.get(i) or page_names[i] for i in selected_ids}
+    fuzzy_note = ""
+    if part_page.mode == "fuzzy":
+        fuzzy_note = " · 일치하는 부품이 없어 비슷한 이름을 표시" if part_page.rows else " · 일치하는 부품이 없습니다"
+    st.sidebar.caption(f"{st.session_state.unit_part_page + 1}쪽 · {len(part_page.rows)}건 · {search_ms:.1f} ms{fuzzy_note}")
+    prev_col, next_col = st.sidebar.columns(2)
+    if prev_col.button("이전 결과", disabled=st.session_state.unit_part_page == 0):
+        st.session_state.unit_part_page -= 1
+        st.rerun()
+    if next_col.button("다음 결과", disabled=not part_page.has_more):
+        st.session_state.unit_part_page += 1
+        st.rerun()
+
     with st.sidebar.form("유닛 추가 양식"):
         menu_name = st.text_area("유닛 이름")
-        
-        # 부품 선택 및 수량 입력
-        ingredients_list = st.session_state.ingredient_df[['ID', 'IngredientName']].to_dict(orient='records')
-        ingredient_options = {ingredient['IngredientName']: ingredient['ID'] for ingredient in ingredients_list}
-        
-        selected_ingredients = st.multiselect("부품 선택", options=list(ingredient_options.keys()))
-        quantities = {ingredient: st.number_input(f"{ingredient} 수량", min_value=0, step=1, key=f"quantity_{ingredient_options[ingredient]}") for ingredient in selected_ingredients}
-        
+
+        # 선택한 부품의 수량 입력
+        quantities = {ingredient_id: st.number_input(f"{name} 수량", min_value=0, step=1, key=f"part_quantity_{ingredient_id}")
+                      for ingredient_id, name in st.session_state.unit_parts.items()}
+
+        # 하위 유닛(다른 유닛을 통째로 포함) 선택 및 수량 입력
+        component_options = dict(zip(st.session_state.menu_df["MenuName"], st.session_state.menu_df["ID"]))
+        selected_components = st.multiselect("하위 유닛 선택", options=list(component_options.keys()))
+        component_quantities = {menu: st.number_input(f"{menu} 수량", min_value=0, step=1, key=f"component_quantity_{component_options[menu]}") for menu in selected_components}
+
         menu_submitted = st.form_submit_button("유닛 추가")
 
         if menu_submitted:
-            conn = connect_db()
-            c = conn.cursor()
-            c.execute('INSERT INTO Menus (MenuName, DateSubmitted) VALUES (?, ?)', (menu_name, '2024-08-10'))
-            menu_id = c.lastrowid
-
-            # 선택된 부품와 수량을 MenuIngredients 테이블에 추가
-            for ingredient_name in selected_ingredients:
-                ingredient_id = ingredient_options[ingredient_name]
-                quantity = quantities[ingredient_name]
-                c.execute('INSERT INTO MenuIngredients (MenuID, IngredientID, Quantity) VALUES (?, ?, ?)', (menu_id, ingredient_id, quantity))
-
-            conn.commit()
-            conn.close()
+            # 유닛과 선택된 부품/수량을 한 트랜잭션으로 추가
+            insert_menu(menu_name, list(quantities.items()), component_quantities=[
+                (component_options[component], component_quantities[component])
+                for component in selected_components
+            ])
+            st.session_state.unit_parts = {}
             st.sidebar.write("유닛와 부품가 추가되었습니다!")
-            menus, _, _ = get_data()
-            st.session_state.menu_df = pd.DataFrame(menus, columns=["ID", "MenuName", "DateSubmitted"]).drop(columns=["DateSubmitted"])
-            st.session_state.menu_df["Quantity"] = 0
-            st.session_state.menu_df["TotalCost"] = 0
-
-    # 유닛 선택 및 수량 입력
-    selected_menu = st.multiselect("유닛 선택", st.session_state.menu_df["MenuName"].tolist())
+            refresh_catalog()
+
+    st.sidebar.header("일괄 가져오기")
+    with st.sidebar.form("일괄 가져오기 양식"):
+        import_kind = st.radio("종류", ["parts", "units"],
+                               format_func=lambda kind: "부품 단가표 (부품명, 단가)" if kind == "parts" else "유닛 구성 (유닛명, 부품명, 수량)")
+        import_upload = st.file_uploader("CSV 또는 엑셀 파일", type=["csv", "xlsx"])
+        import_submitted = st.form_submit_button("가져오기")
+
+    if import_submitted and import_upload is not None:
+        import_bar = st.sidebar.progress(0.0)
+        try:
+            # 업로드 크기로 대략의 진행률만 표시
+            result = import_file(get_repo(), import_upload, import_kind, file_name=import_upload.name,
+                                 progress=lambda rows: import_bar.progress(min(1.0, import_upload.tell() / max(1, import_upload.size))))
+        except (ValueError, sqlite3.Error) as e:
+            st.sidebar.error(f"가져오기 실패: {e}")
+        else:
+            import_bar.progress(1.0)
+            st.sidebar.success(f"{result.rows}행: 추가 {result.inserted}, 변경 {result.updated}, "
+                               f"동일 {result.unchanged}, 거부 {result.rejected} ({result.seconds:.2f}초)")
+            if result.rejected_rows:
+                with st.sidebar.expander("거부된 행"):
+                    st.dataframe(pd.DataFrame(result.rejected_rows, columns=["행", "사유"]), hide_index=True)
+            refresh_catalog()
+
+    if "cost_engine" not in st.session_state:
+        st.session_state.cost_engine = CostEngine.from_frames(
+            st.session_state.menu_df, st.session_state.menu_ingredients_df, st.session_state.ingredient_df,
+            st.session_state.get("menu_components_df")
+        )
+    # 카탈로그를 못 읽었으면 인원 수 × 1인당 인건비만 계산한다
+    if "labor_model" not in st.session_state:
+        st.session_state.labor_model = headcount_model(st.session_state.cost_engine.n_units, LABOR_COST_PER_PERSON)
+    # 설정을 저장하면 카탈로그를 다시 읽으므로 엔진/인건비 모델은 그 뒤에 꺼낸다
+    labor_settings_form(st.session_state.labor_model)
+    engine = st.session_state.cost_engine
+    labor = st.session_state.labor_model
+
+    # 단가 기준일을 고르면 그 시점의 단가 이력으로 다시 계산 (과거 견적 재현용)
+    price_as_of = st.date_input("단가 기준일 (비우면 현재 단가)", value=None)
+    prices = st.session_state.ingredient_df["Price"].to_numpy()
+    if price_as_of is not None:
+        try:
+            prices = get_price_history(project_path()).prices_as_of(price_as_of, st.session_state.ingredient_df["ID"].to_numpy(), prices)
+            st.caption(f"{price_as_of} 기준 단가로 계산합니다.")
+        except sqlite3.Error as e:
+            st.error(f"SQLite error: {e}")
+
+    # 카탈로그나 단가가 바뀌었을 때만 견적 줄의 단가와 합계를 다시 맞춘다
+    quote = st.session_state.quote
+    with span("reprice"):
+        quote.reprice((st.session_state.get("catalog_revision"), st.session_state.get("catalog_epoch")), engine, prices,
+                      st.session_state.menu_df["MenuName"], st.session_state.ingredient_df["IngredientName"])
+
+    # 유닛 선택 및 수량 입력 (위젯 키에 프로젝트를 넣어서 프로젝트를 바꾸면 선택이 이어지지 않게 한다)
+    project = st.session_state.project
+    menu_ids = dict(zip(st.session_state.menu_df["MenuName"], st.session_state.menu_df["ID"].tolist()))
+    selected_menu = st.multiselect("유닛 선택", list(menu_ids), key=f"units_{project}")
+    selected_ids = [menu_ids[menu_name] for menu_name in selected_menu]
+    for menu_id in quote.units.keys() - set(selected_ids):
+        quote.set_unit_quantity(menu_id, 0)
     st.write("선택한 유닛:")
-    for menu_name in selected_menu:
-        menu_id = st.session_state.menu_df[st.session_state.menu_df["MenuName"] == menu_name]["ID"].values[0]
-        quantity_key = f"quantity_{menu_id}"  # 고유 키 생성
-        quantity = st.number_input(f"{menu_name} 수량", min_value=0, step=1, key=quantity_key)
-        st.session_state.menu_df.loc[st.session_state.menu_df["ID"] == menu_id, "Quantity"] = quantity
-
-    # 선택한 유닛의 부품를 조회하고 업데이트된 부품 테이블에 표시
-    filtered_ingredients = st.session_state.menu_ingredients_df[st.session_state.menu_ingredients_df["MenuName"].isin(selected_menu)]
-    filtered_ingredient_ids = filtered_ingredients["IngredientID"].unique()
-    updated_ingredients = st.session_state.ingredient_df[st.session_state.ingredient_df["ID"].isin(filtered_ingredient_ids)].copy()
-    updated_ingredients["Include"] = False  # 체크박스 열 추가
-
-    if "Quantity" not in st.session_state.ingredient_df.columns:
-        st.session_state.ingredient_df["Quantity"] = 0  # 기본값 설정
-
-    # Quantity는 수정 가능하게 설정
-    edited_updated_ingredients = st.data_editor(
-        updated_ingredients,
-        num_rows="dynamic",
-        column_config={
-            "Quantity": st.column_config.NumberColumn("수량"),
-            "Include": st.column_config.CheckboxColumn("Include")
-        }
-    )
+    for menu_name, menu_id in zip(selected_menu, selected_ids):
+        quantity = st.number_input(f"{menu_name} 수량", min_value=0, step=1, key=f"quantity_{project}_{menu_id}")
+        quote.set_unit_quantity(menu_id, quantity)
+
+    # 선택한 유닛의 부품(하위 유닛의 부품 포함)만 편집기에 보낸다.
+    # 수량은 유닛 수량으로 계산되므로 선택 여부만 편집한다
+    unit_mask = np.zeros(engine.n_units, dtype=bool)
+    unit_mask[engine.unit_positions(selected_ids)] = True
+    with span("unit_parts_editor"):
+        changes = paged_part_editor("unit_parts_editor", st.session_state.ingredient_df, prices, quote.unit_part_quantities(),
+                                    quote.included, engine.parts_of_units(unit_mask), editable=("Include",),
+                                    column_config={
+                                        "Quantity": st.column_config.NumberColumn("수량"),
+                                        "Include": st.column_config.CheckboxColumn("Include")
+                                    })
+    for part_id, included in changes.get("Include", {}).items():
+        quote.set_included(part_id, included)
 
-    if edited_updated_ingredients is not None:
-        st.session_state.ingredient_df.update(edited_updated_ingredients)
-        st.session_state.ingredient_df["TotalCost"] = st.session_state.ingredient_df["Price"] * st.session_state.ingredient_df["Quantity"]
-    
     st.subheader("부품")
-    # 새로운 열이 있는지 확인하고 없으면 추가
-    if "Quantity" not in st.session_state.new_df.columns:
-        st.session_state.new_df["Quantity"] = 0  # 수량을 입력할 수 있는 열 추가
-    if "TotalCost" not in st.session_state.new_df.columns:
-        st.session_state.new_df["TotalCost"] = 0  # 총 비용을 계산할 열 추가
-    if "Include" not in st.session_state.new_df.columns:
-        st.session_state.new_df["Include"] = False  # 체크박스 열 추가
-
-    # 'Include' 열이 없으면 추가
-    if "Include" not in st.session_state.ingredient_df.columns:
-        st.session_state.ingredient_df["Include"] = False
-
-    # 새로운 열이 있는지 확인하고 없으면 추가
-    if "Include" not in st.session_state.new_df.columns:
-        st.session_state.new_df["Include"] = False  # 체크박스 열 추가
-
-    # Quantity와 Include 열을 편집할 수 있도록 설정
-    edited_new_df = st.data_editor(
-        st.session_state.new_df,
-        num_rows="dynamic",
-        column_config={
-            "Quantity": st.column_config.NumberColumn("수량", min_value=0, step=1),
-            "Include": st.column_config.CheckboxColumn("Include")
-        }
-    )
-
-    # 편집된 데이터가 있는 경우 업데이트
-    if edited_new_df is not None:
-        st.session_state.new_df.update(edited_new_df)
-        st.session_state.new_df["TotalCost"] = st.session_state.new_df["Price"] * st.session_state.new_df["Quantity"]
-
-    # 기존 부품와 새 부품 모두 'Include' 열로 필터링
-    selected_ingredients = pd.concat([
-        st.session_state.new_df[st.session_state.new_df["Include"] == True],
-        st.session_state.ingredient_df[st.session_state.ingredient_df["Include"] == True]
-    ])
-
-    # 선택된 부품 데이터프레임을 웹페이지에 표시
-    if not selected_ingredients.empty:
+    # 전체 부품 중 현재 페이지와 직접 넣은 수량/선택이 있는 행만 편집기에 보낸다
+    with span("all_parts_editor"):
+        changes = paged_part_editor("all_parts_editor", st.session_state.ingredient_df, prices,
+                                    {part_id: line.quantity for part_id, line in quote.parts.items()}, quote.included,
+                                    column_config={
+                                        "Quantity": st.column_config.NumberColumn("수량", min_value=0, step=1),
+                                        "Include": st.column_config.CheckboxColumn("Include")
+                                    })
+    for part_id, quantity in changes.get("Quantity", {}).items():
+        quote.set_part_quantity(part_id, 0 if pd.isna(quantity) else quantity)
+    for part_id, included in changes.get("Include", {}).items():
+        quote.set_included(part_id, included)
+
+    # 선택된 부품 데이터프레임을 웹페이지에 표시 (유닛에서 나온 수량 + 직접 넣은 수량)
+    if quote.included:
         st.subheader("선택된 부품")
-        st.dataframe(selected_ingredients, use_container_width=True)
-
-    st.session_state.ingredient_df["Quantity"] = 0
-    st.session_state.ingredient_df["TotalCost"] = 0
-
-    for _, row in st.session_state.menu_df.iterrows():
-        menu_id = row["ID"]
-        quantity = row["Quantity"]
-        menu_ingredients_df = st.session_state.menu_ingredients_df[st.session_state.menu_ingredients_df["MenuID"] == menu_id]
-        for _, mi_row in menu_ingredients_df.iterrows():
-            ingredient_id = mi_row["IngredientID"]
-            unit_quantity = mi_row["Quantity"] * quantity
-
-            if ingredient_id in st.session_state.ingredient_df["ID"].values:
-                ingredient_idx = st.session_state.ingredient_df[st.session_state.ingredient_df["ID"] == ingredient_id].index[0]
-                st.session_state.ingredient_df.at[ingredient_idx, "Quantity"] += unit_quantity
-                st.session_state.ingredient_df.at[ingredient_idx, "TotalCost"] = st.session_state.ingredient_df.at[ingredient_idx, "Quantity"] * st.session_state.ingredient_df.at[ingredient_idx, "Price"]
-
+        with span("selected_parts"):
+            selected_parts = quote.materials_frame(quote.included)
+            selected_parts = selected_parts.assign(Price=from_minor(selected_parts["Price"]),
+                                                   TotalCost=from_minor(selected_parts["TotalCost"]))
+            record_frame("selected_parts", selected_parts)
+            st.dataframe(selected_parts, width="stretch")
 
     st.header("견적서 계산기")
 
-    def calculate_material_costs(df):
-        return df["TotalCost"].sum() if "TotalCost" in df.columns else 0
-
-    def calculate_labor_cost(num_people):
-        labor_cost_per_person = 10000
-        return num_people * labor_cost_per_person
-
-    total_material_cost = calculate_material_costs( pd.concat([
-        st.session_state.new_df,
-        st.session_state.ingredient_df
-    ]))
-
-
-    st.write(f'총 부품 비용: {total_material_cost:,} 원')
+    st.write(f'총 부품 비용: {format_won(quote.material_total)}')
 
     num_people = st.number_input('인원 수 입력', min_value=0, step=1)
-    total_labor_cost = calculate_labor_cost(num_people)
-    st.write(f'인건비: {total_labor_cost:,} 원')
-
-    total_cost = total_material_cost + total_labor_cost
-    st.write(f'총 비용: {total_cost:,} 원')
-
-    selected_menus_df = pd.DataFrame()
-    
-    for menu_name in selected_menu:
-        menu_id = st.session_state.menu_df[st.session_state.menu_df["MenuName"] == menu_name]["ID"].values[0]
-        quantity = st.number_input(f"{menu_name} 수량", min_value=0, step=1, key=menu_id)
-        st.session_state.menu_df.loc[st.session_state.menu_df["ID"] == menu_id, "Quantity"] = quantity
-        
-        # 선택된 유닛를 DataFrame에 추가
-        selected_menus_df = pd.concat([
-            selected_menus_df,
-            pd.DataFrame([[menu_id, menu_name, quantity]], columns=["ID", "MenuName", "Quantity"])
-        ], ignore_index=True)
-
-    if st.button('엑셀로 저장'):
-        excel_file_path = save_to_excel(st.session_state.ingredient_df, total_material_cost, total_labor_cost, total_cost, selected_menus_df, num_people)
-        st.success(f"엑셀 파일이 '{excel_file_path}'로 저장되었습니다.")
-
-#=====================================================================================================================
-# 엑셀 저장
-from openpyxl import Workbook
-from openpyxl.styles import Border, Side, Alignment, Font, PatternFill
-
-def save_to_excel(materials_df, total_material_cost, labor_cost_per_person, total_cost, selected_menus_df, num_people):
-    wb = Workbook()
-
-    # 첫 번째 시트: 표제
-    ws1 = wb.active
-    ws1.title = "표제"
-
-    # 스타일 설정
-    thin_border = Side(border_style="thin", color="000000")
-    thick_border = Side(border_style="thick", color="000000")  # 진한 선 스타일 추가
-    header_font = Font(bold=True, color="FFFFFF")
-    header_fill = PatternFill(start_color="4F81BD", end_color="4F81BD", fill_type="solid")
-    center_align = Alignment(horizontal="center", vertical="center")
-    
-    # 표제 부분
-    ws1['A1'] = "견적서"
-    ws1['A1'].font = Font(size=16, bold=True)
-    ws1['A1'].alignment = Alignment(horizontal="center")
-
-    # 고객명, PROJECT, 견적금액 등의 정보 추가
-    ws1['A3'] = "고객명:"
-    ws1['B3'] = "고객명"
-    ws1['A4'] = "PROJECT:"
-    ws1['B4'] = "과제명"
-    ws1['B5'] = "아래와 같이 견적을 제출 합니다."
-
-    # 견적금액
-    ws1['A7'] = "견적금액:"
-    ws1['A7'].border = Border(bottom=thick_border)  # 밑줄 추가
-    ws1['B7'] = f"{total_cost:,} 원"
-    ws1['B7'].border = Border(bottom=thick_border)
-    ws1['A8'].border = Border(bottom=thick_border)
-    ws1['B8'].border = Border(bottom=thick_border)
-
-    # 인도조건
-    ws1['A9'] = "1. 인 도 조 건:"
-    ws1['A9'].border = Border(bottom=thick_border)  # 밑줄 추가
-    ws1['B9'] = "귀사 지정도"
-    ws1['B9'].border = Border(bottom=thick_border)
-
-    # 납기
-    ws1['A10'] = "2. 납         기:"
-    ws1['A10'].border = Border(bottom=thick_border) # 밑줄 추가
-    ws1['B10'] = "협의"
-    ws1['B10'].border = Border(bottom=thick_border)
-
-    # 지불조건
-    ws1['A11'] = "3. 지 불 조 건:"
-    ws1['A11'].border = Border(bottom=thick_border)  # 밑줄 추가
-    ws1['B11'] = "협의"
-    ws1['B11'].border = Border(bottom=thick_border)
-
-    # 유효기간
-    ws1['A12'] = "4. 유 효 기 간:"
-    ws1['A12'].border = Border(bottom=thick_border)  # 밑줄 추가
-    ws1['B12'] = "견적일로 부터 30일"
-    ws1['B12'].border = Border(bottom=thick_border)
-
-    # 특기사항
-    ws1['A13'] = "5. 특 기 사 항:"
-    ws1['A13'].border = Border(bottom=thick_border)  # 밑줄 추가
-    ws1['B13'] = ""
-    ws1['B13'].border = Border(bottom=thick_border)
-
-    # 합계금액
-    ws1['A14'] = "6. 합 계 금 액:"
-    ws1['A14'].border = Border(bottom=thick_border)  # 밑줄 추가
-    ws1['B14'] = f"{total_cost:,} 원"
-    ws1['B14'].border = Border(bottom=thick_border)
-
-    # 담당자 정보
-    ws1['C7'] = "담당자."
-    ws1['D7'] = "OOO"
-
-    ws1['C9'] = "Tel. 041-"
-    ws1['D9'] = ""
-    ws1['C10'] = "Fax. 041-"
-    ws1['D10'] = ""
-    ws1['C11'] = "Mobile. 010-"
-    ws1['D11'] = ""
-    ws1['C12'] = "Quotation No."
-    ws1['D12'] = ""
-    ws1['C13'] = "Quotation Date."
-    ws1['D13'] = ""
-    ws1['C14'] = "담당자."
-    ws1['D14'] = "사업자번호."
-
-    # 열 너비 조정
-    ws1.column_dimensions['A'].width = 15
-    ws1.column_dimensions['B'].width = 30
-    ws1.column_dimensions['C'].width = 6
-    ws1.column_dimensions['E'].width = 15
-    ws1.column_dimensions['F'].width = 15
-    ws1.column_dimensions['G'].width = 20
-
-    # 유닛 정보 표 헤더
-    headers = ['번호', '유닛명', '수량', '단위', '단가', '합계', '비고']
-
-    # 표제 시트에서 16번째 행에 헤더 추가
-    start_row = 16
-
-    for col_idx, header in enumerate(headers, 1):
-        cell = ws1.cell(row=start_row, column=col_idx, value=header)
-        cell.border = thin_border
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = center_align
-
-    # 유닛 정보 추가
-    for idx, row in selected_menus_df.iterrows():
-        menu_id = row['ID']
-        menu_name = row['MenuName']
-        quantity = row['Quantity']
-        unit = '단위'  # 단위를 지정해 주세요
-        price = st.session_state.menu_df[st.session_state.menu_df["ID"] == menu_id]["TotalCost"].values[0] / quantity
-        total_cost = price * quantity
-        ws1.append([
-            idx + 1,
-            menu_name,
-            quantity,
-            unit,
-            price,
-            total_cost,
-            ""  # 비고는 빈칸
-        ])
-
-    # 인건비 추가
-    labor_total_cost = labor_cost_per_person * num_people
-    ws1.append([
-        len(selected_menus_df) + 1,
-        '인건비',
-        num_people,
-        '명',
-        labor_cost_per_person,
-        labor_total_cost,
-        ""
-    ])
-
-    # 모든 셀에 테두리 추가
-    for row in ws1.iter_rows(min_row=start_row, max_row=ws1.max_row, min_col=1, max_col=7):
-        for cell in row:
-            cell.border = thin_border
-            if cell.column in [5, 6]:  # '단가 (KRW)'와 '합계 (KRW)' 컬럼
-                cell.number_format = '#,##0 원'
-
-    # 가운데 정렬
-    for row in range(3, 100):  # A3부터 A19까지
-        cell = ws1[f'A{row}']
-        cell.alignment = center_align
-
-    for row in range(17, 100):  # C17부터 C19까지
-        cell = ws1[f'C{row}']
-        cell.alignment = center_align
-
-    for row in range(17, 100):  # D17부터 D19까지
-        cell = ws1[f'D{row}']
-        cell.alignment = center_align
-
-    #---------------------------------------------------------
-    # 두 번째 페이지: 세부 부품 및 비용 정보
-    ws2 = wb.create_sheet(title="세부")
-
-    # 세부 정보 표 헤더
-    ws2.append(['번호', '부품명', '수량', '단위', '단가', '합계'])
-
-    for cell in ws2[1]:
-        cell.border = thin_border
-        cell.fill = header_fill
-        cell.font = header_font
-        cell.alignment = center_align
-
-    # 세부 부품 및 비용 정보 추가
-    for idx, row in materials_df.iterrows():
-        ws2.append([row['ID'], row['IngredientName'], row['Quantity'], '단위', row['Price'], row['TotalCost']])
-
-    # 모든 셀에 테두리 추가
-    for row in ws2.iter_rows(min_row=2, max_row=ws2.max_row, min_col=1, max_col=6):
-        for cell in row:
-            cell.border = thin_border
-            if cell.column in [5, 6]:  # '단가 (KRW)'와 '합계 (KRW)' 컬럼
-                cell.number_format = '#,##0 원'
-
-    # 세부 정보 시트에서 합계 추가
-    ws2.append(['', '', '', '', '부품 총 비용:', f"{total_material_cost:,} 원"])
-    ws2.append(['', '', '', '', '인건비:', f"{labor_total_cost:,} 원"])
-    ws2.append(['', '', '', '', '전체 총 비용:', f"{total_material_cost + labor_total_cost:,} 원"])
-
-    # 가운데 정렬
-    for row in range(1, 100): 
-        cell = ws2[f'A{row}']
-        cell.alignment = center_align
-
-    for row in range(1, 100): 
-        cell = ws2[f'B{row}']
-        cell.alignment = center_align
-
-    for row in range(1, 100): 
-        cell = ws2[f'C{row}']
-        cell.alignment = center_align
-
-    for row in range(1, 100): 
-        cell = ws2[f'D{row}']
-        cell.alignment = center_align
-
-    for row in range(21, 24):  # E21부터 E23까지
-        cell = ws2[f'E{row}']
-        cell.alignment = center_align
-
-    # 열 너비 조정
-    ws2.column_dimensions['A'].width = 5
-    ws2.column_dimensions['B'].width = 10
-    ws2.column_dimensions['E'].width = 15
-    ws2.column_dimensions['F'].width = 15
-
-    excel_file_path = '견적서.xlsx'
-    wb.save(excel_file_path)
-    return excel_file_path
+    # 주문한 유닛의 작업 시간(하위 유닛 포함)과 준비 시간, 인원 수, 간접비로 인건비를 계산
+    unit_ids = list(quote.units)
+    with span("labor"):
+        labor_cost = labor.evaluate([line.quantity for line in quote.units.values()], num_people,
+                                    units=engine.unit_positions(unit_ids))
+    st.write(f'인건비: {format_won(labor_cost.total)}')
+    labor_lines = labor.lines(labor_cost)
+    if labor_lines:
+        st.dataframe(pd.DataFrame([("인원", num_people, "명", from_minor(labor.per_person_cost), from_minor(labor_cost.headcount))]
+                                  + [(name, quantity, unit, None if price is None else from_minor(price), from_minor(total))
+                                     for name, quantity, unit, price, total in labor_lines],
+                                  columns=["항목", "수량", "단위", "단가", "합계"]), hide_index=True)
+
+    # 마진은 부품비 + 인건비에, 부가세는 마진까지 더한 금액에 붙는다 (각각 최소 단위로 반올림)
+    margin_col, tax_col = st.columns(2)
+    margin_percent = margin_col.number_input('마진율 (%)', min_value=0.0, step=0.5, value=labor.margin_rate / 100)
+    tax_percent = tax_col.number_input('부가세율 (%)', min_value=0.0, step=1.0)
+    totals = quote_totals(quote.material_total, labor_cost.total, percent_to_bp(margin_percent), percent_to_bp(tax_percent))
+    if totals.margin_rate:
+        st.write(f'마진: {format_won(totals.margin)}')
+    if totals.tax_rate:
+        st.write(f'부가세: {format_won(totals.tax)}')
+    st.write(f'총 비용: {format_won(totals.total)}')
+
+    # 견적 저장은 여기서 바로 하고, 문서는 내보내기 대기열에서 형식별로 함께 만든다 (화면은 그동안 계속 편집 가능)
+    formats = available_formats()
+    export_formats = st.multiselect('내보낼 형식', formats, default=["xlsx"] if "xlsx" in formats else formats[:1])
+    if st.button('견적서 저장', disabled=not export_formats):
+        with span("export"):
+            prepared = prepare_quote(get_repo(), quote.materials_frame(), totals, labor.per_person_cost,
+                                     quote.units_frame(), num_people, price_as_of=price_as_of, labor_lines=labor_lines)
+            job_id = get_export_queue().submit(export_tasks(prepared, export_formats, get_workbook_cache()))
+        st.session_state.export_job = (job_id, prepared.header.quote_number)
+
+    if "export_job" in st.session_state:
+        export_panel(*st.session_state.export_job)
+
+    with st.expander("시나리오 비교"), span("scenarios"):
+        scenario_panel(engine, prices, quote, labor, num_people, totals)
+
+    with st.expander("단가 일괄 변경"), span("repricing"):
+        repricing_panel()
+
+    with st.expander("최근 견적"), span("recent_quotes"):
+        recent = get_repo().recent_quotes()
+        if recent:
+            st.dataframe(pd.DataFrame([(q.quote_number, q.created_at, q.customer, q.project, q.num_people, from_minor(q.total_cost), q.price_as_of)
+                                       for q in recent],
+                                      columns=["견적번호", "발행 시각(UTC)", "고객", "과제", "인원", "총 금액", "단가 기준일"]))
+        else:
+            st.write("발행한 견적이 없습니다.")
+
+# 재실행 한 번의 측정 결과와 최근 재실행의 p50/p95 를 사이드바에 표시
+def show_profile_panel(record, history):
+    with st.sidebar.expander("성능 측정", expanded=True):
+        sql = record["sql"]
+        st.write(f"재실행 {record['total_ms']:.1f} ms · SQL {sql['statements']}문장/{sql['blocks']}회 "
+                 f"{sql['ms']:.1f} ms (연결 대기 {sql['wait_ms']:.1f} ms)")
+        st.dataframe(pd.DataFrame([("  " * depth + name, ms) for name, depth, _, ms in record["spans"]],
+                                  columns=["구간", "ms"]), hide_index=True)
+        if record["slowest_sql"]:
+            ms, statements, first = record["slowest_sql"]
+            st.caption(f"가장 느린 SQL 블록 {ms:.1f} ms ({statements}문장): {first}")
+        if record["frames"]:
+            st.dataframe(pd.DataFrame([(name, *size) for name, size in record["frames"].items()],
+                                      columns=["표", "행", "열", "바이트"]), hide_index=True)
+        st.dataframe(pd.DataFrame(latency_summary(history), columns=["구간", "표본", "p50 ms", "p95 ms", "최대 ms"]),
+                     hide_index=True)
+        if PROFILE_LOG:
+            st.caption(f"기록 파일: {PROFILE_LOG}")
+
+
+# 성능 측정을 켰거나 기록 파일(GSI_PROFILE_LOG)이 지정되어 있으면 재실행 전체를 잰다.
+# st.rerun() 으로 중간에 끝난 재실행도 기록에 남긴다
+def profiled_main():
+    show_panel = st.session_state.get("profile_panel", False)
+    if not (show_panel or PROFILE_LOG):
+        main()
+        return
+    profile, token = start_rerun()
+    try:
+        main()
+    finally:
+        record = finish_rerun(profile, token)
+        if "profile_history" not in st.session_state:
+            st.session_state.profile_history = deque(maxlen=PROFILE_HISTORY)
+        st.session_state.profile_history.append(record)
+    if show_panel:
+        show_profile_panel(record, st.session_state.profile_history)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    profiled_main()
\ No newline at end of file
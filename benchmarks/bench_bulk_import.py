@@ -0,0 +1,102 @@
+import argparse
+import csv
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gsi_core.bulk_import import import_file
+from gsi_core.db import SQL_INSERT_INGREDIENT, CatalogRepository, ConnectionPool
+from gsi_core.money import to_minor
+
+
+def write_price_list(path, n_parts, price_step):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["부품명", "단가"])
+        for i in range(n_parts):
+            writer.writerow([f"Part {i}", f"{(i % 2000) * price_step:.2f}"])
+
+
+def write_price_list_xlsx(path, n_parts, price_step):
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet()
+    ws.append(["부품명", "단가"])
+    for i in range(n_parts):
+        ws.append([f"Part {i}", round((i % 2000) * price_step, 2)])
+    wb.save(path)
+
+
+def new_repository(path):
+    pool = ConnectionPool(path)
+    repo = CatalogRepository(pool)
+    repo.create_schema()
+    return pool, repo
+
+
+# 기존 사이드바 방식: 부품마다 연결을 열고 커밋
+def legacy_import(path, csv_path):
+    start = time.perf_counter()
+    with open(csv_path, encoding="utf-8", newline="") as f:
+        reader = csv.reader(f)
+        next(reader)
+        rows = 0
+        for name, price in reader:
+            conn = sqlite3.connect(path, timeout=30.0)
+            conn.execute(SQL_INSERT_INGREDIENT, (name, to_minor(price)))
+            conn.commit()
+            conn.close()
+            rows += 1
+    return rows, time.perf_counter() - start
+
+
+def report(label, rows, seconds, detail=""):
+    print(f"{label:<28} {rows:>8} {seconds:>9.3f} {rows / seconds:>12,.0f}  {detail}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="부품 단가표 일괄 가져오기 벤치마크")
+    parser.add_argument("--parts", type=int, default=20_000)
+    parser.add_argument("--legacy-limit", type=int, default=2_000, help="기존 방식으로 가져올 최대 행 수")
+    parser.add_argument("--chunk-sizes", default="500,5000,50000")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        first = os.path.join(tmp, "prices.csv")
+        second = os.path.join(tmp, "prices_v2.csv")
+        xlsx = os.path.join(tmp, "prices.xlsx")
+        write_price_list(first, args.parts, 0.05)
+        write_price_list(second, args.parts, 0.07)
+        write_price_list_xlsx(xlsx, args.parts, 0.05)
+
+        print(f"{'case':<28} {'rows':>8} {'seconds':>9} {'rows/s':>12}")
+
+        legacy_rows = min(args.parts, args.legacy_limit)
+        legacy_csv = os.path.join(tmp, "legacy.csv")
+        write_price_list(legacy_csv, legacy_rows, 0.05)
+        db = os.path.join(tmp, "legacy.db")
+        new_repository(db)[0].close()
+        # 기존 DB 와 같은 롤백 저널 모드에서 측정
+        sqlite3.connect(db).execute("PRAGMA journal_mode=DELETE").close()
+        report("legacy (행마다 커밋)", *legacy_import(db, legacy_csv))
+
+        for chunk_size in (int(size) for size in args.chunk_sizes.split(",")):
+            db = os.path.join(tmp, f"bulk_{chunk_size}.db")
+            pool, repo = new_repository(db)
+            result = import_file(repo, first, chunk_size=chunk_size)
+            report(f"csv 추가 chunk={chunk_size}", result.rows, result.seconds, f"추가 {result.inserted}")
+            result = import_file(repo, second, chunk_size=chunk_size)
+            report(f"csv 단가 변경 chunk={chunk_size}", result.rows, result.seconds, f"변경 {result.updated} 동일 {result.unchanged}")
+            result = import_file(repo, second, chunk_size=chunk_size)
+            report(f"csv 재적용 chunk={chunk_size}", result.rows, result.seconds, f"동일 {result.unchanged}")
+            pool.close()
+
+        pool, repo = new_repository(os.path.join(tmp, "xlsx.db"))
+        result = import_file(repo, xlsx)
+        report("xlsx 추가 chunk=5000", result.rows, result.seconds, f"추가 {result.inserted}")
+        pool.close()
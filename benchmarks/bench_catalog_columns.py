@@ -0,0 +1,92 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gsi_core.catalog_cache import CatalogCache
+from gsi_core.catalog_columns import DICTIONARY_COLUMNS, TABLE_COLUMNS, columns_dir, read_columns, write_columns
+from gsi_core.catalog_sync import load_column_frames, load_frames
+from synthetic import build_database, default_shape, generate_catalog
+
+# 사용법: python benchmarks/bench_catalog_columns.py --sizes 10000 100000 1000000
+# 새 프로세스가 카탈로그를 처음 읽는 시간을
+#   sqlite: 전체 조회(fetch_changes) + 튜플에서 DataFrame 만들기
+#   columns: 열 스냅샷(Arrow IPC) 메모리 매핑 + 이름 열 풀기
+# 로 비교하고, 비용 엔진까지 만든 CatalogCache.get() 첫 호출 시간도 함께 잰다.
+# 두 경로의 DataFrame 은 이름 열(columns 는 category)을 풀면 같아야 한다
+
+
+def sqlite_frames(repo):
+    changes = repo.fetch_changes()
+    state = {}
+    load_frames(state, changes.menus, changes.ingredients, changes.menu_ingredients, changes.menu_components)
+    return state
+
+
+def column_frames(directory):
+    state = {}
+    load_column_frames(state, read_columns(directory).frames)
+    return state
+
+
+# 이름 열(category)을 SQLite 에서 읽은 것과 같은 문자열 열로 (비교용)
+def decoded(df):
+    return df.astype({column: df[column].cat.categories.dtype for column in df.columns
+                      if isinstance(df[column].dtype, pd.CategoricalDtype)})
+
+
+def best_of(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return result, min(times)
+
+
+def cold_get(repo, columns):
+    start = time.perf_counter()
+    CatalogCache(repo, columns=columns).get()
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="카탈로그 열 스냅샷 로딩 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000], help="BOM 행 수")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'lines':>8} {'sqlite(s)':>10} {'columns(s)':>11} {'speedup':>8} {'write(s)':>9} {'size(MB)':>9} "
+          f"{'get sqlite(s)':>14} {'get columns(s)':>15}")
+    for n_lines in args.sizes:
+        n_units, n_parts = default_shape(n_lines)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "catalog.db")
+            repo = build_database(path, generate_catalog(n_units, n_parts, n_lines))
+            directory = columns_dir(path)
+
+            expected, sqlite_time = best_of(lambda: sqlite_frames(repo), args.repeat)
+            changes = repo.fetch_changes()
+            start = time.perf_counter()
+            name = write_columns(directory, changes.revision, changes.epoch, expected)
+            write_time = time.perf_counter() - start
+            size = sum(entry.stat().st_size for entry in os.scandir(os.path.join(directory, name)))
+
+            loaded, columns_time = best_of(lambda: column_frames(directory), args.repeat)
+            for table in TABLE_COLUMNS:
+                for column in DICTIONARY_COLUMNS:
+                    if column in loaded[table].columns:
+                        assert isinstance(loaded[table][column].dtype, pd.CategoricalDtype), (table, column)
+                pd.testing.assert_frame_equal(expected[table], decoded(loaded[table]))
+
+            get_sqlite = cold_get(repo, columns=False)
+            get_columns = cold_get(repo, columns=True)
+            repo.pool.close()
+
+        print(f"{n_lines:>8} {sqlite_time:>10.3f} {columns_time:>11.3f} {sqlite_time / columns_time:>7.1f}x "
+              f"{write_time:>9.3f} {size / 2 ** 20:>9.1f} {get_sqlite:>14.3f} {get_columns:>15.3f}")
@@ -0,0 +1,124 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gsi_core.cost_engine import CostEngine
+from gsi_core.money import QUANTITY_SCALE, from_minor, to_milli_array, to_minor_array
+
+
+# 벤치마크용 임의 카탈로그 생성
+def make_catalog(n_units, n_parts, parts_per_unit, seed=0):
+    rng = np.random.default_rng(seed)
+    menu_df = pd.DataFrame({
+        "ID": np.arange(1, n_units + 1),
+        "MenuName": [f"Unit {i}" for i in range(1, n_units + 1)],
+        "Quantity": rng.integers(0, 10, n_units),
+    })
+    ingredient_df = pd.DataFrame({
+        "ID": np.arange(1, n_parts + 1),
+        "IngredientName": [f"Part {i}" for i in range(1, n_parts + 1)],
+        # 최소 단위 (0.05 ~ 99.95 원)
+        "Price": rng.integers(1, 2000, n_parts) * 5,
+    })
+    menu_ids = np.repeat(menu_df["ID"].to_numpy(), parts_per_unit)
+    menu_ingredients_df = pd.DataFrame({
+        "MenuID": menu_ids,
+        "IngredientID": rng.integers(1, n_parts + 1, len(menu_ids)),
+        "Quantity": rng.integers(1, 40, len(menu_ids)) / 20,
+    }).sample(frac=1, random_state=seed).reset_index(drop=True)
+    return menu_df, menu_ingredients_df, ingredient_df
+
+
+# 기존 iterrows 기반 유닛 비용 계산 (비교 기준)
+def legacy_menu_costs(menu_df, menu_ingredients_df, ingredient_df):
+    menu_costs = []
+    for _, menu_row in menu_df.iterrows():
+        menu_id = menu_row["ID"]
+        quantity = menu_row["Quantity"]
+        total_cost = 0
+        menu_ingredients = menu_ingredients_df[menu_ingredients_df["MenuID"] == menu_id]
+        for _, mi_row in menu_ingredients.iterrows():
+            ingredient_id = mi_row["IngredientID"]
+            ingredient_price = ingredient_df[ingredient_df["ID"] == ingredient_id]["Price"].values[0]
+            ingredient_quantity = mi_row["Quantity"] * quantity
+            total_cost += ingredient_price * ingredient_quantity
+        menu_costs.append(total_cost)
+    return menu_costs
+
+
+# 기존 main() 의 부품 수량 집계 루프 (비교 기준)
+def legacy_part_rollup(menu_df, menu_ingredients_df, ingredient_df):
+    ingredient_df = ingredient_df.copy()
+    ingredient_df["Quantity"] = 0.0
+    ingredient_df["TotalCost"] = 0.0
+    for _, row in menu_df.iterrows():
+        menu_id = row["ID"]
+        quantity = row["Quantity"]
+        mi_df = menu_ingredients_df[menu_ingredients_df["MenuID"] == menu_id]
+        for _, mi_row in mi_df.iterrows():
+            ingredient_id = mi_row["IngredientID"]
+            unit_quantity = mi_row["Quantity"] * quantity
+            if ingredient_id in ingredient_df["ID"].values:
+                idx = ingredient_df[ingredient_df["ID"] == ingredient_id].index[0]
+                ingredient_df.at[idx, "Quantity"] += unit_quantity
+                ingredient_df.at[idx, "TotalCost"] = ingredient_df.at[idx, "Quantity"] * ingredient_df.at[idx, "Price"]
+    return ingredient_df["Quantity"].to_numpy(), ingredient_df["TotalCost"].to_numpy()
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def run(sizes, parts_per_unit, legacy_limit):
+    print(f"{'units':>8} {'parts':>8} {'lines':>10} {'build(ms)':>10} {'rollup(ms)':>11} {'legacy(ms)':>11} {'speedup':>8}")
+    for n_units, n_parts in sizes:
+        menu_df, mi_df, ingredient_df = make_catalog(n_units, n_parts, parts_per_unit)
+        unit_quantities = menu_df["Quantity"].to_numpy()
+        prices = ingredient_df["Price"].to_numpy()
+
+        engine, build_time = timed(CostEngine.from_frames, menu_df, mi_df, ingredient_df)
+
+        def engine_rollup():
+            return engine.part_rollup(unit_quantities, prices), engine.unit_costs(unit_quantities, prices)
+
+        (rollup, unit_costs), rollup_time = timed(engine_rollup)
+
+        legacy_text, speedup_text = "-", "-"
+        if len(mi_df) <= legacy_limit:
+            # 기존 루프는 원 단위 실수 단가로 계산했다
+            won_df = ingredient_df.assign(Price=from_minor(ingredient_df["Price"]))
+
+            def legacy():
+                return legacy_part_rollup(menu_df, mi_df, won_df), legacy_menu_costs(menu_df, mi_df, won_df)
+
+            (legacy_rollup, legacy_costs), legacy_time = timed(legacy)
+            # 부품 수량은 기존 루프의 수량을 1/1000 단위로 정리한 값과 같고 (실수 합의 0.8999… 같은 흔적이 없다),
+            # 부품 금액은 기존 금액을 최소 단위로 반올림한 값과 같다
+            assert np.array_equal(rollup[0], to_milli_array(legacy_rollup[0]) / QUANTITY_SCALE)
+            assert np.array_equal(rollup[1], to_minor_array(legacy_rollup[1]))
+            # 유닛 비용은 BOM 줄마다 반올림한 뒤 유닛 수량을 곱하므로 줄 수 × 수량 / 2 최소 단위 이내로 같다
+            lines_per_unit = np.bincount(mi_df["MenuID"], minlength=n_units + 1)[menu_df["ID"]]
+            tolerance = lines_per_unit * unit_quantities / 2 + 1
+            assert (np.abs(unit_costs - to_minor_array(legacy_costs)) <= tolerance).all()
+            legacy_text = f"{legacy_time * 1000:.1f}"
+            speedup_text = f"{legacy_time / (build_time + rollup_time):.0f}x"
+
+        print(f"{n_units:>8} {n_parts:>8} {len(mi_df):>10} {build_time * 1000:>10.2f} {rollup_time * 1000:>11.2f} {legacy_text:>11} {speedup_text:>8}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="BOM 비용 엔진 벤치마크")
+    parser.add_argument("--parts-per-unit", type=int, default=20)
+    parser.add_argument("--legacy-limit", type=int, default=20_000, help="기존 루프를 함께 실행할 최대 BOM 행 수")
+    args = parser.parse_args()
+
+    sizes = [(11, 41), (100, 1_000), (1_000, 10_000), (5_000, 50_000), (50_000, 200_000)]
+    run(sizes, args.parts_per_unit, args.legacy_limit)
@@ -0,0 +1,113 @@
+import argparse
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gsi_core.db import SQL_INSERT_INGREDIENT, SQL_SELECT_INGREDIENTS, CatalogRepository, ConnectionPool
+
+
+# 기존 방식: 호출마다 연결을 새로 열고 닫는다
+class ConnectPerCall:
+    def __init__(self, path):
+        self.path = path
+
+    def insert_ingredient(self, name, price):
+        conn = sqlite3.connect(self.path, timeout=30.0)
+        c = conn.cursor()
+        c.execute(SQL_INSERT_INGREDIENT, (name, price))
+        conn.commit()
+        conn.close()
+
+    def read_ingredients(self):
+        conn = sqlite3.connect(self.path, timeout=30.0)
+        rows = conn.execute(SQL_SELECT_INGREDIENTS).fetchall()
+        conn.close()
+        return rows
+
+
+# 연결 풀 방식
+class Pooled:
+    def __init__(self, path):
+        self.pool = ConnectionPool(path, size=16)
+        self.repo = CatalogRepository(self.pool)
+
+    def insert_ingredient(self, name, price):
+        self.repo.insert_ingredient(name, price)
+
+    def read_ingredients(self):
+        with self.pool.connection() as conn:
+            return conn.execute(SQL_SELECT_INGREDIENTS).fetchall()
+
+
+def prepare(path, n_parts):
+    pool = ConnectionPool(path)
+    repo = CatalogRepository(pool)
+    repo.create_schema()
+    repo.insert_many([], [(f"Part {i}", 10) for i in range(n_parts)], [])
+    pool.close()
+
+
+def run_workload(dao, readers, writers, ops):
+    errors = []
+    latencies = {"read": [], "write": []}
+    lock = threading.Lock()
+
+    def worker(kind, worker_id):
+        local = []
+        try:
+            for i in range(ops):
+                start = time.perf_counter()
+                if kind == "read":
+                    dao.read_ingredients()
+                else:
+                    dao.insert_ingredient(f"W{worker_id}-{i}", 50)
+                local.append(time.perf_counter() - start)
+        except sqlite3.Error as e:
+            errors.append(e)
+        with lock:
+            latencies[kind].extend(local)
+
+    threads = [threading.Thread(target=worker, args=("read", i)) for i in range(readers)]
+    threads += [threading.Thread(target=worker, args=("write", i)) for i in range(writers)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return time.perf_counter() - start, latencies, errors
+
+
+def percentile(values, p):
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="SQLite 동시 읽기/쓰기 벤치마크")
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--ops", type=int, default=200, help="스레드별 작업 수")
+    parser.add_argument("--parts", type=int, default=5_000, help="초기 부품 수")
+    args = parser.parse_args()
+
+    print(f"readers={args.readers} writers={args.writers} ops/thread={args.ops} parts={args.parts}")
+    print(f"{'mode':>16} {'total(s)':>9} {'ops/s':>9} {'read p95(ms)':>13} {'write p95(ms)':>14} {'errors':>7}")
+    for name, factory in (("connect-per-call", ConnectPerCall), ("pooled-wal", Pooled)):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "bench.db")
+            prepare(path, args.parts)
+            if factory is ConnectPerCall:
+                # 기존 DB 와 같은 롤백 저널 모드에서 측정
+                sqlite3.connect(path).execute("PRAGMA journal_mode=DELETE").close()
+            total, latencies, errors = run_workload(factory(path), args.readers, args.writers, args.ops)
+            n_ops = len(latencies["read"]) + len(latencies["write"])
+            print(f"{name:>16} {total:>9.2f} {n_ops / total:>9.0f} "
+                  f"{percentile(latencies['read'], 0.95) * 1000:>13.2f} "
+                  f"{percentile(latencies['write'], 0.95) * 1000:>14.2f} {len(errors):>7}")
@@ -0,0 +1,92 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook
+from openpyxl.styles import Alignment, Border, Font, PatternFill, Side
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gsi_core.export import build_quote_workbook, material_rows
+from gsi_core.money import amounts, quote_totals
+
+
+def make_materials(n_parts, seed=0):
+    rng = np.random.default_rng(seed)
+    quantity = rng.integers(0, 50, n_parts).astype(float)
+    # 최소 단위 (0.05 ~ 99.95 원)
+    price = rng.integers(1, 2000, n_parts) * 5
+    return pd.DataFrame({
+        "ID": np.arange(1, n_parts + 1),
+        "IngredientName": [f"Part {i}" for i in range(1, n_parts + 1)],
+        "Price": price,
+        "Quantity": quantity,
+        "TotalCost": amounts(quantity, price),
+    })
+
+
+# 기존 save_to_excel 의 세부 시트 작성 방식 (메모리 통합문서 + 셀 단위 스타일, 비교 기준)
+def legacy_save(materials_df, path):
+    wb = Workbook()
+    thin_border = Side(border_style="thin", color="000000")
+    header_font = Font(bold=True, color="FFFFFF")
+    header_fill = PatternFill(start_color="4F81BD", end_color="4F81BD", fill_type="solid")
+    center_align = Alignment(horizontal="center", vertical="center")
+    ws2 = wb.create_sheet(title="세부")
+    ws2.append(['번호', '부품명', '수량', '단위', '단가', '합계'])
+    for cell in ws2[1]:
+        cell.border = Border(left=thin_border, right=thin_border, top=thin_border, bottom=thin_border)
+        cell.fill = header_fill
+        cell.font = header_font
+        cell.alignment = center_align
+    for idx, row in materials_df.iterrows():
+        ws2.append([row['ID'], row['IngredientName'], row['Quantity'], '단위', row['Price'], row['TotalCost']])
+    for row in ws2.iter_rows(min_row=2, max_row=ws2.max_row, min_col=1, max_col=6):
+        for cell in row:
+            cell.border = Border(left=thin_border, right=thin_border, top=thin_border, bottom=thin_border)
+            if cell.column in [5, 6]:
+                cell.number_format = '#,##0 원'
+    for row in range(1, 100):
+        for column in 'ABCD':
+            ws2[f'{column}{row}'].alignment = center_align
+    wb.save(path)
+
+
+# 시간은 tracemalloc 없이 재고, 최대 메모리는 한 번 더 실행해서 잰다
+def measure(fn, make_args):
+    start = time.perf_counter()
+    result = fn(*make_args())
+    elapsed = time.perf_counter() - start
+    tracemalloc.start()
+    fn(*make_args())
+    peak = tracemalloc.get_traced_memory()[1] / 2 ** 20
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="견적서 엑셀 생성 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--legacy-limit", type=int, default=10_000, help="기존 방식을 함께 실행할 최대 부품 수")
+    args = parser.parse_args()
+
+    selected_menus = [(f"Unit {i}", 2, 10_000, 20_000) for i in range(20)]
+    print(f"{'parts':>8} {'stream(s)':>10} {'peak(MB)':>9} {'size(KB)':>9} {'legacy(s)':>10} {'peak(MB)':>9}")
+    for n_parts in args.sizes:
+        materials_df = make_materials(n_parts)
+        totals = quote_totals(int(materials_df["TotalCost"].sum()), 1_000_000)
+        data, elapsed, peak = measure(
+            build_quote_workbook, lambda: (material_rows(materials_df), totals, 1_000_000, selected_menus, 1))
+
+        legacy_time, legacy_peak = "-", "-"
+        if n_parts <= args.legacy_limit:
+            with tempfile.TemporaryDirectory() as tmp:
+                _, t, p = measure(legacy_save, lambda: (materials_df, os.path.join(tmp, "legacy.xlsx")))
+            legacy_time, legacy_peak = f"{t:.2f}", f"{p:.1f}"
+
+        print(f"{n_parts:>8} {elapsed:>10.2f} {peak:>9.1f} {len(data) / 1024:>9.0f} {legacy_time:>10} {legacy_peak:>9}")
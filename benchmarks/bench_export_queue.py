@@ -0,0 +1,74 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_excel_export import make_materials
+from gsi_core.export import QuoteDocument, available_formats, material_rows, render
+from gsi_core.export_queue import ExportQueue
+from gsi_core.money import quote_totals
+
+# 사용법: python benchmarks/bench_export_queue.py --sizes 1000 10000 --formats xlsx pdf csv
+# 견적서 한 건을 여러 형식으로
+#   serial: 화면 스레드에서 형식마다 차례로 만들기 (예전 '엑셀로 저장' 과 같은 방식)
+#   queue: ExportQueue 에 넣고 끝날 때까지 기다리기
+# 로 만들어서 시간을 비교하고, queue 가 도는 동안 화면 스레드가 1 ms 작업을 반복할 때 한 번에 걸린 시간(p50/최대)을 잰다
+
+
+def make_document(n_parts):
+    materials_df = make_materials(n_parts)
+    totals = quote_totals(int(materials_df["TotalCost"].sum()), 1_000_000, 1000, 1000)
+    selected_menus = [(f"Unit {i}", 2, 10_000, 20_000) for i in range(20)]
+    return QuoteDocument(list(material_rows(materials_df)), totals, 1_000_000, selected_menus, 1, "고객", "과제",
+                         "GSI-BENCH-0001", "2024-01-01", [])
+
+
+# 작업이 끝날 때까지 1 ms 짜리 일을 10 ms 간격으로 반복하면서 한 번에 걸린 시간을 모은다 (화면 재실행이 얼마나 밀리는지)
+def interactive_ticks(queue, job_id):
+    ticks = []
+    while queue.status(job_id).state != "done":
+        start = time.perf_counter()
+        deadline = start + 0.001
+        while time.perf_counter() < deadline:
+            pass
+        ticks.append(time.perf_counter() - start)
+        time.sleep(0.01)
+    return np.array(ticks) * 1000
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="견적서 내보내기 대기열 벤치마크")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000])
+    parser.add_argument("--formats", nargs="+", default=available_formats())
+    parser.add_argument("--workers", type=int, default=3)
+    args = parser.parse_args()
+
+    queue = ExportQueue(workers=args.workers)
+    print(f"formats {', '.join(args.formats)}, workers {args.workers}")
+    print(f"{'parts':>8} {'serial(s)':>10} {'queue(s)':>9} {'submit(ms)':>11} {'tick p50':>9} {'tick max':>9}  per format(s)")
+    for n_parts in args.sizes:
+        doc = make_document(n_parts)
+
+        per_format = {}
+        start = time.perf_counter()
+        for format_name in args.formats:
+            format_start = time.perf_counter()
+            render(doc, format_name)
+            per_format[format_name] = time.perf_counter() - format_start
+        serial = time.perf_counter() - start
+
+        start = time.perf_counter()
+        job_id = queue.submit({format_name: (lambda f=format_name: render(doc, f)) for format_name in args.formats})
+        submit = time.perf_counter() - start
+        ticks = interactive_ticks(queue, job_id)
+        job = queue.wait(job_id)
+        assert not job.errors, job.errors
+
+        formats = " ".join(f"{name}={seconds:.2f}" for name, seconds in per_format.items())
+        print(f"{n_parts:>8} {serial:>10.2f} {job.seconds:>9.2f} {submit * 1000:>11.2f} "
+              f"{np.median(ticks):>9.2f} {ticks.max():>9.2f}  {formats}")
+    queue.shutdown()
@@ -0,0 +1,44 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (설명, 새 인터프리터에서 실행할 코드)
+CASES = [
+    ("python 시작만", "pass"),
+    ("UI 모듈 (GSI_최종본)", "import GSI_최종본"),
+    ("기존 단일 모듈 의존성", "import streamlit, pandas, openpyxl"),
+    ("gsi_core 패키지", "import gsi_core"),
+    ("인건비 계산", "from gsi_core.pricing import calculate_labor_cost; calculate_labor_cost(3)"),
+    ("DB 접근", "from gsi_core import get_repository"),
+    ("가격 계산 (numpy/pandas)", "from gsi_core.pricing import price_units; from gsi_core.cost_engine import CostEngine"),
+    ("엑셀 모듈 (openpyxl 미사용)", "import gsi_core.export"),
+    ("엑셀 생성 준비 (openpyxl)", "import gsi_core.export, openpyxl"),
+]
+
+
+def cold_start(code, repeat):
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True)
+        times.append(time.perf_counter() - start)
+        if result.returncode != 0:
+            return None
+    return statistics.median(times)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="새 프로세스에서의 import 시간 비교")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'case':<30} {'median(ms)':>11}")
+    for label, code in CASES:
+        elapsed = cold_start(code, args.repeat)
+        text = "실패 (모듈 없음)" if elapsed is None else f"{elapsed * 1000:.0f}"
+        print(f"{label:<30} {text:>11}")
@@ -0,0 +1,90 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gsi_core.cost_engine import CostEngine
+from gsi_core.db import LaborRows
+from gsi_core.labor import LaborModel
+from gsi_core.pricing import price_scenarios, price_units
+from synthetic import catalog_frames, default_shape, generate_catalog
+
+# 사용법: python benchmarks/bench_labor_model.py --lines 100000 --quotes 2000
+# 견적 시나리오 여러 건의 합계(부품비 + 인건비 모델 + 마진/부가세)를
+#   loop: 견적마다 price_units (배치 엑셀 경로와 같은 계산)
+#   vectorized: 견적 × 유닛 수량 행렬 한 번으로 price_scenarios
+# 로 계산해서 시간과 결과를 비교한다
+
+
+# 역할 n_roles 개, 유닛의 unit_fraction 에 역할별 작업 시간 (0.25 시간 단위), 그중 일부는 준비 시간도
+def random_labor(menu_ids, n_roles, unit_fraction, seed=0):
+    rng = np.random.default_rng(seed)
+    roles = [(role_id, f"Role {role_id}", int(rng.integers(10, 60)) * 100_000) for role_id in range(1, n_roles + 1)]
+    unit_labor = []
+    for menu_id in menu_ids[rng.random(len(menu_ids)) < unit_fraction].tolist():
+        for role_id in rng.choice(n_roles, int(rng.integers(1, n_roles + 1)), replace=False).tolist():
+            setup = int(rng.integers(0, 4)) * 0.25 if rng.random() < 0.3 else 0
+            unit_labor.append((menu_id, role_id + 1, int(rng.integers(1, 8)) * 0.25, setup))
+    return LaborRows((1_000_000, 1_500, 1_000), roles, unit_labor)
+
+
+# 견적마다 유닛 units_per_quote 개를 1~5 개씩
+def random_quotes(n_units, n_quotes, units_per_quote, seed=0):
+    rng = np.random.default_rng(seed)
+    quotes = []
+    for _ in range(n_quotes):
+        positions = rng.choice(n_units, units_per_quote, replace=False)
+        quotes.append((positions, rng.integers(1, 6, units_per_quote), int(rng.integers(0, 4))))
+    return quotes
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="인건비 모델을 포함한 견적 시나리오 일괄 계산 벤치마크")
+    parser.add_argument("--lines", type=int, default=100_000, help="합성 카탈로그의 BOM 행 수")
+    parser.add_argument("--quotes", type=int, default=2_000)
+    parser.add_argument("--units-per-quote", type=int, default=5)
+    parser.add_argument("--roles", type=int, default=4)
+    parser.add_argument("--loop-limit", type=int, default=500, help="견적별 계산을 함께 실행할 최대 견적 수")
+    args = parser.parse_args()
+
+    n_units, n_parts = default_shape(args.lines)
+    menu_df, mi_df, ingredient_df, mc_df = catalog_frames(generate_catalog(n_units, n_parts, args.lines))
+    engine = CostEngine.from_frames(menu_df, mi_df, ingredient_df, mc_df)
+    prices = ingredient_df["Price"].to_numpy()
+
+    start = time.perf_counter()
+    labor = LaborModel.from_rows(random_labor(menu_df["ID"].to_numpy(), args.roles, 0.3), engine)
+    model_time = time.perf_counter() - start
+
+    quotes = random_quotes(engine.n_units, args.quotes, args.units_per_quote)
+    unit_quantities = np.zeros((len(quotes), engine.n_units))
+    for row, (positions, quantities, _) in enumerate(quotes):
+        unit_quantities[row, positions] = quantities
+    num_people = np.array([people for _, _, people in quotes])
+
+    # 주문된 유닛 열만 넘긴다 (배치의 --totals-only 와 같은 방식)
+    start = time.perf_counter()
+    used = np.flatnonzero(unit_quantities.any(axis=0))
+    totals = price_scenarios(engine, unit_quantities[:, used], prices, num_people, labor, labor.margin_rate, 1000,
+                             units=used)
+    vectorized_time = time.perf_counter() - start
+
+    names = menu_df["MenuName"].to_numpy()
+    n_loop = min(len(quotes), args.loop_limit)
+    start = time.perf_counter()
+    for row, (positions, quantities, people) in enumerate(quotes[:n_loop]):
+        quote = price_units(menu_df, ingredient_df, engine, dict(zip(names[positions], quantities.tolist())), people,
+                            prices=prices, margin_rate=labor.margin_rate, tax_rate=1000, labor=labor)
+        # 같은 반올림 규칙이라 한 건씩 계산해도 정확히 같다
+        assert quote.totals.total == totals.total[row], (row, quote.totals, totals.total[row])
+    loop_time = (time.perf_counter() - start) / n_loop * len(quotes)
+
+    print(f"units {engine.n_units}, roles {labor.n_roles}, quotes {len(quotes)}")
+    print(f"labor model build: {model_time * 1000:.2f} ms")
+    print(f"vectorized: {vectorized_time * 1000:.2f} ms ({vectorized_time / len(quotes) * 1e6:.1f} us/quote)")
+    print(f"loop (price_units, {n_loop}건에서 추정): {loop_time * 1000:.2f} ms ({loop_time / len(quotes) * 1e6:.1f} us/quote)")
+    print(f"speedup: {loop_time / vectorized_time:.1f}x")
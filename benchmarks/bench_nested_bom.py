@@ -0,0 +1,94 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gsi_core.cost_engine import CostEngine
+
+
+# 층별로 쌓인 제품 트리: 0층은 부품만, k층 유닛은 k-1층 유닛 children 개를 공유해서 포함
+def make_tree(levels, width, n_parts, parts_per_unit, children, seed=0):
+    rng = np.random.default_rng(seed)
+    n_units = levels * width
+    menu_ids = np.arange(1, n_units + 1)
+    mi_menu = np.repeat(menu_ids, parts_per_unit)
+    mi_part = np.concatenate([rng.choice(n_parts, parts_per_unit, replace=False) + 1 for _ in range(n_units)])
+    mi_qty = rng.integers(1, 5, len(mi_menu)).astype(float)
+    mc_parent, mc_child = [], []
+    for level in range(1, levels):
+        for unit in range(level * width, (level + 1) * width):
+            for child in rng.choice(width, children, replace=False):
+                mc_parent.append(unit + 1)
+                mc_child.append((level - 1) * width + child + 1)
+    mc_qty = rng.integers(1, 4, len(mc_parent)).astype(float)
+    # 최소 단위 (0.05 ~ 99.95 원)
+    prices = rng.integers(1, 2000, n_parts) * 5
+    return (menu_ids, np.arange(1, n_parts + 1), mi_menu, mi_part, mi_qty,
+            np.array(mc_parent), np.array(mc_child), mc_qty), prices
+
+
+# 메모 없이 견적마다 하위 유닛을 재귀로 다시 펼치는 방식 (비교 기준)
+def naive_unit_cost(unit, direct, children, prices):
+    cost = sum(prices[part - 1] * quantity for part, quantity in direct.get(unit, ()))
+    for child, quantity in children.get(unit, ()):
+        cost += quantity * naive_unit_cost(child, direct, children, prices)
+    return cost
+
+
+def timed(fn, *args, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn(*args)
+    return result, (time.perf_counter() - start) / repeat
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="다단계 BOM 펼치기 / 유닛 비용 메모 벤치마크")
+    parser.add_argument("--width", type=int, default=200, help="층별 유닛 수")
+    parser.add_argument("--parts", type=int, default=5_000)
+    parser.add_argument("--parts-per-unit", type=int, default=10)
+    parser.add_argument("--children", type=int, default=3, help="유닛별 하위 유닛 수")
+    parser.add_argument("--naive-limit", type=int, default=10, help="재귀 방식을 함께 실행할 최대 층 수")
+    args = parser.parse_args()
+
+    print(f"{'levels':>6} {'lines':>8} {'build(ms)':>10} {'quote(ms)':>10} {'memo hit(ms)':>13} "
+          f"{'1 price(ms)':>12} {'naive quote(ms)':>16}")
+    for levels in (2, 4, 6, 8, 10):
+        source, prices = make_tree(levels, args.width, args.parts, args.parts_per_unit, args.children)
+        engine, build_time = timed(CostEngine, *source)
+
+        # 최상위 유닛 하나를 1개 주문하는 견적
+        top = engine.n_units - 1
+        unit_quantities = np.zeros(engine.n_units)
+        unit_quantities[top] = 1
+        cost, quote_time = timed(engine.unit_costs, unit_quantities, prices, repeat=20)
+
+        engine.unit_prices(prices)
+        _, hit_time = timed(engine.unit_prices, prices, repeat=20)
+        # 처음 단가가 바뀔 때 부품 → 유닛 역색인을 한 번 만든다
+        warm = prices.copy()
+        warm[int(source[3][-1]) - 1] += 5
+        engine.unit_prices(warm)
+        changed = warm.copy()
+        changed[int(source[3][0]) - 1] += 5
+        _, change_time = timed(engine.unit_prices, changed)
+        assert np.array_equal(engine.unit_prices(changed), CostEngine(*source).unit_prices(changed))
+
+        naive_text = "-"
+        if levels <= args.naive_limit:
+            direct, children = {}, {}
+            for menu_id, part, quantity in zip(source[2].tolist(), source[3].tolist(), source[4].tolist()):
+                direct.setdefault(menu_id, []).append((part, quantity))
+            for parent, child, quantity in zip(source[5].tolist(), source[6].tolist(), source[7].tolist()):
+                children.setdefault(parent, []).append((child, quantity))
+            naive_cost, naive_time = timed(naive_unit_cost, int(source[0][top]), direct, children, prices)
+            # 수량이 모두 정수라 반올림 없이 정확히 같다
+            assert naive_cost == cost[top]
+            naive_text = f"{naive_time * 1000:.2f}"
+
+        print(f"{levels:>6} {len(engine.quantities):>8} {build_time * 1000:>10.2f} {quote_time * 1000:>10.3f} "
+              f"{hit_time * 1000:>13.3f} {change_time * 1000:>12.3f} {naive_text:>16}")
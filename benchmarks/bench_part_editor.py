@@ -0,0 +1,79 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from streamlit.dataframe_util import convert_pandas_df_to_arrow_bytes
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gsi_core.editor_window import changed_cells, editor_window
+
+EDITABLE = ["Quantity", "Include"]
+
+
+def make_parts(n_parts, n_active, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({"ID": np.arange(1, n_parts + 1), "IngredientName": [f"Part {i}" for i in range(n_parts)],
+                       "Price": rng.integers(1, 2000, n_parts) / 20, "Quantity": 0.0, "TotalCost": 0.0, "Include": False})
+    active = rng.choice(n_parts, n_active, replace=False)
+    df.loc[active, "Quantity"] = rng.integers(1, 10, n_active).astype(float)
+    return df
+
+
+# 편집기에서 한 칸을 바꾼 결과
+def edit_one(frame, rng):
+    edited = frame.copy()
+    edited.iloc[rng.integers(len(frame)), edited.columns.get_loc("Quantity")] += 1
+    return edited
+
+
+# 기존 방식: 전체 표를 보내고 전체를 update
+def full_rerun(df, rng):
+    payload = convert_pandas_df_to_arrow_bytes(df)
+    df.update(edit_one(df, rng))
+    df["TotalCost"] = df["Price"] * df["Quantity"]
+    return len(payload)
+
+
+# 페이지 방식: 공유 카탈로그(ID, 이름, 단가)에서 현재 페이지 + 수량이 있는 행만 골라
+# 그 행에만 세션의 수량 {ID: 수량} 을 채워 보내고, 바뀐 칸만 수량 dict 에 반영
+def windowed_rerun(df, quantities, rng, page_size):
+    pinned = df["ID"].isin(quantities.keys()).to_numpy()
+    window = editor_window(df[["ID", "IngredientName", "Price"]], page=3, page_size=page_size, pinned=pinned)
+    ids = window.frame["ID"].tolist()
+    frame = window.frame.assign(Quantity=[quantities.get(i, 0.0) for i in ids])
+    frame["TotalCost"] = frame["Price"] * frame["Quantity"]
+    frame["Include"] = False
+    payload = convert_pandas_df_to_arrow_bytes(frame)
+    for index, quantity in changed_cells(frame, edit_one(frame, rng), EDITABLE).get("Quantity", {}).items():
+        quantities[frame.at[index, "ID"]] = quantity
+    return len(payload)
+
+
+def timed(fn, *args, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn(*args)
+    return result, (time.perf_counter() - start) / repeat
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="부품 편집 표 (전체 vs 페이지) 재실행 비용 벤치마크")
+    parser.add_argument("--sizes", default="1000,10000,50000,200000")
+    parser.add_argument("--active", type=int, default=30, help="수량이 들어 있는 부품 수")
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"{'parts':>8} {'full(ms)':>9} {'full KB':>9} {'paged(ms)':>10} {'paged KB':>9} {'speedup':>8}")
+    for n_parts in (int(size) for size in args.sizes.split(",")):
+        rng = np.random.default_rng(1)
+        full_bytes, full_time = timed(full_rerun, make_parts(n_parts, args.active), rng, repeat=args.repeat)
+        df = make_parts(n_parts, args.active)
+        quantities = dict(zip(df.loc[df["Quantity"] > 0, "ID"].tolist(), df.loc[df["Quantity"] > 0, "Quantity"].tolist()))
+        paged_bytes, paged_time = timed(windowed_rerun, df, quantities, rng, args.page_size, repeat=args.repeat)
+        print(f"{n_parts:>8} {full_time * 1000:>9.1f} {full_bytes / 1024:>9.0f} {paged_time * 1000:>10.2f} "
+              f"{paged_bytes / 1024:>9.1f} {full_time / paged_time:>7.0f}x")
@@ -0,0 +1,90 @@
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gsi_core.db import CatalogRepository, ConnectionPool
+
+PREFIXES = ["STM32F", "ATmega", "ESP32-", "LM", "TPS", "GRM", "RC0603", "칩저항 ", "적층세라믹 ", "커넥터 "]
+
+
+def part_names(n_parts, seed=0):
+    rng = np.random.default_rng(seed)
+    return [f"{PREFIXES[p]}{n:05d}{chr(65 + s)}" for p, n, s in
+            zip(rng.integers(0, len(PREFIXES), n_parts), rng.permutation(n_parts), rng.integers(0, 26, n_parts))]
+
+
+# 부품명 하나를 한 글자씩 입력하는 상황 (중간에 오타 한 번)
+def keystrokes(names, n_words, seed=1):
+    rng = np.random.default_rng(seed)
+    queries = []
+    for name in rng.choice(names, n_words):
+        queries += [name[:i] for i in range(1, len(name) + 1)]
+        queries.append(name[:3] + name[4] + name[3] + name[5:])
+    return queries
+
+
+def percentiles(samples):
+    samples = np.array(samples) * 1000
+    return np.percentile(samples, 50), np.percentile(samples, 95), samples.max()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="부품 검색 (유닛 추가 양식) 지연 시간 벤치마크")
+    parser.add_argument("--parts", type=int, default=50_000)
+    parser.add_argument("--words", type=int, default=50, help="한 글자씩 입력할 부품명 수")
+    parser.add_argument("--limit", type=int, default=50, help="한 페이지 결과 수")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pool = ConnectionPool(os.path.join(tmp, "search.db"))
+        repo = CatalogRepository(pool)
+        repo.create_schema()
+        names = part_names(args.parts)
+        start = time.perf_counter()
+        repo.insert_many([], [(name, 100) for name in names], [])
+        print(f"parts={args.parts} insert+index {time.perf_counter() - start:.2f}s")
+
+        # 기존 방식: 전체 부품을 dict 로 만들어 multiselect 옵션으로 보낸다
+        ingredient_df = pd.DataFrame({"ID": np.arange(1, args.parts + 1), "IngredientName": names})
+        start = time.perf_counter()
+        records = ingredient_df[['ID', 'IngredientName']].to_dict(orient='records')
+        options = list({record['IngredientName']: record['ID'] for record in records})
+        payload = len(json.dumps(options, ensure_ascii=False).encode("utf-8"))
+        print(f"{'full option list':<22} build {(time.perf_counter() - start) * 1000:.1f} ms per rerun, "
+              f"payload {payload / 1024:.0f} KB")
+
+        queries = keystrokes(names, args.words)
+        timings, modes, sizes = {}, {}, []
+        for query in queries:
+            start = time.perf_counter()
+            page = repo.search_ingredients(query, limit=args.limit)
+            elapsed = time.perf_counter() - start
+            key = "short (<3, LIKE)" if len(query) < 3 else page.mode
+            timings.setdefault(key, []).append(elapsed)
+            sizes.append(len(json.dumps([row[1] for row in page.rows], ensure_ascii=False).encode("utf-8")))
+            modes[key] = modes.get(key, 0) + 1
+
+        # 다음 페이지 (offset) 조회
+        paged = []
+        for query in queries[::7]:
+            start = time.perf_counter()
+            repo.search_ingredients(query, limit=args.limit, offset=args.limit * 3)
+            paged.append(time.perf_counter() - start)
+        timings["page 4 (offset)"] = paged
+
+        print(f"{'search':<22} {'queries':>8} {'p50(ms)':>8} {'p95(ms)':>8} {'max(ms)':>8}")
+        for key, samples in timings.items():
+            p50, p95, worst = percentiles(samples)
+            print(f"{key:<22} {len(samples):>8} {p50:>8.2f} {p95:>8.2f} {worst:>8.2f}")
+        p50, p95, worst = percentiles(sum(timings.values(), []))
+        print(f"{'all keystrokes':<22} {sum(map(len, timings.values())):>8} {p50:>8.2f} {p95:>8.2f} {worst:>8.2f}")
+        print(f"page payload: max {max(sizes) / 1024:.1f} KB")
+        pool.close()
@@ -0,0 +1,94 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gsi_core.db import SQL_INSERT_PRICE_HISTORY, CatalogRepository, ConnectionPool, normalize_timestamp
+from gsi_core.price_history import get_price_history
+
+# 부품마다 한 건씩 보내는 기준일 단가 조회 (비교 기준)
+SQL_SELECT_PRICE_AS_OF = '''SELECT Price FROM PriceHistory WHERE IngredientID = ? AND EffectiveFrom <= ?
+                            ORDER BY EffectiveFrom DESC, rowid DESC LIMIT 1'''
+
+
+def prepare(path, n_parts, changes_per_part, seed=0):
+    rng = np.random.default_rng(seed)
+    pool = ConnectionPool(path)
+    repo = CatalogRepository(pool)
+    repo.create_schema()
+    repo.insert_many([], [(f"Part {i}", int(rng.integers(1, 2000))) for i in range(n_parts)], [])
+    # 2022~2025 사이의 임의 시점 단가 변경
+    start = np.datetime64("2022-01-01T00:00:00")
+    offsets = rng.integers(0, 4 * 365 * 86400, n_parts * changes_per_part)
+    rows = [(int(i % n_parts) + 1, str(start + np.timedelta64(int(o), "s")).replace("T", " "), int(p))
+            for i, (o, p) in enumerate(zip(offsets, rng.integers(1, 2000, len(offsets))))]
+    # 모든 기준일에 단가가 있도록 2021년 시작 단가를 함께 넣는다
+    rows += [(i + 1, "2021-01-01 00:00:00", int(p)) for i, p in enumerate(rng.integers(1, 2000, n_parts))]
+    with pool.transaction() as conn:
+        conn.executemany(SQL_INSERT_PRICE_HISTORY, rows)
+    return pool, repo
+
+
+def random_dates(n_quotes, n_dates, seed=1):
+    rng = np.random.default_rng(seed)
+    days = np.datetime64("2022-01-01") + rng.integers(0, 4 * 365, n_dates)
+    return [str(day) for day in rng.choice(days, n_quotes)]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="기준일 단가 조회 벤치마크")
+    parser.add_argument("--parts", type=int, default=20_000)
+    parser.add_argument("--changes", type=int, default=10, help="부품별 단가 변경 횟수")
+    parser.add_argument("--quotes", type=int, default=2_000, help="다시 계산할 과거 견적 수")
+    parser.add_argument("--dates", type=int, default=250, help="서로 다른 견적 기준일 수")
+    parser.add_argument("--parts-per-quote", type=int, default=200)
+    parser.add_argument("--naive-quotes", type=int, default=200, help="부품별 쿼리 방식으로 처리할 견적 수")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "history.db")
+        pool, repo = prepare(path, args.parts, args.changes)
+        dates = random_dates(args.quotes, args.dates)
+        rng = np.random.default_rng(2)
+        quote_parts = [rng.choice(args.parts, args.parts_per_quote, replace=False) + 1 for _ in dates]
+        ingredient_ids = np.arange(1, args.parts + 1)
+        print(f"parts={args.parts} history rows={args.parts * (args.changes + 2)} quotes={args.quotes} dates={args.dates}")
+
+        # 1) 견적마다, 부품마다 쿼리
+        n_naive = min(args.naive_quotes, len(dates))
+        start = time.perf_counter()
+        with pool.connection() as conn:
+            naive = [
+                np.array([conn.execute(SQL_SELECT_PRICE_AS_OF, (int(p), normalize_timestamp(d, end_of_day=True))).fetchone()[0]
+                          for p in parts])
+                for d, parts in zip(dates[:n_naive], quote_parts[:n_naive])
+            ]
+        naive_time = (time.perf_counter() - start) / n_naive * len(dates)
+
+        # 2) 기준일마다 SQL 한 문장 (부품별 인덱스 범위 조회)
+        start = time.perf_counter()
+        by_date = {d: repo.prices_as_of(d) for d in sorted(set(dates))}
+        sql_time = time.perf_counter() - start
+
+        # 3) 이력을 한 번 읽고 기준일마다 searchsorted
+        start = time.perf_counter()
+        history = get_price_history(path)
+        load_time = time.perf_counter() - start
+        start = time.perf_counter()
+        vectors = {d: history.prices_as_of(d, ingredient_ids) for d in sorted(set(dates))}
+        vector_time = time.perf_counter() - start
+
+        for d, parts, expected in zip(dates[:n_naive], quote_parts[:n_naive], naive):
+            assert np.array_equal(vectors[d][parts - 1], expected)
+            assert np.array_equal(np.array([by_date[d][int(p)] for p in parts]), expected)
+
+        print(f"{'mode':<34} {'seconds':>9} {'quotes/s':>10}")
+        print(f"{'part-by-part query (extrapolated)':<34} {naive_time:>9.2f} {len(dates) / naive_time:>10,.0f}")
+        print(f"{'one SQL per as-of date':<34} {sql_time:>9.2f} {len(dates) / sql_time:>10,.0f}")
+        print(f"{'in-memory searchsorted':<34} {vector_time:>9.2f} {len(dates) / vector_time:>10,.0f}  (+{load_time:.2f}s load)")
+        pool.close()
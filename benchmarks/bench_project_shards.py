@@ -0,0 +1,68 @@
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gsi_core import projects
+from gsi_core.db import get_repository
+
+# 사용법: python benchmarks/bench_project_shards.py --projects 4 --transactions 200 --rows 200
+# 프로젝트 여러 개가 동시에 단가표를 가져오는 상황을
+#   shared: 모든 프로젝트가 DB 파일 하나를 같이 쓰기 (예전 restaurant_menu.db 하나)
+#   sharded: 프로젝트마다 자기 DB 파일 (projects.open_project)
+# 로 실행해서 전체 시간과 트랜잭션 지연(p50/p95, 쓰기 잠금 대기 포함)을 비교한다
+
+
+# 스레드 하나 = 프로젝트 하나. 트랜잭션마다 새 부품 rows 개를 넣고 그중 절반의 단가를 바꾼다
+def import_prices(repo, project, n_transactions, n_rows, latencies):
+    rng = np.random.default_rng(int(project[1:]))
+    for batch in range(n_transactions):
+        names = [f"{project} part {batch:05d}-{i:04d}" for i in range(n_rows)]
+        prices = rng.integers(1, 2000, n_rows) * 5
+        start = time.perf_counter()
+        repo.upsert_ingredients(list(zip(names, prices.tolist())))
+        repo.upsert_ingredients(list(zip(names[::2], (prices[::2] + 5).tolist())))
+        latencies.append(time.perf_counter() - start)
+
+
+def run(paths, n_transactions, n_rows):
+    latencies = []
+    threads = [threading.Thread(target=import_prices,
+                                args=(get_repository(path), f"p{i}", n_transactions, n_rows, latencies))
+               for i, path in enumerate(paths)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start, np.array(latencies) * 1000
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="프로젝트별 DB 분리 동시 쓰기 벤치마크")
+    parser.add_argument("--projects", type=int, default=4)
+    parser.add_argument("--transactions", type=int, default=200, help="프로젝트당 가져오기 묶음 수")
+    parser.add_argument("--rows", type=int, default=200, help="묶음당 부품 수")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        projects.PROJECTS_DIR = os.path.join(tmp, "projects")
+        shared = os.path.join(tmp, "shared.db")
+        results = {
+            "shared": run([get_repository(shared).pool.path] * args.projects, args.transactions, args.rows),
+            "sharded": run([projects.open_project(f"p{i}", create=True) for i in range(args.projects)],
+                           args.transactions, args.rows),
+        }
+
+    total = args.projects * args.transactions
+    print(f"projects {args.projects}, {args.transactions} batches x {args.rows} parts each")
+    print(f"{'layout':>8} {'wall(s)':>8} {'batch/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'max ms':>8}")
+    for name, (wall, latency) in results.items():
+        print(f"{name:>8} {wall:>8.2f} {total / wall:>8.1f} {np.percentile(latency, 50):>8.1f} "
+              f"{np.percentile(latency, 95):>8.1f} {latency.max():>8.1f}")
@@ -0,0 +1,67 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gsi_core.catalog_cache import CatalogCache
+from gsi_core.cost_engine import CostEngine
+from gsi_core.money import QuoteTotals
+from gsi_core.repricing import reprice
+from synthetic import build_database, default_shape, generate_catalog
+
+# 사용법: python benchmarks/bench_repricing.py --lines 100000 --changes 10000 --quotes 2000
+# 부품 단가 일괄 변경의 영향 계산(역색인 + 영향 유닛만 재계산)과 DB 반영 시간을 재고,
+# 영향 유닛의 새 비용이 엔진을 새로 만들어 전체를 계산한 결과와 같은지 확인한다
+
+
+def save_quotes(repo, n_units, n_quotes, seed=0):
+    rng = np.random.default_rng(seed)
+    totals = QuoteTotals(0, 0, 0, 0, 0, 0, 0, 0)
+    for number in range(n_quotes):
+        lines = [(int(unit) + 1, f"Unit {int(unit) + 1:07d}", int(rng.integers(1, 5)), 0, 0)
+                 for unit in rng.choice(n_units, 5, replace=False)]
+        repo.save_quote("고객", "과제", 0, 0, totals, None, f"bench-{number}", lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="단가 일괄 변경 영향 분석 벤치마크")
+    parser.add_argument("--lines", type=int, default=100_000, help="합성 카탈로그의 BOM 행 수")
+    parser.add_argument("--changes", type=int, default=10_000, help="단가를 바꿀 부품 수")
+    parser.add_argument("--quotes", type=int, default=2_000, help="미리 발행해 둘 견적 수 (견적당 유닛 5개)")
+    args = parser.parse_args()
+
+    n_units, n_parts = default_shape(args.lines)
+    catalog = generate_catalog(n_units, n_parts, args.lines)
+    with tempfile.TemporaryDirectory() as tmp:
+        repo = build_database(os.path.join(tmp, "repricing.db"), catalog)
+        save_quotes(repo, n_units, args.quotes)
+        cache = CatalogCache(repo)
+        snapshot = cache.get()
+        snapshot.engine.unit_prices(snapshot.ingredient_df["Price"].to_numpy())
+
+        rng = np.random.default_rng(1)
+        ids = rng.choice(snapshot.ingredient_df["ID"].to_numpy(), min(args.changes, n_parts), replace=False)
+        prices = snapshot.ingredient_df.set_index("ID")["Price"]
+        changes = list(zip(ids.tolist(), (prices[ids].to_numpy() * 11 // 10 + 1).tolist()))
+
+        preview = reprice(cache, changes)
+        applied = reprice(cache, changes, apply=True)
+        after = cache.get()
+
+        # 영향 유닛의 새 비용 = 새 단가로 엔진을 처음부터 만들어 계산한 값
+        fresh = CostEngine.from_frames(after.menu_df, after.menu_ingredients_df, after.ingredient_df, after.menu_components_df)
+        expected = fresh.unit_prices(after.ingredient_df["Price"].to_numpy())
+        positions = fresh.unit_positions(applied.units["ID"].to_numpy())
+        assert np.array_equal(expected[positions], applied.units["NewPrice"].to_numpy())
+        assert np.array_equal(after.engine.unit_prices(after.ingredient_df["Price"].to_numpy()), expected)
+        repo.pool.close()
+
+    print(f"lines {args.lines}, parts {n_parts}, units {n_units}, quotes {args.quotes}")
+    print(f"changed parts {len(preview.parts)}, affected units {len(preview.units)}, affected quotes {len(preview.quotes)}")
+    print(f"preview: {preview.seconds * 1000:.1f} ms")
+    print(f"apply (preview + DB + snapshot refresh): {applied.seconds * 1000:.1f} ms")
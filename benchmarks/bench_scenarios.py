@@ -0,0 +1,65 @@
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gsi_core.cost_engine import CostEngine
+from gsi_core.money import amounts, apply_rate, quote_totals
+from gsi_core.scenarios import sweep
+from synthetic import catalog_frames, default_shape, generate_catalog
+
+# 사용법: python benchmarks/bench_scenarios.py --lines 100000 --units 20 --scales 20 --changes 10
+# 견적 하나를 세트 수 × 단가 변동의 모든 조합으로
+#   loop: 조합마다 단가를 바꿔 엔진으로 유닛 비용을 다시 계산 (화면에서 숫자를 바꿔 가며 재실행하는 것과 같은 계산)
+#   sweep: 단가 행렬 한 번 + 행렬 곱 한 번
+# 으로 계산해서 시간과 결과를 비교한다
+
+
+def loop_totals(engine, prices, units, quantities, scales, changes, num_people):
+    totals = np.zeros((len(scales), len(changes)), dtype=np.int64)
+    for j, change in enumerate(changes):
+        changed = prices + apply_rate(prices, change)
+        unit_prices = engine.unit_prices(changed)[units]
+        for i, scale in enumerate(scales):
+            material = int(amounts(scale * quantities, unit_prices).sum())
+            totals[i, j] = quote_totals(material, num_people * 1_000_000, 1000, 1000).total
+    return totals
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="수량/단가 시나리오 비교 벤치마크")
+    parser.add_argument("--lines", type=int, default=100_000, help="합성 카탈로그의 BOM 행 수")
+    parser.add_argument("--units", type=int, default=20, help="견적의 유닛 수")
+    parser.add_argument("--scales", type=int, default=20, help="세트 수 시나리오 수")
+    parser.add_argument("--changes", type=int, default=10, help="단가 변동 시나리오 수")
+    args = parser.parse_args()
+
+    n_units, n_parts = default_shape(args.lines)
+    menu_df, mi_df, ingredient_df, mc_df = catalog_frames(generate_catalog(n_units, n_parts, args.lines))
+    engine = CostEngine.from_frames(menu_df, mi_df, ingredient_df, mc_df)
+    prices = ingredient_df["Price"].to_numpy()
+
+    rng = np.random.default_rng(0)
+    units = rng.choice(engine.n_units, args.units, replace=False)
+    quantities = rng.integers(1, 6, args.units)
+    scales = np.unique(np.geomspace(1, 10_000, args.scales).round())
+    changes = np.arange(args.changes) * 250
+
+    start = time.perf_counter()
+    result = sweep(engine, prices, units, quantities, scales, changes, num_people=2, margin_rate=1000, tax_rate=1000)
+    sweep_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    expected = loop_totals(engine, prices, units, quantities, scales, changes, 2)
+    loop_time = time.perf_counter() - start
+    # 반올림 규칙이 같아서 정확히 같다
+    assert np.array_equal(result.totals.total, expected)
+
+    print(f"lines {args.lines}, units in quote {args.units}, scenarios {len(scales)} x {len(changes)}")
+    print(f"sweep: {sweep_time * 1000:.2f} ms")
+    print(f"loop:  {loop_time * 1000:.2f} ms")
+    print(f"speedup: {loop_time / sweep_time:.1f}x")
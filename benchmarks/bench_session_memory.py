@@ -0,0 +1,98 @@
+import argparse
+import gc
+import os
+import sys
+import tempfile
+import tracemalloc
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gsi_core.catalog_cache import CatalogCache, attach_session
+from gsi_core.catalog_sync import sync_catalog
+from gsi_core.db import CatalogRepository, ConnectionPool
+from gsi_core.quote_state import QuoteState
+
+
+def build_database(path, n_units, n_parts, parts_per_unit, seed=0):
+    rng = np.random.default_rng(seed)
+    repo = CatalogRepository(ConnectionPool(path))
+    repo.create_schema()
+    menus = [(f"Unit {i}", "2024-01-01") for i in range(1, n_units + 1)]
+    ingredients = [(f"Part {i:06d} {'x' * 20}", int(p)) for i, p in enumerate(rng.integers(1, 2000, n_parts) * 5, 1)]
+    menu_ingredients = {
+        (unit, int(part)): float(q)
+        for unit in range(1, n_units + 1)
+        for part, q in zip(rng.choice(np.arange(1, n_parts + 1), parts_per_unit, replace=False), rng.integers(1, 40, parts_per_unit) / 20)
+    }
+    repo.insert_many(menus, ingredients, [(m, i, q) for (m, i), q in menu_ingredients.items()])
+    return repo
+
+
+# 예전 main() 이 매 실행마다 세션 DataFrame 에 추가하던 열들
+def touch_session(state):
+    ingredient_df = state["ingredient_df"]
+    ingredient_df["Quantity"] = np.zeros(len(ingredient_df))
+    ingredient_df["TotalCost"] = np.zeros(len(ingredient_df))
+    ingredient_df["Include"] = False
+    new_df = state["new_df"]
+    new_df["Quantity"] = 0
+    new_df["TotalCost"] = 0
+    new_df["Include"] = False
+
+
+# 지금 main() 의 세션: 스냅샷 참조 + 유닛 몇 개와 부품 수십 개만 든 QuoteState
+def quote_session(state, snapshot, n_units=5, n_parts=30):
+    attach_session(state, snapshot)
+    quote = state["quote"] = QuoteState()
+    quote.reprice((snapshot.revision, snapshot.epoch), snapshot.engine, snapshot.ingredient_df["Price"].to_numpy(),
+                  snapshot.menu_df["MenuName"], snapshot.ingredient_df["IngredientName"])
+    for unit_id in snapshot.menu_df["ID"].iloc[:n_units].tolist():
+        quote.set_unit_quantity(unit_id, 2)
+    for part_id in snapshot.ingredient_df["ID"].iloc[:n_parts].tolist():
+        quote.set_part_quantity(part_id, 3)
+        quote.set_included(part_id, True)
+
+
+def measure(label, n_sessions, open_session):
+    gc.collect()
+    tracemalloc.start()
+    base, _ = tracemalloc.get_traced_memory()
+    sessions = []
+    for _ in range(n_sessions):
+        state = {}
+        open_session(state)
+        sessions.append(state)
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    total = (current - base) / 2 ** 20
+    print(f"{label:>22} {n_sessions:>9} {total:>11.1f} {total / n_sessions:>13.2f}")
+    return sessions
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="세션별 카탈로그 메모리 비교 (세션별 복사본 vs 공유 스냅샷)")
+    parser.add_argument("--sessions", type=int, default=50)
+    parser.add_argument("--units", type=int, default=2_000)
+    parser.add_argument("--parts", type=int, default=50_000)
+    parser.add_argument("--parts-per-unit", type=int, default=25)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        repo = build_database(os.path.join(tmp, "bench.db"), args.units, args.parts, args.parts_per_unit)
+        print(f"units={args.units} parts={args.parts} lines={args.units * args.parts_per_unit}")
+        print(f"{'mode':>22} {'sessions':>9} {'total(MB)':>11} {'per session':>13}")
+
+        measure("per-session copy", args.sessions, lambda state: (sync_catalog(state, repo), touch_session(state)))
+
+        cache = CatalogCache(repo)
+        gc.collect()
+        tracemalloc.start()
+        cache.get()
+        shared = tracemalloc.get_traced_memory()[0] / 2 ** 20
+        tracemalloc.stop()
+        print(f"{'shared snapshot (once)':>22} {'':>9} {shared:>11.1f}")
+        measure("shared + quote state", args.sessions, lambda state: quote_session(state, cache.get()))
+        repo.pool.close()
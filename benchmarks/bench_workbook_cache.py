@@ -0,0 +1,76 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gsi_core.db import CatalogRepository, ConnectionPool
+from gsi_core.money import amounts, quote_totals
+from gsi_core.quotes import issue_quote
+from gsi_core.workbook_cache import WorkbookCache
+
+
+def make_quote(n_parts, n_units, seed):
+    rng = np.random.default_rng(seed)
+    quantities = rng.integers(1, 20, n_parts).astype(float)
+    # 금액은 최소 단위
+    prices = rng.integers(1, 2000, n_parts) * 5
+    materials = pd.DataFrame({"ID": np.arange(1, n_parts + 1), "IngredientName": [f"Part {i}" for i in range(n_parts)],
+                              "Quantity": quantities, "Price": prices, "TotalCost": amounts(quantities, prices)})
+    units = pd.DataFrame({"ID": np.arange(1, n_units + 1), "MenuName": [f"Unit {i}" for i in range(n_units)],
+                          "Quantity": rng.integers(1, 5, n_units), "TotalCost": rng.integers(1, 10_000_000, n_units)})
+    totals = quote_totals(int(materials["TotalCost"].sum()), 9_000_000)
+    return materials, totals, units
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="견적서 통합문서 캐시 벤치마크")
+    parser.add_argument("--parts", type=int, default=5_000, help="견적서 부품 행 수")
+    parser.add_argument("--units", type=int, default=20)
+    parser.add_argument("--quotes", type=int, default=20, help="서로 다른 견적 수")
+    parser.add_argument("--repeat", type=int, default=3, help="같은 견적을 다시 발행하는 횟수")
+    parser.add_argument("--cache-mb", type=float, default=1.0, help="용량 제한 확인용 캐시 크기")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        pool = ConnectionPool(os.path.join(tmp, "quotes.db"))
+        repo = CatalogRepository(pool)
+        repo.create_schema()
+        repo.insert_many([(f"Unit {i}", "2024-01-01") for i in range(args.units)], [], [])
+        cache = WorkbookCache(os.path.join(tmp, "cache"), max_bytes=1 << 40)
+        quotes = [make_quote(args.parts, args.units, seed) for seed in range(args.quotes)]
+
+        def issue(materials, totals, units, cache=cache):
+            return issue_quote(repo, cache, materials, totals, 3_000_000, units, 3, "고객", "과제")
+
+        start = time.perf_counter()
+        first = [issue(*quote) for quote in quotes]
+        cold = (time.perf_counter() - start) / len(quotes)
+        assert not any(issued.cached for issued in first)
+
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            again = [issue(*quote) for quote in quotes]
+        warm = (time.perf_counter() - start) / (len(quotes) * args.repeat)
+        assert all(issued.cached for issued in again)
+        # 같은 내용이면 견적번호와 파일이 그대로다
+        assert [a.header.quote_number for a in again] == [f.header.quote_number for f in first]
+        assert [a.workbook for a in again] == [f.workbook for f in first]
+        print(f"parts={args.parts} quotes={args.quotes} workbook={len(first[0].workbook) / 1024:.0f}KB "
+              f"saved quotes={len(repo.recent_quotes(10_000))}")
+        print(f"{'cold build':<12} {cold * 1000:>9.1f} ms/quote")
+        print(f"{'cache hit':<12} {warm * 1000:>9.1f} ms/quote  ({cold / warm:.0f}x)")
+
+        # 용량 제한: 작은 캐시에 계속 넣어도 한도를 넘지 않는다
+        small = WorkbookCache(os.path.join(tmp, "small"), max_bytes=int(args.cache_mb * 1024 * 1024))
+        for quote in quotes:
+            issue(*quote, cache=small)
+            assert small.size() <= small.max_bytes
+        kept = sum(1 for name in os.listdir(small.directory) if name.endswith(".xlsx"))
+        print(f"{args.cache_mb}MB cache: kept {kept}/{len(quotes)} workbooks, {small.size() / 1024:.0f}KB")
+        pool.close()
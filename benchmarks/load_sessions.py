@@ -0,0 +1,265 @@
+import argparse
+import csv
+import gc
+import json
+import os
+import random
+import resource
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from unittest.mock import MagicMock
+
+import numpy as np
+from streamlit import config
+from streamlit.components.v2.component_manager import BidiComponentManager
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+from streamlit.runtime import Runtime
+from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager
+from streamlit.runtime.dataframe_source_manager import DataframeSourceManager
+from streamlit.runtime.media_file_manager import MediaFileManager
+from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+from streamlit.testing.v1 import AppTest
+from streamlit.testing.v1.element_tree import Dataframe, Widget
+from streamlit.testing.v1.util import build_mock_config_get_option
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gsi_core import db, projects, workbook_cache
+from gsi_core.export_queue import get_export_queue
+from synthetic import build_database, default_shape, generate_catalog
+
+# 사용법: python benchmarks/load_sessions.py --sessions 1 4 8 16 --iterations 3 --lines 100000
+# 한 서버 프로세스에서 견적 세션 여러 개를 동시에 돌려서 재실행이 언제부터 느려지는지 잰다.
+# 세션마다 스레드 하나가 AppTest 로 main() 을 실행하며 한 바퀴에
+#   select_units (유닛 선택) → set_quantity (유닛 수량) → edit_parts (부품 편집 표의 수량 한 칸) → export (견적서 저장)
+# 를 하고, 저장한 문서가 내보내기 대기열에서 끝날 때까지의 시간(export_job)도 잰다.
+# 동시 세션 수마다 상호작용별 지연 p50/p95/p99, 세션당 메모리(RSS 증가분), SQLite 잠금 대기를 보여 준다
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "GSI_최종본.py")
+INTERACTIONS = ("initial", "select_units", "set_quantity", "edit_parts", "export", "export_job")
+
+
+# AppTest 는 st.data_editor 편집을 지원하지 않으므로, 브라우저가 보내는 것과 같은 편집 상태(JSON)를
+# 위젯 값으로 넣어 주는 위젯으로 바꿔 끼운다
+class DataEditor(Widget):
+    def __init__(self, element):
+        super().__init__(element.proto, element.root)
+        self.type = "data_editor"
+        self.disabled = False
+
+    @property
+    def id(self):
+        return self.proto.id
+
+    @property
+    def value(self):
+        return Dataframe(self.proto, self.root).value
+
+    def edit(self, row, column, value):
+        self._value = {"edited_rows": {str(row): {column: value}}, "added_rows": [], "deleted_rows": []}
+        return self
+
+    @property
+    def _widget_state(self):
+        ws = WidgetState()
+        ws.id = self.id
+        ws.string_value = json.dumps(self._value or {"edited_rows": {}, "added_rows": [], "deleted_rows": []})
+        return ws
+
+
+# 화면 순서대로 편집 가능한 표 (id 가 있는 dataframe) 를 DataEditor 로 바꿔서 돌려준다
+def data_editors(at):
+    found = []
+
+    def walk(block):
+        for index, child in list(block.children.items()):
+            if isinstance(child, Dataframe) and child.proto.id:
+                block.children[index] = editor = DataEditor(child)
+                found.append(editor)
+            elif hasattr(child, "children"):
+                walk(child)
+
+    walk(at._tree)
+    return found
+
+
+# AppTest 는 재실행마다 전역 Runtime._instance 를 자기 가짜 런타임으로 바꿨다가 None 으로 되돌리고,
+# config.get_option 도 global.appTest 를 켠 함수로 바꿨다가 되돌린다. 여러 스레드에서 동시에 돌리면
+# 먼저 끝난 실행이 다른 실행 도중에 이것들을 원래대로 돌려놓는다 (위젯 format_func 가 기록되지 않아 KeyError).
+# 실제 서버처럼 런타임 하나를 모든 세션이 같이 쓰게 하고, global.appTest 도 켠 채로 고정한다
+def share_runtime():
+    config.get_option = build_mock_config_get_option({"global.appTest": True})
+    runtime = MagicMock(spec=Runtime)
+    runtime.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+    runtime.dataframe_source_mgr = DataframeSourceManager()
+    runtime.cache_storage_manager = MemoryCacheStorageManager()
+    runtime.bidi_component_registry = BidiComponentManager()
+    runtime.bidi_component_registry.discover_and_register_components(start_file_watching=False)
+    Runtime.instance = classmethod(lambda cls: runtime)
+    Runtime.exists = classmethod(lambda cls: True)
+
+
+def find(elements, label):
+    for element in elements:
+        if element.label == label:
+            return element
+    raise LookupError(f"화면에 '{label}' 이(가) 없습니다")
+
+
+def rss_mb():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except OSError:
+        # /proc 가 없으면 최대 RSS (macOS 는 바이트, 리눅스는 KB)
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2 ** 20 if sys.platform == "darwin" else peak / 1024
+
+
+class Session:
+    def __init__(self, number, unit_names, records, args):
+        self.number = number
+        self.rng = random.Random(number)
+        self.unit_names = unit_names
+        self.records = records
+        self.args = args
+        self.at = None
+
+    # 상호작용 하나를 재고 기록한다 (앱에서 난 예외도 실패로 센다)
+    def step(self, name, action):
+        start = time.perf_counter()
+        error = None
+        try:
+            at = action()
+            if at.exception:
+                error = at.exception[0].message
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        self.records.append((self.number, name, (time.perf_counter() - start) * 1000, error))
+        return error is None
+
+    def run(self):
+        self.at = AppTest.from_file(APP_PATH, default_timeout=self.args.timeout)
+        if not self.step("initial", self.at.run):
+            return
+        for _ in range(self.args.iterations):
+            self.iteration()
+            time.sleep(self.args.think)
+
+    # 마지막 편집 표가 전체 부품 표 (수량 편집 가능)
+    def edit_parts(self):
+        editor = data_editors(self.at)[-1]
+        return editor.edit(self.rng.randrange(len(editor.value)), "Quantity", self.rng.randint(1, 9)).run()
+
+    def iteration(self):
+        at = self.at
+        units = self.rng.sample(self.unit_names, self.args.units)
+        if not self.step("select_units", lambda: find(at.multiselect, "유닛 선택").set_value(units).run()):
+            return
+        quantity = self.rng.randint(1, 5)
+        if not self.step("set_quantity", lambda: find(at.number_input, f"{units[0]} 수량").set_value(quantity).run()):
+            return
+        if not self.step("edit_parts", self.edit_parts):
+            return
+        start = time.perf_counter()
+        if not self.step("export", lambda: find(at.button, "견적서 저장").click().run()):
+            return
+        job = get_export_queue().wait(at.session_state.export_job[0], self.args.timeout)
+        error = None if job is not None and job.state == "done" and not job.errors else f"export job: {job}"
+        self.records.append((self.number, "export_job", (time.perf_counter() - start) * 1000, error))
+
+
+# 세션 n_sessions 개를 동시에 돌린다. 반환값: (기록, 걸린 시간, 세션이 살아 있을 때의 RSS 증가분 MB)
+def run_level(n_sessions, unit_names, args):
+    gc.collect()
+    base = rss_mb()
+    records = []
+    sessions = [Session(number, unit_names, records, args) for number in range(n_sessions)]
+    threads = [threading.Thread(target=session.run, name=f"session-{session.number}") for session in sessions]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    grown = rss_mb() - base
+    del sessions
+    return records, elapsed, grown
+
+
+def percentiles(values):
+    values = np.asarray(values)
+    return [np.percentile(values, q) for q in (50, 95, 99)] + [values.max()]
+
+
+def print_level(n_sessions, records, elapsed, grown, pool_stats):
+    by_name = defaultdict(list)
+    errors = defaultdict(int)
+    for _, name, ms, error in records:
+        if error is None:
+            by_name[name].append(ms)
+        else:
+            errors[name] += 1
+    print(f"\n== sessions {n_sessions}: {len(records)} interactions in {elapsed:.1f}s "
+          f"({len(records) / elapsed:.1f}/s), RSS +{grown:.1f}MB ({grown / n_sessions:.1f}MB/session)")
+    print(f"{'interaction':>13} {'count':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8} {'errors':>7}")
+    for name in INTERACTIONS:
+        if by_name[name] or errors[name]:
+            stats = percentiles(by_name[name]) if by_name[name] else [float("nan")] * 4
+            print(f"{name:>13} {len(by_name[name]):>6} " + " ".join(f"{v:>8.1f}" for v in stats) + f" {errors[name]:>7}")
+    print(f"sqlite: transactions {pool_stats.transactions}, lock waits {pool_stats.lock_waits} "
+          f"({pool_stats.lock_wait_seconds * 1000:.1f}ms), connection waits {pool_stats.connection_waits}, "
+          f"busy errors {pool_stats.busy_errors}")
+    for name, count in errors.items():
+        if not count:
+            continue
+        sample = next(error for _, n, _, error in records if n == name and error is not None)
+        print(f"  {name} 실패 {count}건, 예: {sample}")
+
+
+def diff_stats(after, before):
+    return type(after)(*(a - b for a, b in zip(after, before)))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="동시 Streamlit 세션 부하 테스트")
+    parser.add_argument("--sessions", type=int, nargs="+", default=[1, 4, 8], help="동시 세션 수 (여러 개면 차례로)")
+    parser.add_argument("--iterations", type=int, default=3, help="세션당 반복 횟수")
+    parser.add_argument("--lines", type=int, default=20_000, help="합성 카탈로그의 BOM 행 수")
+    parser.add_argument("--units", type=int, default=3, help="한 번에 선택할 유닛 수")
+    parser.add_argument("--think", type=float, default=0.0, help="반복 사이에 쉬는 시간 (초)")
+    parser.add_argument("--timeout", type=float, default=120.0, help="재실행 한 번의 최대 시간 (초)")
+    parser.add_argument("--report", default=None, help="상호작용별 기록을 저장할 CSV 경로")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # 앱은 같은 프로세스에서 실행되므로 모듈 설정을 임시 폴더로 바꿔 둔다
+        db.DB_PATH = os.path.join(tmp, "load.db")
+        projects.PROJECTS_DIR = os.path.join(tmp, "projects")
+        workbook_cache.CACHE_DIR = os.path.join(tmp, "workbook_cache")
+        n_units, n_parts = default_shape(args.lines)
+        catalog = generate_catalog(n_units, n_parts, args.lines)
+        build_database(db.DB_PATH, catalog).pool.close()
+        unit_names = [name for name, _ in catalog.menus]
+        pool = db.get_pool(db.DB_PATH)
+        print(f"catalog lines {args.lines} (units {n_units}, parts {n_parts}), iterations {args.iterations}, "
+              f"app {os.path.basename(APP_PATH)}")
+
+        share_runtime()
+        # 카탈로그 캐시/엔진을 한 번 만들어 두고 잰다 (첫 세션의 차가운 시작은 따로 보지 않는다)
+        AppTest.from_file(APP_PATH, default_timeout=args.timeout).run()
+        all_records = []
+        for n_sessions in args.sessions:
+            before = pool.stats()
+            records, elapsed, grown = run_level(n_sessions, unit_names, args)
+            print_level(n_sessions, records, elapsed, grown, diff_stats(pool.stats(), before))
+            all_records += [(n_sessions, *record) for record in records]
+
+    if args.report:
+        with open(args.report, "w", newline="", encoding="utf-8-sig") as f:
+            writer = csv.writer(f)
+            writer.writerow(["sessions", "session", "interaction", "ms", "error"])
+            writer.writerows(all_records)
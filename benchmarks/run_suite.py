@@ -0,0 +1,203 @@
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gsi_core.catalog_cache import CatalogCache
+from gsi_core.cost_engine import CostEngine
+from gsi_core.export import save_to_excel
+from gsi_core.money import quote_totals
+from gsi_core.quote_state import QuoteState
+from synthetic import build_database, catalog_frames, default_shape, generate_catalog
+
+# 사용법: python benchmarks/run_suite.py --sizes 1000,10000,100000,1000000
+# 실행할 때마다 결과를 기록 파일에 한 줄씩 덧붙이고, 같은 기계의 직전 실행과 비교해서 느려진 항목을 표시한다
+
+HISTORY_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results", "history.jsonl")
+
+
+# 측정 항목. 각 항목은 (준비, 측정) 함수 쌍: 준비는 시간에 넣지 않는다
+class Suite:
+    def __init__(self, n_lines, tmp, seed=0):
+        self.n_lines = n_lines
+        self.tmp = tmp
+        n_units, n_parts = default_shape(n_lines)
+        self.catalog = generate_catalog(n_units, n_parts, n_lines, seed=seed)
+        self.frames = catalog_frames(self.catalog)
+        self.repo = build_database(os.path.join(tmp, f"suite_{n_lines}.db"), self.catalog)
+        menu_df, mi_df, ingredient_df, mc_df = self.frames
+        self.engine = CostEngine.from_frames(menu_df, mi_df, ingredient_df, mc_df)
+        rng = np.random.default_rng(seed)
+        self.unit_quantities = rng.integers(0, 10, len(menu_df))
+        self.prices = ingredient_df["Price"].to_numpy()
+        self._db_count = 0
+
+    # 빈 DB 에 카탈로그 전체를 넣는 시간 (스키마 생성은 제외)
+    def db_insert(self):
+        self._db_count += 1
+        path = os.path.join(self.tmp, f"insert_{self.n_lines}_{self._db_count}.db")
+        repo = build_database(path, self.catalog._replace(menus=[], ingredients=[], menu_ingredients=[], menu_components=[]))
+
+        def run():
+            repo.insert_many(self.catalog.menus, self.catalog.ingredients, self.catalog.menu_ingredients)
+        return run
+
+    # get_data(): 유닛/부품/BOM 전체 조회
+    def get_data(self):
+        return self.repo.fetch_all
+
+    # 처음 접속한 세션이 공유 스냅샷을 만드는 시간 (조회 + DataFrame + 엔진)
+    def catalog_snapshot(self):
+        return CatalogCache(self.repo).get
+
+    def engine_build(self):
+        return lambda: CostEngine.from_frames(*self.frames)
+
+    # 모든 유닛에 수량이 있을 때 부품별 수량/금액과 유닛별 금액
+    def rollup(self):
+        def run():
+            self.engine.part_rollup(self.unit_quantities, self.prices)
+            self.engine.unit_costs(self.unit_quantities, self.prices)
+        return run
+
+    # 화면의 calculate_menu_costs 와 같은 계산 (엔진 생성 + 유닛 비용)
+    def calculate_menu_costs(self):
+        menu_df, mi_df, ingredient_df, mc_df = self.frames
+        return lambda: CostEngine.from_frames(menu_df, mi_df, ingredient_df, mc_df).unit_costs(self.unit_quantities, self.prices)
+
+    # 세션 견적: 단가 맞추기 + 유닛 20개 입력 + 부품 표 만들기
+    def quote_state(self):
+        menu_df, _, ingredient_df, _ = self.frames
+        unit_ids = menu_df["ID"].iloc[:20].tolist()
+
+        def run():
+            quote = QuoteState()
+            quote.reprice(0, self.engine, self.prices, menu_df["MenuName"], ingredient_df["IngredientName"])
+            for unit_id in unit_ids:
+                quote.set_unit_quantity(unit_id, 2)
+            quote.materials_frame()
+        return run
+
+    # 모든 유닛을 주문했을 때 수량이 있는 부품 전체를 세부 시트에 쓰는 견적서
+    def save_to_excel(self):
+        _, _, ingredient_df, _ = self.frames
+        quantities, costs = self.engine.part_rollup(self.unit_quantities, self.prices)
+        used = quantities > 0
+        materials_df = ingredient_df[used].assign(Quantity=quantities[used], TotalCost=costs[used])
+        selected_menus_df = pd.DataFrame({"ID": [1], "MenuName": ["Unit"], "Price": [100], "Quantity": [1], "TotalCost": [100]})
+        totals = quote_totals(int(costs.sum()), 1_000_000)
+        return lambda: save_to_excel(materials_df, totals, 1_000_000, selected_menus_df, 1)
+
+
+CASES = ["db_insert", "get_data", "catalog_snapshot", "engine_build", "rollup", "calculate_menu_costs", "quote_state",
+         "save_to_excel"]
+
+
+def measure(suite, case, repeat):
+    times = []
+    for _ in range(repeat):
+        run = getattr(suite, case)()
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+    return {"median_s": statistics.median(times), "min_s": min(times), "n": repeat}
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+# 결과 비교는 같은 기계에서 낸 기록끼리만 의미가 있다
+def environment():
+    return {"machine": f"{platform.node()} {platform.machine()}", "python": platform.python_version(),
+            "numpy": np.__version__, "pandas": pd.__version__, "sqlite": sqlite3.sqlite_version}
+
+
+def previous_record(path, machine):
+    if not os.path.exists(path):
+        return None
+    previous = None
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if record.get("env", {}).get("machine") == machine:
+                previous = record
+    return previous
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="합성 카탈로그로 주요 경로를 크기별로 측정하고 직전 실행과 비교")
+    parser.add_argument("--sizes", default="1000,10000,100000", help="BOM 행 수 목록 (예: 1000,10000,100000,1000000)")
+    parser.add_argument("--cases", default=",".join(CASES), help="측정할 항목 (쉼표로 구분)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--history", default=HISTORY_PATH, help="결과 기록 파일 (JSON-lines)")
+    parser.add_argument("--threshold", type=float, default=1.25, help="직전 대비 이 배수 이상 느려지면 회귀로 표시")
+    parser.add_argument("--no-save", action="store_true", help="결과를 기록 파일에 남기지 않음")
+    parser.add_argument("--fail-on-regression", action="store_true", help="회귀가 있으면 종료 코드 1")
+    args = parser.parse_args()
+
+    cases = [case for case in args.cases.split(",") if case]
+    unknown = set(cases) - set(CASES)
+    if unknown:
+        parser.error(f"알 수 없는 항목: {', '.join(sorted(unknown))}")
+
+    env = environment()
+    previous = previous_record(args.history, env["machine"])
+    baseline = previous["results"] if previous else {}
+    if previous:
+        print(f"비교 기준: {previous['ts']} ({previous.get('commit') or '?'})")
+
+    results = {}
+    regressions = []
+    print(f"{'case':>22} {'lines':>9} {'median(ms)':>11} {'min(ms)':>9} {'before(ms)':>11} {'change':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_lines in (int(size) for size in args.sizes.split(",")):
+            suite = Suite(n_lines, tmp)
+            for case in cases:
+                key = f"{case}@{n_lines}"
+                result = results[key] = measure(suite, case, args.repeat)
+                before = baseline.get(key)
+                before_text, change_text = "-", "-"
+                if before:
+                    ratio = result["median_s"] / before["median_s"]
+                    before_text = f"{before['median_s'] * 1000:.2f}"
+                    change_text = f"{(ratio - 1) * 100:+.0f}%"
+                    # 1ms 미만의 차이는 잡음으로 본다
+                    if ratio >= args.threshold and result["median_s"] - before["median_s"] > 0.001:
+                        regressions.append(key)
+                        change_text += " !"
+                print(f"{case:>22} {n_lines:>9} {result['median_s'] * 1000:>11.2f} {result['min_s'] * 1000:>9.2f} "
+                      f"{before_text:>11} {change_text:>8}")
+            suite.repo.pool.close()
+
+    if not args.no_save:
+        os.makedirs(os.path.dirname(args.history) or ".", exist_ok=True)
+        record = {"ts": datetime.now(timezone.utc).isoformat(timespec="seconds"), "commit": git_commit(), "env": env,
+                  "repeat": args.repeat, "results": results}
+        with open(args.history, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record) + "\n")
+        print(f"기록: {args.history}")
+
+    if regressions:
+        print(f"느려진 항목 ({args.threshold:.2f}배 이상): {', '.join(regressions)}")
+        if args.fail_on_regression:
+            sys.exit(1)
@@ -0,0 +1,86 @@
+import os
+import sys
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from gsi_core.db import SQL_UPSERT_MENU_COMPONENT, CatalogRepository, ConnectionPool
+
+# 벤치마크용 임의 카탈로그. DB 에 바로 넣을 수 있는 행 목록 형태
+#   menus: (유닛명, 등록일), ingredients: (부품명, 단가 — 최소 단위 정수)
+#   menu_ingredients: (유닛 ID, 부품 ID, 수량), menu_components: (상위 유닛 ID, 하위 유닛 ID, 수량)
+# ID 는 1 부터 넣은 순서대로 매겨진다고 가정한다 (빈 DB 에 insert_many 로 넣을 때)
+SyntheticCatalog = namedtuple("SyntheticCatalog", "menus ingredients menu_ingredients menu_components")
+
+PART_KINDS = ["Resistor", "Capacitor", "Connector", "Inductor", "Diode", "Transistor", "Sensor", "Relay",
+              "Regulator", "Oscillator", "Module", "Header", "Switch", "Fuse", "Display", "Bracket"]
+
+
+# n_units 개 유닛, n_parts 개 부품, BOM 행 n_lines 개를 만든다.
+#   shared_fraction: BOM 행 중 자주 쓰는 공용 부품(전체의 1%, 최소 10개)에서 고르는 비율.
+#                    공용 부품 안에서는 앞쪽 부품일수록 더 자주 쓰인다 (Zipf 분포에 가깝게)
+#   subassembly_fraction: 하위 유닛을 1~3개 포함하는 유닛 비율 (항상 ID 가 더 작은 유닛을 포함하므로 순환 없음)
+# 같은 (유닛, 부품) 쌍은 한 번만 나온다
+def generate_catalog(n_units, n_parts, n_lines, shared_fraction=0.3, subassembly_fraction=0.05, seed=0):
+    if n_lines > n_units * n_parts:
+        raise ValueError(f"BOM 행 수({n_lines})가 유닛 × 부품 수({n_units * n_parts})보다 많습니다.")
+    rng = np.random.default_rng(seed)
+
+    menus = [(f"Unit {i:07d}", "2024-01-01") for i in range(1, n_units + 1)]
+    prices = rng.integers(1, 2000, n_parts) * 5
+    ingredients = [(f"{PART_KINDS[i % len(PART_KINDS)]} {i:07d}", int(price)) for i, price in enumerate(prices, 1)]
+
+    n_common = min(n_parts, max(10, n_parts // 100))
+    weights = 1.0 / np.arange(1, n_common + 1)
+    weights /= weights.sum()
+    keys = np.empty(0, dtype=np.int64)
+    # 중복 쌍을 버리고 모자란 만큼 다시 뽑는다 (밀도가 아주 높지 않으면 몇 번 안에 끝남)
+    while len(keys) < n_lines:
+        need = int((n_lines - len(keys)) * 1.1) + 16
+        units = rng.integers(0, n_units, need)
+        parts = np.where(rng.random(need) < shared_fraction,
+                         rng.choice(n_common, need, p=weights), rng.integers(0, n_parts, need))
+        keys = np.unique(np.concatenate([keys, units.astype(np.int64) * n_parts + parts]))
+    keys = np.sort(rng.choice(keys, n_lines, replace=False))
+    quantities = rng.integers(1, 40, n_lines) / 20
+    menu_ingredients = list(zip((keys // n_parts + 1).tolist(), (keys % n_parts + 1).tolist(), quantities.tolist()))
+
+    menu_components = []
+    parents = np.flatnonzero(rng.random(n_units) < subassembly_fraction) + 1
+    for parent in parents[parents > 1].tolist():
+        children = rng.choice(np.arange(1, parent), min(parent - 1, int(rng.integers(1, 4))), replace=False)
+        menu_components.extend((parent, int(child), int(rng.integers(1, 5))) for child in children)
+
+    return SyntheticCatalog(menus, ingredients, menu_ingredients, menu_components)
+
+
+# 비용 엔진 / 세션과 같은 열 구성의 DataFrame (menu_df, menu_ingredients_df, ingredient_df, menu_components_df)
+def catalog_frames(catalog):
+    menu_df = pd.DataFrame({"ID": np.arange(1, len(catalog.menus) + 1),
+                            "MenuName": [name for name, _ in catalog.menus]})
+    ingredient_df = pd.DataFrame(catalog.ingredients, columns=["IngredientName", "Price"])
+    ingredient_df.insert(0, "ID", np.arange(1, len(catalog.ingredients) + 1))
+    menu_ingredients_df = pd.DataFrame(catalog.menu_ingredients, columns=["MenuID", "IngredientID", "Quantity"])
+    menu_components_df = pd.DataFrame(catalog.menu_components, columns=["ParentMenuID", "ChildMenuID", "Quantity"])
+    return menu_df, menu_ingredients_df, ingredient_df, menu_components_df
+
+
+# 빈 DB 를 만들고 카탈로그를 넣는다
+def build_database(path, catalog):
+    repo = CatalogRepository(ConnectionPool(path))
+    repo.create_schema()
+    repo.insert_many(catalog.menus, catalog.ingredients, catalog.menu_ingredients)
+    if catalog.menu_components:
+        with repo.pool.transaction() as conn:
+            conn.executemany(SQL_UPSERT_MENU_COMPONENT, catalog.menu_components)
+    return repo
+
+
+# BOM 행 수에 맞춘 기본 카탈로그 크기: 유닛당 평균 20행, 부품은 BOM 행의 1/5 (최소 100개)
+def default_shape(n_lines):
+    n_units = max(1, n_lines // 20)
+    n_parts = max(100, n_lines // 5)
+    return n_units, n_parts
@@ -0,0 +1,65 @@
+# GSI 견적 핵심 기능 (DB, 가격 계산, 엑셀 내보내기). Streamlit 에 의존하지 않는다.
+#
+# 하위 모듈은 처음 접근할 때 불러온다.
+#   db, migrations, profiling : 표준 라이브러리만 사용
+#   projects                  : 표준 라이브러리만 사용
+#   money                     : 표준 라이브러리 (배열 함수는 numpy)
+#   cost_engine, catalog_*    : numpy / pandas (catalog_columns 는 pyarrow 가 있을 때만 열 스냅샷 사용)
+#   quote_state, editor_window: numpy / pandas
+#   pricing                   : price_units 를 호출할 때 numpy / pandas
+#   scenarios, repricing      : numpy / pandas
+#   price_history, labor      : numpy
+#   export, quotes            : 통합문서를 만들 때 openpyxl, PDF 를 만들 때 reportlab (선택)
+#   export_queue              : 표준 라이브러리만 사용
+#   workbook_cache            : 표준 라이브러리만 사용
+#   bulk_import               : XLSX 를 읽을 때 openpyxl
+import importlib
+
+_EXPORTS = {
+    "CatalogRepository": "db",
+    "ConnectionPool": "db",
+    "get_pool": "db",
+    "get_repository": "db",
+    "list_projects": "projects",
+    "open_project": "projects",
+    "project_db_path": "projects",
+    "QuoteTotals": "money",
+    "format_won": "money",
+    "from_minor": "money",
+    "to_minor": "money",
+    "CostEngine": "cost_engine",
+    "CatalogCache": "catalog_cache",
+    "attach_session": "catalog_cache",
+    "get_catalog_cache": "catalog_cache",
+    "QuoteState": "quote_state",
+    "LABOR_COST_PER_PERSON": "pricing",
+    "calculate_labor_cost": "pricing",
+    "calculate_material_costs": "pricing",
+    "price_units": "pricing",
+    "price_scenarios": "pricing",
+    "LaborModel": "labor",
+    "sweep": "scenarios",
+    "scenario_frame": "scenarios",
+    "reprice": "repricing",
+    "PriceHistory": "price_history",
+    "get_price_history": "price_history",
+    "import_file": "bulk_import",
+    "build_quote_workbook": "export",
+    "save_to_excel": "export",
+    "available_formats": "export",
+    "issue_quote": "quotes",
+    "prepare_quote": "quotes",
+    "get_export_queue": "export_queue",
+    "get_workbook_cache": "workbook_cache",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,215 @@
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from .catalog_cache import get_catalog_cache
+from .export import save_to_excel
+from .money import format_won, from_minor, percent_to_bp
+from .price_history import get_price_history
+from .pricing import price_scenarios, price_units
+from .projects import resolve_db
+
+# 사용법: python -m gsi_core.batch requests.csv --out quotes --workers 8 --report report.csv [--margin 10 --tax 10]
+#        python -m gsi_core.batch requests.csv --totals-only   (엑셀 없이 합계만 한 번에 계산)
+# 인건비는 DB 의 인건비 모델(역할별 단가, 유닛별 작업 시간, 간접비)로 계산하고, --margin 을 주지 않으면 모델의 기본 마진율을 쓴다
+
+# 견적 요청 한 건: units 는 {유닛명: 수량}, as_of 는 단가 기준일 (없으면 현재 단가)
+QuoteRequest = namedtuple("QuoteRequest", "quote_id customer project num_people units as_of", defaults=(None,))
+
+# 견적 한 건의 처리 결과와 소요 시간(초). total_cost 는 최소 단위 정수
+QuoteResult = namedtuple("QuoteResult", "quote_id path total_cost price_seconds render_seconds error")
+
+
+# JSON: [{"quote_id", "customer", "project", "headcount", "units": {"유닛명": 수량}, "as_of"}, ...]
+def _load_json(path):
+    with open(path, encoding="utf-8") as f:
+        items = json.load(f)
+    return [
+        QuoteRequest(str(item["quote_id"]), item.get("customer", ""), item.get("project", ""),
+                     int(item.get("headcount", 0)), {name: int(q) for name, q in item["units"].items()},
+                     item.get("as_of") or None)
+        for item in items
+    ]
+
+
+# CSV: 유닛 한 줄당 한 행 (quote_id, customer, project, headcount, unit, quantity[, as_of])
+def _load_csv(path):
+    requests = {}
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        for row in csv.DictReader(f):
+            quote_id = row["quote_id"]
+            if quote_id not in requests:
+                requests[quote_id] = QuoteRequest(quote_id, row.get("customer", ""), row.get("project", ""),
+                                                  int(row.get("headcount") or 0), {}, row.get("as_of") or None)
+            units = requests[quote_id].units
+            units[row["unit"]] = units.get(row["unit"], 0) + int(row["quantity"])
+    return list(requests.values())
+
+
+def load_requests(path):
+    if path.lower().endswith(".json"):
+        return _load_json(path)
+    return _load_csv(path)
+
+
+_worker = {}
+
+
+# 작업 프로세스마다 카탈로그를 한 번만 읽어 둔다
+# rates: (마진율, 부가세율) bp. 마진율이 None 이면 인건비 모델의 기본 마진율
+def _init_worker(db_path, out_dir, all_parts, rates=(None, 0)):
+    import openpyxl  # noqa: F401  첫 견적의 엑셀 시간에 import 비용이 섞이지 않도록 미리 불러온다
+
+    _worker["snapshot"] = get_catalog_cache(db_path).get()
+    _worker["out_dir"] = out_dir
+    _worker["all_parts"] = all_parts
+    margin_rate, tax_rate = rates
+    _worker["rates"] = (_worker["snapshot"].labor.margin_rate if margin_rate is None else margin_rate, tax_rate)
+    _worker["db_path"] = db_path
+    _worker["prices_as_of"] = {}
+
+
+# 기준일별 단가 벡터. 같은 기준일의 견적들은 한 번 찾은 단가를 같이 쓴다
+def _prices_as_of(as_of):
+    cached = _worker["prices_as_of"]
+    if as_of not in cached:
+        if "history" not in _worker:
+            _worker["history"] = get_price_history(_worker["db_path"])
+        ingredient_df = _worker["snapshot"].ingredient_df
+        cached[as_of] = _worker["history"].prices_as_of(as_of, ingredient_df["ID"].to_numpy(), ingredient_df["Price"].to_numpy())
+    return cached[as_of]
+
+
+def _safe_file_name(quote_id):
+    return "".join(c if c.isalnum() or c in "-_." else "_" for c in quote_id) or "quote"
+
+
+def generate_quote(request):
+    snapshot = _worker["snapshot"]
+    try:
+        start = time.perf_counter()
+        prices = _prices_as_of(request.as_of) if request.as_of else None
+        quote = price_units(snapshot.menu_df, snapshot.ingredient_df, snapshot.engine,
+                            request.units, request.num_people, _worker["all_parts"], prices, *_worker["rates"],
+                            labor=snapshot.labor)
+        priced = time.perf_counter()
+        data = save_to_excel(quote.materials_df, quote.totals, quote.labor_cost_per_person, quote.selected_menus_df,
+                             quote.num_people, request.customer, request.project, labor_lines=quote.labor_lines)
+        path = os.path.join(_worker["out_dir"], f"{_safe_file_name(request.quote_id)}.xlsx")
+        with open(path, "wb") as f:
+            f.write(data)
+        done = time.perf_counter()
+        return QuoteResult(request.quote_id, path, quote.totals.total, priced - start, done - priced, "")
+    except (ValueError, OSError) as e:
+        return QuoteResult(request.quote_id, "", 0, 0, 0, str(e))
+
+
+# 견적 요청들을 프로세스 풀에 나눠서 처리한다 (workers=0 이면 현재 프로세스에서 처리)
+# margin_rate, tax_rate: 모든 견적에 적용할 마진율/부가세율 (bp, 마진율 None 이면 인건비 모델의 기본값)
+def run_batch(requests, db_path, out_dir, workers=None, all_parts=False, margin_rate=None, tax_rate=0):
+    os.makedirs(out_dir, exist_ok=True)
+    args = (db_path, out_dir, all_parts, (margin_rate, tax_rate))
+    if workers == 0:
+        _init_worker(*args)
+        return [generate_quote(request) for request in requests]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=args) as pool:
+        return list(pool.map(generate_quote, requests, chunksize=max(1, len(requests) // ((workers or os.cpu_count()) * 4))))
+
+
+# 엑셀 없이 견적 합계만 계산한다. 단가 기준일이 같은 견적끼리 묶어서 수량 행렬 한 번으로 계산하므로
+# 수천 건도 견적 한 건 계산과 비슷한 시간에 끝난다 (알 수 없는 유닛이 있는 견적은 실패로 돌려준다)
+def price_batch(requests, db_path, margin_rate=None, tax_rate=0):
+    import numpy as np
+
+    _init_worker(db_path, None, False, (margin_rate, tax_rate))
+    snapshot = _worker["snapshot"]
+    positions = {}
+    for position, name in enumerate(snapshot.menu_df["MenuName"].tolist()):
+        positions.setdefault(name, position)
+
+    results = {}
+    groups = {}
+    for request in requests:
+        unknown = [name for name in request.units if name not in positions]
+        if unknown:
+            results[request.quote_id] = QuoteResult(request.quote_id, "", 0, 0, 0, f"알 수 없는 유닛: {', '.join(unknown)}")
+        else:
+            groups.setdefault(request.as_of, []).append(request)
+
+    for as_of, group in groups.items():
+        start = time.perf_counter()
+        # 이 묶음에서 주문한 유닛 열만 만든다
+        units = sorted({positions[name] for request in group for name in request.units})
+        columns = {unit: column for column, unit in enumerate(units)}
+        quantities = np.zeros((len(group), len(units)))
+        for row, request in enumerate(group):
+            for name, quantity in request.units.items():
+                quantities[row, columns[positions[name]]] += quantity
+        prices = _prices_as_of(as_of) if as_of else snapshot.ingredient_df["Price"].to_numpy()
+        totals = price_scenarios(snapshot.engine, quantities, prices, [request.num_people for request in group],
+                                 snapshot.labor, *_worker["rates"], units=np.array(units, dtype=np.intp))
+        seconds = (time.perf_counter() - start) / len(group)
+        for request, total in zip(group, totals.total.tolist()):
+            results[request.quote_id] = QuoteResult(request.quote_id, "", total, seconds, 0, "")
+    return [results[request.quote_id] for request in requests]
+
+
+def write_report(results, path):
+    with open(path, "w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(QuoteResult._fields)
+        # 보고서의 금액은 원 단위
+        writer.writerows(result._replace(total_cost=from_minor(result.total_cost)) for result in results)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="CSV/JSON 요청 파일로 견적서를 한꺼번에 생성합니다.")
+    parser.add_argument("requests", help="견적 요청 파일 (.csv 또는 .json)")
+    parser.add_argument("--out", default="quotes", help="견적서 저장 폴더")
+    parser.add_argument("--db", default=None, help="데이터베이스 경로 (기본: GSI_DB_PATH 또는 restaurant_menu.db)")
+    parser.add_argument("--project", default=None, help="프로젝트 이름 (GSI_PROJECTS_DIR 아래의 프로젝트 DB, --db 대신)")
+    parser.add_argument("--workers", type=int, default=None, help="작업 프로세스 수 (0: 단일 프로세스)")
+    parser.add_argument("--all-parts", action="store_true", help="세부 시트에 카탈로그 전체 부품을 포함")
+    parser.add_argument("--report", default=None, help="견적별 처리 시간을 저장할 CSV 경로")
+    parser.add_argument("--margin", type=float, default=None, help="마진율 (%%, 기본: 인건비 설정의 기본 마진율)")
+    parser.add_argument("--tax", type=float, default=0, help="부가세율 (%%)")
+    parser.add_argument("--totals-only", action="store_true", help="엑셀을 만들지 않고 합계만 한 번에 계산")
+    args = parser.parse_args(argv)
+
+    try:
+        db_path = resolve_db(args.db, args.project)
+    except ValueError as e:
+        print(f"견적 생성 실패: {e}", file=sys.stderr)
+        return 1
+    requests = load_requests(args.requests)
+    margin_rate = None if args.margin is None else percent_to_bp(args.margin)
+    start = time.perf_counter()
+    if args.totals_only:
+        results = price_batch(requests, db_path, margin_rate, percent_to_bp(args.tax))
+    else:
+        results = run_batch(requests, db_path, args.out, args.workers, args.all_parts, margin_rate, percent_to_bp(args.tax))
+    elapsed = time.perf_counter() - start
+
+    for result in results:
+        if result.error:
+            print(f"{result.quote_id}: 실패 - {result.error}", file=sys.stderr)
+        elif args.totals_only:
+            print(f"{result.quote_id}: {format_won(result.total_cost)}")
+        else:
+            print(f"{result.quote_id}: {format_won(result.total_cost)} "
+                  f"(계산 {result.price_seconds * 1000:.1f}ms, 엑셀 {result.render_seconds * 1000:.1f}ms) -> {result.path}")
+    if args.report:
+        write_report(results, args.report)
+
+    failed = sum(1 for result in results if result.error)
+    print(f"견적 {len(results)}건 ({failed}건 실패), {elapsed:.2f}초, {len(results) / elapsed if elapsed else 0:.1f}건/초")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
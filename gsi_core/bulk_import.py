@@ -0,0 +1,203 @@
+import argparse
+import csv
+import datetime
+import io
+import math
+import os
+import sys
+import time
+from collections import namedtuple
+from itertools import islice
+
+from .db import get_repository
+from .money import to_minor
+from .projects import resolve_db
+
+# 사용법: python -m gsi_core.bulk_import 단가표.csv --kind parts
+#         python -m gsi_core.bulk_import 유닛구성.xlsx --kind units --chunk-size 5000
+#         python -m gsi_core.bulk_import 단가표.csv --project 반도체   (프로젝트 DB 에 가져오기)
+
+# 가져오기 종류별 열 이름 (첫 행 머리글에서 아래 이름 중 하나를 찾는다)
+COLUMNS = {
+    "parts": {
+        "name": ("IngredientName", "name", "part", "부품명", "부품"),
+        "price": ("Price", "price", "단가", "가격"),
+    },
+    "units": {
+        "unit": ("MenuName", "unit", "유닛명", "유닛"),
+        "part": ("IngredientName", "part", "부품명", "부품"),
+        "quantity": ("Quantity", "quantity", "수량"),
+    },
+}
+
+# 거부된 행은 처음 몇 개만 사유와 함께 보관한다
+MAX_REJECTED_DETAILS = 100
+
+# 가져오기 결과. rejected_rows 는 (행 번호, 사유) 목록
+ImportResult = namedtuple("ImportResult", "kind rows inserted updated unchanged rejected rejected_rows seconds")
+
+
+# CSV / XLSX 를 한 행씩 읽는다 (행 번호, 값 목록). 파일 전체를 메모리에 올리지 않는다
+def iter_table_rows(source, file_name=None, encoding="utf-8-sig"):
+    file_name = file_name or getattr(source, "name", None) or source
+    if str(file_name).lower().endswith((".xlsx", ".xlsm")):
+        from openpyxl import load_workbook
+
+        wb = load_workbook(source, read_only=True, data_only=True)
+        try:
+            yield from enumerate(wb.worksheets[0].iter_rows(values_only=True), start=1)
+        finally:
+            wb.close()
+        return
+
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, encoding=encoding, newline="") as f:
+            yield from enumerate(csv.reader(f), start=1)
+        return
+
+    # 업로드된 파일 등 바이너리 스트림. 다 읽은 뒤에도 원래 스트림은 닫지 않는다
+    f = io.TextIOWrapper(source, encoding=encoding, newline="")
+    try:
+        yield from enumerate(csv.reader(f), start=1)
+    finally:
+        f.detach()
+
+
+# 머리글 행에서 각 열의 위치를 찾는다
+def _column_positions(header, kind):
+    header = [str(value).strip() if value is not None else "" for value in header]
+    positions = {}
+    for key, aliases in COLUMNS[kind].items():
+        for alias in aliases:
+            if alias in header:
+                positions[key] = header.index(alias)
+                break
+        else:
+            raise ValueError(f"'{aliases[0]}' 열을 찾을 수 없습니다. 머리글: {', '.join(header)}")
+    return positions
+
+
+def _text(value):
+    return "" if value is None else str(value).strip()
+
+
+def _number(value, label):
+    if isinstance(value, str):
+        value = value.replace(",", "").strip()
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{label} 값이 숫자가 아닙니다: {value!r}") from None
+    if not math.isfinite(number) or number < 0:
+        raise ValueError(f"{label} 값이 올바르지 않습니다: {value!r}")
+    return number
+
+
+# 한 행을 검사해서 DB 에 넣을 튜플로 바꾼다 (잘못된 행은 ValueError)
+def _parse_part(values, positions):
+    name = _text(values[positions["name"]])
+    if not name:
+        raise ValueError("부품명이 비어 있습니다.")
+    return name, to_minor(_number(values[positions["price"]], "단가"))
+
+
+def _parse_unit_line(values, positions):
+    unit = _text(values[positions["unit"]])
+    part = _text(values[positions["part"]])
+    if not unit or not part:
+        raise ValueError("유닛명 또는 부품명이 비어 있습니다.")
+    return unit, part, _number(values[positions["quantity"]], "수량")
+
+
+# 행들을 chunk_size 개씩 묶어서 묶음마다 한 트랜잭션으로 반영한다
+# progress(처리한 행 수) 는 묶음이 끝날 때마다 호출된다
+def import_rows(repo, rows, kind="parts", chunk_size=5000, progress=None, date_submitted=None):
+    if kind not in COLUMNS:
+        raise ValueError(f"알 수 없는 가져오기 종류: {kind}")
+    parse = _parse_part if kind == "parts" else _parse_unit_line
+    date_submitted = date_submitted or datetime.date.today().isoformat()
+
+    start = time.perf_counter()
+    rows = iter(rows)
+    header = next(rows, None)
+    if header is None:
+        raise ValueError("빈 파일입니다.")
+    positions = _column_positions(header[1], kind)
+    width = max(positions.values()) + 1
+
+    total = inserted = updated = unchanged = rejected = 0
+    rejected_rows = []
+
+    def reject(line, reason):
+        nonlocal rejected
+        rejected += 1
+        if len(rejected_rows) < MAX_REJECTED_DETAILS:
+            rejected_rows.append((line, reason))
+
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            break
+        lines, parsed = [], []
+        for line, values in chunk:
+            # 완전히 빈 행은 건너뛴다
+            if not any(_text(value) for value in values):
+                continue
+            total += 1
+            try:
+                if len(values) < width:
+                    raise ValueError("열 개수가 부족합니다.")
+                parsed.append(parse(values, positions))
+                lines.append(line)
+            except ValueError as e:
+                reject(line, str(e))
+
+        if parsed:
+            if kind == "parts":
+                counts = repo.upsert_ingredients(parsed)
+            else:
+                *counts, missing = repo.upsert_menu_ingredients(parsed, date_submitted)
+                for i in missing:
+                    reject(lines[i], f"등록되지 않은 부품입니다: {parsed[i][1]}")
+            inserted += counts[0]
+            updated += counts[1]
+            unchanged += counts[2]
+        if progress is not None:
+            progress(total)
+
+    return ImportResult(kind, total, inserted, updated, unchanged, rejected, rejected_rows, time.perf_counter() - start)
+
+
+def import_file(repo, source, kind="parts", file_name=None, chunk_size=5000, encoding="utf-8-sig", progress=None):
+    return import_rows(repo, iter_table_rows(source, file_name, encoding), kind, chunk_size, progress)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="CSV/XLSX 파일로 부품 단가표 또는 유닛 구성을 한꺼번에 가져옵니다.")
+    parser.add_argument("file", help="가져올 파일 (.csv 또는 .xlsx, 첫 행은 머리글)")
+    parser.add_argument("--kind", choices=sorted(COLUMNS), default="parts",
+                        help="parts: 부품명,단가 / units: 유닛명,부품명,수량")
+    parser.add_argument("--db", default=None, help="데이터베이스 경로 (기본: GSI_DB_PATH 또는 restaurant_menu.db)")
+    parser.add_argument("--project", default=None, help="프로젝트 이름 (GSI_PROJECTS_DIR 아래의 프로젝트 DB, --db 대신)")
+    parser.add_argument("--chunk-size", type=int, default=5000, help="한 트랜잭션에 반영할 행 수")
+    parser.add_argument("--encoding", default="utf-8-sig", help="CSV 인코딩 (엑셀에서 저장한 CSV 는 cp949 일 수 있음)")
+    args = parser.parse_args(argv)
+
+    try:
+        result = import_file(get_repository(resolve_db(args.db, args.project)), args.file, args.kind, chunk_size=args.chunk_size, encoding=args.encoding)
+    except (ValueError, OSError) as e:
+        print(f"가져오기 실패: {e}", file=sys.stderr)
+        return 1
+
+    for line, reason in result.rejected_rows:
+        print(f"  {line}행: {reason}", file=sys.stderr)
+    if result.rejected > len(result.rejected_rows):
+        print(f"  ... 외 {result.rejected - len(result.rejected_rows)}행", file=sys.stderr)
+    rate = result.rows / result.seconds if result.seconds else 0
+    print(f"{result.rows}행: 추가 {result.inserted}, 변경 {result.updated}, 동일 {result.unchanged}, "
+          f"거부 {result.rejected} ({result.seconds:.2f}초, {rate:,.0f}행/초)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+import threading
+from collections import namedtuple
+
+from .catalog_columns import TABLE_COLUMNS, ColumnWriter, available, columns_dir, read_columns
+from .catalog_sync import apply_changes, change_count, fetch_changes, load_column_frames
+from .cost_engine import CostEngine
+from .db import get_repository
+from .labor import LaborModel
+
+# 프로세스 전체에서 공유하는 읽기 전용 카탈로그 (세션에서 수정하지 않는다)
+CatalogSnapshot = namedtuple("CatalogSnapshot", "revision epoch menu_df ingredient_df menu_ingredients_df menu_components_df engine labor")
+
+# 세션에 붙이는 스냅샷 DataFrame (세션에서 수정하지 않으므로 복사하지 않는다)
+SESSION_FRAMES = ("menu_df", "ingredient_df", "menu_ingredients_df", "menu_components_df")
+
+
+# DB 리비전이 바뀔 때만 스냅샷을 새로 만드는 공유 캐시.
+# 처음에는 열 스냅샷 파일(catalog_columns)이 있으면 그것을 읽고 그 뒤 바뀐 행만 DB 에서 가져오며,
+# 리비전이 바뀔 때마다 열 스냅샷을 뒤에서 다시 쓴다 (columns=False 이면 쓰지 않음)
+class CatalogCache:
+    def __init__(self, repo, columns=True):
+        self.repo = repo
+        self._lock = threading.Lock()
+        self._state = {}
+        self._snapshot = None
+        directory = columns_dir(repo.pool.path) if columns and available() else None
+        self.columns = ColumnWriter(directory) if directory else None
+
+    # 열 스냅샷에서 상태를 채운다 (인건비 모델은 작아서 DB 에서 읽는다). 읽었으면 True
+    def _load_columns(self):
+        columns = read_columns(self.columns.directory)
+        if columns is None:
+            return False
+        state = {}
+        load_column_frames(state, columns.frames)
+        state["labor_rows"] = self.repo.fetch_labor()
+        state["catalog_revision"] = columns.revision
+        state["catalog_epoch"] = columns.epoch
+        self._state = state
+        self.columns.written = (columns.revision, columns.epoch)
+        return True
+
+    def get(self):
+        with self._lock:
+            if self._snapshot is None and self.columns is not None:
+                self._load_columns()
+            # 리비전이 그대로면 아무것도 복사하지 않고 기존 스냅샷을 돌려준다
+            changes = fetch_changes(self._state, self.repo)
+            if self._snapshot is None or change_count(changes):
+                # 기존 스냅샷의 DataFrame 은 세션들이 참조 중이다. apply_changes 는 바뀌는 DataFrame 만 복사해서 합친다
+                state = dict(self._state)
+                apply_changes(state, changes)
+                self._state = state
+                # 단가만 바뀌었으면 엔진(펼친 BOM 과 유닛 비용 메모)을 그대로 이어서 쓴다
+                engine = CostEngine.from_frames(state["menu_df"], state["menu_ingredients_df"], state["ingredient_df"],
+                                                state["menu_components_df"],
+                                                previous=self._snapshot.engine if self._snapshot else None)
+                # 인건비 행렬은 엔진의 유닛 위치를 따르므로 엔진과 함께 다시 만든다
+                labor = LaborModel.from_rows(state["labor_rows"], engine)
+                self._snapshot = CatalogSnapshot(
+                    state["catalog_revision"],
+                    state["catalog_epoch"],
+                    state["menu_df"],
+                    state["ingredient_df"],
+                    state["menu_ingredients_df"],
+                    state["menu_components_df"],
+                    engine,
+                    labor,
+                )
+                if self.columns is not None:
+                    self.columns.submit(state["catalog_revision"], state["catalog_epoch"],
+                                        {name: state[name] for name in TABLE_COLUMNS})
+            return self._snapshot
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+# 데이터베이스 경로별로 하나의 캐시를 프로세스 전체에서 공유
+def get_catalog_cache(path=None):
+    repo = get_repository(path)
+    with _caches_lock:
+        cache = _caches.get(repo.pool.path)
+        if cache is None:
+            cache = _caches[repo.pool.path] = CatalogCache(repo)
+        return cache
+
+
+# 세션 상태를 스냅샷에 맞춘다. 견적 입력은 세션의 QuoteState 가 ID 로 따로 들고 있으므로
+# 세션에는 스냅샷 DataFrame 의 참조만 둔다
+def attach_session(state, snapshot):
+    if state.get("catalog_revision") == snapshot.revision and state.get("catalog_epoch") == snapshot.epoch:
+        return False
+    for name in SESSION_FRAMES:
+        state[name] = getattr(snapshot, name)
+    state["catalog_revision"] = snapshot.revision
+    state["catalog_epoch"] = snapshot.epoch
+    return True
@@ -0,0 +1,167 @@
+import importlib.util
+import json
+import logging
+import os
+import shutil
+import threading
+import uuid
+from collections import namedtuple
+
+from .catalog_sync import INGREDIENT_COLUMNS, MENU_COMPONENT_COLUMNS, MENU_INGREDIENT_COLUMNS
+
+# 카탈로그 열 스냅샷. 새 프로세스(Streamlit 서버, 배치 작업자)가 처음 카탈로그를 읽을 때 SQLite 전체 조회 대신
+# Arrow IPC 파일을 메모리 매핑해서 읽는다 (숫자 열은 복사 없이, 유닛/부품 이름은 사전 인코딩해서 pandas category 로).
+# 파일은 DB 옆 폴더(<DB 경로>-columns, 환경변수 GSI_CATALOG_COLUMNS=0 이면 끔)에 (Epoch, Revision) 마다 새 하위 폴더로 쓰고,
+# CURRENT 파일을 원자적으로 바꿔서 가리킨다. pyarrow 가 없으면 쓰지도 읽지도 않는다 (항상 SQLite 에서 읽음)
+ENABLED = os.environ.get("GSI_CATALOG_COLUMNS", "1") != "0"
+CURRENT = "CURRENT"
+
+# 스냅샷에 넣는 열 (세션 전용 열은 catalog_sync.load_frames 처럼 읽은 뒤에 붙인다)
+TABLE_COLUMNS = {
+    "menu_df": ["ID", "MenuName"],
+    "ingredient_df": INGREDIENT_COLUMNS,
+    "menu_ingredients_df": MENU_INGREDIENT_COLUMNS,
+    "menu_components_df": MENU_COMPONENT_COLUMNS,
+}
+# BOM 행마다 반복되는 이름 열은 사전 인코딩 (부품 수만큼의 문자열 + 행마다 정수 번호)
+DICTIONARY_COLUMNS = ("MenuName", "IngredientName")
+
+# revision/epoch: 스냅샷을 만든 DB 상태, frames: {TABLE_COLUMNS 의 이름: DataFrame}
+ColumnSnapshot = namedtuple("ColumnSnapshot", "revision epoch frames")
+
+logger = logging.getLogger(__name__)
+
+
+def available():
+    return ENABLED and importlib.util.find_spec("pyarrow") is not None
+
+
+# DB 파일 경로 → 열 스냅샷 폴더 (메모리 DB 는 None)
+def columns_dir(db_path):
+    if db_path == ":memory:" or db_path.startswith("file:"):
+        return None
+    return os.path.abspath(db_path) + "-columns"
+
+
+# 카탈로그 DataFrame 들을 새 하위 폴더에 쓰고 CURRENT 를 바꾼 뒤, 오래된 하위 폴더를 정리한다.
+# 새 폴더와 바로 전 CURRENT 가 가리키던 폴더(아직 읽는 중일 수 있음)는 남기고, 그보다 먼저 만든 폴더만 지운다.
+# 그보다 새로운 폴더는 다른 프로세스가 쓰고 있는 중일 수 있으므로 건드리지 않는다 (다음 쓰기 때 정리된다)
+def write_columns(directory, revision, epoch, frames):
+    import pyarrow as pa
+    import pyarrow.ipc
+
+    os.makedirs(directory, exist_ok=True)
+    name = f"{epoch}-{revision}-{uuid.uuid4().hex[:8]}"
+    target = os.path.join(directory, name)
+    os.makedirs(target)
+    for table, columns in TABLE_COLUMNS.items():
+        data = pa.Table.from_pandas(frames[table][columns], preserve_index=False)
+        for column in DICTIONARY_COLUMNS:
+            if column in data.column_names:
+                data = data.set_column(data.column_names.index(column), column, data[column].dictionary_encode())
+        with pa.OSFile(os.path.join(target, f"{table}.arrow"), "wb") as sink:
+            with pyarrow.ipc.new_file(sink, data.schema) as writer:
+                writer.write_table(data)
+
+    previous = _current_name(directory)
+    pointer = os.path.join(directory, f"{CURRENT}.{name}.tmp")
+    with open(pointer, "w", encoding="utf-8") as f:
+        json.dump({"name": name, "revision": revision, "epoch": epoch}, f)
+    os.replace(pointer, os.path.join(directory, CURRENT))
+
+    if previous is not None and previous != name:
+        _remove_older(directory, previous, keep=(name, previous))
+    return name
+
+
+def _current_name(directory):
+    try:
+        with open(os.path.join(directory, CURRENT), encoding="utf-8") as f:
+            return json.load(f)["name"]
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+# previous 하위 폴더보다 먼저 바뀐(mtime) 하위 폴더를 지운다 (previous 가 없어졌으면 아무것도 지우지 않는다).
+# 다른 프로세스가 매핑해 둔 파일을 지워도 그 매핑은 그대로 유효하다 (지우지 못하면 다음에 지운다)
+def _remove_older(directory, previous, keep):
+    try:
+        cutoff = os.stat(os.path.join(directory, previous)).st_mtime
+    except OSError:
+        return
+    for entry in os.scandir(directory):
+        try:
+            stale = entry.is_dir() and entry.name not in keep and entry.stat().st_mtime < cutoff
+        except OSError:
+            continue
+        if stale:
+            shutil.rmtree(entry.path, ignore_errors=True)
+
+
+# CURRENT 가 가리키는 스냅샷을 읽는다 (없거나 읽을 수 없으면 None)
+def read_columns(directory):
+    import pyarrow as pa
+    import pyarrow.ipc
+
+    try:
+        with open(os.path.join(directory, CURRENT), encoding="utf-8") as f:
+            current = json.load(f)
+        frames = {}
+        for table in TABLE_COLUMNS:
+            # 매핑한 파일 위의 Arrow 버퍼를 그대로 쓴다 (split_blocks: 숫자 열을 한 블록으로 모으며 복사하지 않도록).
+            # 사전 인코딩한 이름 열은 pandas category 로 그대로 둔다 (이름 문자열은 사전에 한 번씩만 만든다)
+            source = pa.memory_map(os.path.join(directory, current["name"], f"{table}.arrow"))
+            frames[table] = pyarrow.ipc.open_file(source).read_all().to_pandas(split_blocks=True)
+    except (OSError, ValueError, KeyError, pa.ArrowException):
+        # 다른 프로세스가 새 스냅샷으로 바꾸면서 하위 폴더를 지웠을 수도 있다
+        return None
+    return ColumnSnapshot(current["revision"], current["epoch"], frames)
+
+
+# 스냅샷 쓰기를 뒤에서 한 스레드로 한다. 쓰는 동안 들어온 요청은 가장 마지막 것만 남겨 두었다가 이어서 쓴다
+class ColumnWriter:
+    def __init__(self, directory):
+        self.directory = directory
+        self.written = None
+        self._lock = threading.Lock()
+        self._pending = None
+        self._thread = None
+
+    def submit(self, revision, epoch, frames):
+        with self._lock:
+            if self.written == (revision, epoch):
+                return
+            self._pending = (revision, epoch, frames)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="gsi-catalog-columns", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        try:
+            while True:
+                with self._lock:
+                    pending, self._pending = self._pending, None
+                    if pending is None:
+                        self._thread = None
+                        return
+                revision, epoch, frames = pending
+                try:
+                    write_columns(self.directory, revision, epoch, frames)
+                except Exception:
+                    # 스냅샷은 SQLite 의 복사본일 뿐이므로 실패해도 다음 요청에서 다시 쓴다
+                    logger.exception("카탈로그 열 스냅샷을 쓰지 못했습니다: %s", self.directory)
+                    continue
+                with self._lock:
+                    self.written = (revision, epoch)
+        finally:
+            # 예상 못 한 오류로 빠져나가도 다음 submit 이 새 스레드를 시작할 수 있게 한다
+            with self._lock:
+                if self._thread is threading.current_thread():
+                    self._thread = None
+
+    # 쓰고 있는 스냅샷이 끝날 때까지 기다린다 (벤치마크/종료 전)
+    def flush(self):
+        with self._lock:
+            thread = self._thread
+        if thread is not None:
+            thread.join()
@@ -0,0 +1,158 @@
+import pandas as pd
+
+MENU_COLUMNS = ["ID", "MenuName", "DateSubmitted"]
+INGREDIENT_COLUMNS = ["ID", "IngredientName", "Price"]
+MENU_INGREDIENT_COLUMNS = ["MenuID", "MenuName", "IngredientID", "IngredientName", "Quantity", "Price"]
+MENU_COMPONENT_COLUMNS = ["ParentMenuID", "ChildMenuID", "Quantity"]
+
+# 세션에서만 쓰는 열(수량/합계/선택)의 기본값. 새로 들어온 행에 채워 넣는다
+OVERLAY_DEFAULTS = {"Quantity": 0, "TotalCost": 0, "Include": False}
+
+# 세션 상태에 동기화하는 카탈로그 DataFrame 들
+INGREDIENT_FRAMES = ("ingredient_df", "new_df")
+
+# 변경분은 기존 DataFrame 을 제자리에서 바꾸지 않고 바뀌는 DataFrame 만 복사해서 합친다 (공유 스냅샷을 세션들이 참조 중이므로).
+# pandas 3 부터는 Copy-on-Write 가 항상 켜져 있어서 얕은 복사로 충분하고, 그보다 오래된 pandas 에서는
+# 프로세스 전체 설정(mode.copy_on_write)을 바꾸지 않고 깊은 복사를 한다
+SHALLOW_COPY_IS_SAFE = int(pd.__version__.split(".")[0]) >= 3
+
+
+def _key_index(df, keys):
+    if len(keys) == 1:
+        return pd.Index(df[keys[0]])
+    return pd.MultiIndex.from_frame(df[keys])
+
+
+# 열 스냅샷에서 읽은 이름 열은 category 이므로, 새 이름을 넣기 전에 범주를 늘린다 (category 가 아니면 그대로)
+def _add_categories(df, column, values):
+    dtype = df[column].dtype
+    if isinstance(dtype, pd.CategoricalDtype):
+        new = pd.Index(values).dropna().unique().difference(dtype.categories)
+        if len(new):
+            df = df.assign(**{column: df[column].cat.add_categories(new)})
+    return df
+
+
+# 바뀐 행은 값만 덮어쓰고, 새 행은 뒤에 붙인다 (세션 전용 열과 기존 행의 인덱스는 유지)
+def _upsert(df, changed, keys):
+    if changed.empty:
+        return df
+    positions = _key_index(df, keys).get_indexer(_key_index(changed, keys))
+    exists = positions >= 0
+    data_columns = [c for c in changed.columns if c not in keys]
+    categorical = {}
+    for column in data_columns:
+        df = _add_categories(df, column, changed[column])
+        if isinstance(df[column].dtype, pd.CategoricalDtype):
+            categorical[column] = df[column].dtype
+
+    if exists.any():
+        df = _writable(df)
+        df.loc[df.index[positions[exists]], data_columns] = changed.loc[exists, data_columns].to_numpy()
+
+    if not exists.all():
+        added = changed.loc[~exists].copy()
+        for column in df.columns:
+            if column not in added.columns:
+                added[column] = OVERLAY_DEFAULTS.get(column)
+        start = df.index.max() + 1 if len(df) else 0
+        added.index = pd.RangeIndex(start, start + len(added))
+        added = added.astype(categorical)
+        df = pd.concat([df, added[df.columns]]) if len(df) else added[df.columns]
+    return df
+
+
+def _writable(df):
+    return df.copy(deep=not SHALLOW_COPY_IS_SAFE)
+
+
+def _drop_keys(df, keys, deleted):
+    if not deleted:
+        return df
+    return df[~_key_index(df, keys).isin(deleted)]
+
+
+# 처음 불러올 때(또는 DB 가 초기화됐을 때)의 세션 DataFrame 구성
+def load_frames(state, menus, ingredients, menu_ingredients, menu_components=()):
+    menu_df = pd.DataFrame(menus, columns=MENU_COLUMNS).drop(columns=["DateSubmitted"])
+    menu_df["Quantity"] = 0
+    menu_df["TotalCost"] = 0
+    state["menu_df"] = menu_df
+    for name in INGREDIENT_FRAMES:
+        state[name] = pd.DataFrame(ingredients, columns=INGREDIENT_COLUMNS)
+    state["menu_ingredients_df"] = pd.DataFrame(menu_ingredients, columns=MENU_INGREDIENT_COLUMNS)
+    state["menu_components_df"] = pd.DataFrame(list(menu_components), columns=MENU_COMPONENT_COLUMNS)
+
+
+# 열 스냅샷(catalog_columns)에서 읽은 DataFrame 으로 load_frames 와 같은 구성을 만든다 (세션 전용 열만 붙임)
+def load_column_frames(state, frames):
+    state["menu_df"] = frames["menu_df"].assign(Quantity=0, TotalCost=0)
+    for name in INGREDIENT_FRAMES:
+        state[name] = frames["ingredient_df"].copy(deep=False)
+    state["menu_ingredients_df"] = frames["menu_ingredients_df"]
+    state["menu_components_df"] = frames["menu_components_df"]
+
+
+# 변경분만 기존 세션 DataFrame 에 합친다
+def _merge_changes(state, changes):
+    deleted = {"Menus": [], "Ingredients": [], "MenuIngredients": [], "MenuComponents": []}
+    for table, key1, key2 in changes.deletes:
+        deleted[table].append(key1 if key2 is None else (key1, key2))
+
+    menus = pd.DataFrame(changes.menus, columns=MENU_COLUMNS).drop(columns=["DateSubmitted"])
+    state["menu_df"] = _upsert(_drop_keys(state["menu_df"], ["ID"], deleted["Menus"]), menus, ["ID"])
+
+    ingredients = pd.DataFrame(changes.ingredients, columns=INGREDIENT_COLUMNS)
+    for name in INGREDIENT_FRAMES:
+        state[name] = _upsert(_drop_keys(state[name], ["ID"], deleted["Ingredients"]), ingredients, ["ID"])
+
+    mi_df = _drop_keys(state["menu_ingredients_df"], ["MenuID", "IngredientID"], deleted["MenuIngredients"])
+    mi_df = _upsert(mi_df, pd.DataFrame(changes.menu_ingredients, columns=MENU_INGREDIENT_COLUMNS), ["MenuID", "IngredientID"])
+
+    # 이름/가격이 바뀐 유닛·부품은 조인 결과(menu_ingredients_df)에도 반영
+    if not menus.empty or not ingredients.empty:
+        mi_df = _writable(mi_df)
+    if not menus.empty:
+        mask = mi_df["MenuID"].isin(menus["ID"])
+        mi_df = _add_categories(mi_df, "MenuName", menus["MenuName"])
+        mi_df.loc[mask, "MenuName"] = mi_df.loc[mask, "MenuID"].map(menus.set_index("ID")["MenuName"])
+    if not ingredients.empty:
+        mask = mi_df["IngredientID"].isin(ingredients["ID"])
+        by_id = ingredients.set_index("ID")
+        mi_df = _add_categories(mi_df, "IngredientName", ingredients["IngredientName"])
+        mi_df.loc[mask, "IngredientName"] = mi_df.loc[mask, "IngredientID"].map(by_id["IngredientName"])
+        mi_df.loc[mask, "Price"] = mi_df.loc[mask, "IngredientID"].map(by_id["Price"])
+    state["menu_ingredients_df"] = mi_df
+
+    keys = ["ParentMenuID", "ChildMenuID"]
+    mc_df = _drop_keys(state["menu_components_df"], keys, deleted["MenuComponents"])
+    state["menu_components_df"] = _upsert(mc_df, pd.DataFrame(changes.menu_components, columns=MENU_COMPONENT_COLUMNS), keys)
+
+
+# 세션 상태를 DB 의 최신 리비전으로 맞춘다. 바뀐 행 수를 돌려준다 (변경 없으면 0)
+def sync_catalog(state, repo):
+    return apply_changes(state, fetch_changes(state, repo))
+
+
+# 상태의 리비전 이후 바뀐 행 (db.CatalogChanges)
+def fetch_changes(state, repo):
+    return repo.fetch_changes(state.get("catalog_revision", 0), state.get("catalog_epoch"))
+
+
+# fetch_changes 로 가져온 변경분을 상태에 합친다. 바뀐 행 수를 돌려준다
+def apply_changes(state, changes):
+    if changes.full:
+        load_frames(state, changes.menus, changes.ingredients, changes.menu_ingredients, changes.menu_components)
+    else:
+        _merge_changes(state, changes)
+    # 인건비 모델은 작아서 바뀌면 통째로 바꾼다 (db.LaborRows)
+    if changes.labor is not None:
+        state["labor_rows"] = changes.labor
+    state["catalog_revision"] = changes.revision
+    state["catalog_epoch"] = changes.epoch
+    return change_count(changes)
+
+
+def change_count(changes):
+    return (int(changes.full) + len(changes.menus) + len(changes.ingredients) + len(changes.menu_ingredients)
+            + len(changes.menu_components) + len(changes.deletes) + int(changes.labor is not None))
@@ -0,0 +1,298 @@
+from graphlib import CycleError, TopologicalSorter
+
+import numpy as np
+import pandas as pd
+
+from .money import QUANTITY_SCALE, amounts, as_minor_array, milli_amounts, to_milli_array
+
+
+# 유닛×부품 수량 행렬(BOM)을 한 번만 만들어 두고 비용을 벡터 연산으로 계산하는 엔진
+#
+# 행렬은 희소 형태(COO)로 보관한다: 각 항목은 (유닛 위치, 부품 위치, 수량).
+# 항목은 유닛 순서 → 원래 MenuIngredients 순서로 정렬되어 있어서
+# 부품 수량의 np.bincount 순차 누적 결과가 기존 iterrows 루프와 비트 단위로 같다.
+#
+# 금액은 gsi_core.money 의 최소 단위 int64 로 계산한다. 단가는 int64 배열로 받고,
+# 유닛 1개 비용 = 항목별 (BOM 수량 × 단가, 최소 단위로 반올림) 의 합,
+# 유닛 비용 = 유닛 수량 × 유닛 1개 비용, 부품 금액 = 부품 수량 × 단가 (각각 반올림).
+# 정수 덧셈이라 합산 순서와 상관없이 결과가 정확히 같다.
+#
+# 하위 유닛(MenuComponents)이 있으면 생성 시점에 한 번만 펼친다. 하위 유닛을 먼저 처리하는
+# 위상 순서로 돌면서 유닛마다 펼친 결과를 저장해 두므로, 여러 곳에서 쓰이는 하위 조립품도
+# 한 번만 펼쳐진다. 펼친 부품 항목은 유닛의 직접 부품 항목 뒤에 붙는다.
+class CostEngine:
+    def __init__(self, menu_ids, ingredient_ids, mi_menu_ids, mi_ingredient_ids, mi_quantities,
+                 mc_parent_ids=(), mc_child_ids=(), mc_quantities=()):
+        self._source = (menu_ids, ingredient_ids, mi_menu_ids, mi_ingredient_ids, mi_quantities,
+                        mc_parent_ids, mc_child_ids, mc_quantities)
+        self.menu_ids = np.asarray(menu_ids)
+        self.ingredient_ids = np.asarray(ingredient_ids)
+
+        # ID → 위치 조회용 (세션의 견적 줄을 위치로 바꿀 때도 사용)
+        self._menu_index = pd.Index(self.menu_ids)
+        self._part_index = pd.Index(self.ingredient_ids)
+        menu_pos = self._menu_index.get_indexer(np.asarray(mi_menu_ids))
+        part_pos = self._part_index.get_indexer(np.asarray(mi_ingredient_ids))
+        quantities = np.asarray(mi_quantities, dtype=float)
+
+        # 유닛 목록이나 부품 목록에 없는 관계는 기존 루프에서도 계산되지 않으므로 제외
+        valid = (menu_pos >= 0) & (part_pos >= 0)
+        menu_pos, part_pos, quantities = menu_pos[valid], part_pos[valid], quantities[valid]
+
+        order = np.argsort(menu_pos, kind="stable")
+        self.unit_pos = menu_pos[order]
+        self.part_pos = part_pos[order]
+        self.quantities = quantities[order]
+
+        self.depth = 1
+        # 하위 유닛 구성: 상위 유닛 위치 → [(하위 유닛 위치, 수량)], 하위 유닛이 먼저 오는 상위 유닛 순서
+        self._children = {}
+        self._component_order = []
+        self._explode(mc_parent_ids, mc_child_ids, mc_quantities)
+        # 금액 계산용: 항목 수량(1/1000 단위 정수)과 유닛별 항목 구간
+        self.line_milli = to_milli_array(self.quantities)
+        self._unit_starts = np.searchsorted(self.unit_pos, np.arange(self.n_units + 1))
+
+        # 단가 1개당 유닛 비용 메모 (부품 단가, 유닛 비용)
+        self._unit_price_memo = None
+        # 부품 → 항목 역색인 (부품 위치 순서로 정렬한 항목 위치, 부품별 구간 시작). 처음 쓸 때 만든다.
+        # 구성이 그대로면(단가만 바뀌면) 엔진을 이어서 쓰므로 역색인도 다시 만들지 않는다
+        self._where_used = None
+
+    @classmethod
+    def from_frames(cls, menu_df, menu_ingredients_df, ingredient_df, menu_components_df=None, previous=None):
+        args = (
+            menu_df["ID"].to_numpy(),
+            ingredient_df["ID"].to_numpy(),
+            menu_ingredients_df["MenuID"].to_numpy(),
+            menu_ingredients_df["IngredientID"].to_numpy(),
+            menu_ingredients_df["Quantity"].to_numpy(),
+        )
+        if menu_components_df is None:
+            args += ((), (), ())
+        else:
+            args += (
+                menu_components_df["ParentMenuID"].to_numpy(),
+                menu_components_df["ChildMenuID"].to_numpy(),
+                menu_components_df["Quantity"].to_numpy(),
+            )
+        # 구성이 그대로면 (단가만 바뀐 경우) 이전 엔진과 메모를 그대로 쓴다
+        if previous is not None and previous._same_source(args):
+            return previous
+        return cls(*args)
+
+    def _same_source(self, args):
+        return all(np.array_equal(np.asarray(a), np.asarray(b)) for a, b in zip(self._source, args))
+
+    # 하위 유닛을 부품 항목으로 펼쳐서 COO 항목 뒤에 붙인다
+    def _explode(self, mc_parent_ids, mc_child_ids, mc_quantities):
+        parent_pos = self.unit_positions(mc_parent_ids)
+        child_pos = self.unit_positions(mc_child_ids)
+        child_quantities = np.asarray(mc_quantities, dtype=float)
+        valid = (parent_pos >= 0) & (child_pos >= 0)
+        if not valid.any():
+            return
+        parent_pos, child_pos, child_quantities = parent_pos[valid], child_pos[valid], child_quantities[valid]
+
+        children = {}
+        for parent, child, quantity in zip(parent_pos.tolist(), child_pos.tolist(), child_quantities.tolist()):
+            children.setdefault(parent, []).append((child, quantity))
+        try:
+            order = list(TopologicalSorter({p: [c for c, _ in cs] for p, cs in children.items()}).static_order())
+        except CycleError as e:
+            names = " → ".join(str(self.menu_ids[pos]) for pos in e.args[1])
+            raise ValueError(f"유닛 구성에 순환이 있습니다: {names}") from None
+        self._children = children
+        self._component_order = [unit for unit in order if unit in children]
+
+        # 유닛별 직접 부품 항목 구간
+        starts = np.searchsorted(self.unit_pos, np.arange(self.n_units + 1))
+        # 유닛 위치 → 펼친 전체 부품 (부품 위치, 수량), 유닛 위치 → 유닛 안에서의 깊이
+        exploded, depth = {}, {}
+        nested_units, nested_parts, nested_quantities = [], [], []
+        for unit in order:
+            direct = slice(starts[unit], starts[unit + 1])
+            if unit not in children:
+                exploded[unit] = (self.part_pos[direct], self.quantities[direct])
+                depth[unit] = 1
+                continue
+            # 하위 유닛들의 펼친 결과를 수량만큼 곱해서 부품별로 합친다
+            parts = np.concatenate([exploded[c][0] for c, _ in children[unit]])
+            quantities = np.concatenate([exploded[c][1] * q for c, q in children[unit]])
+            parts, inverse = np.unique(parts, return_inverse=True)
+            quantities = np.bincount(inverse, weights=quantities, minlength=len(parts))
+            nested_units.append(np.full(len(parts), unit))
+            nested_parts.append(parts)
+            nested_quantities.append(quantities)
+
+            all_parts, inverse = np.unique(np.concatenate([self.part_pos[direct], parts]), return_inverse=True)
+            all_quantities = np.bincount(inverse, weights=np.concatenate([self.quantities[direct], quantities]),
+                                         minlength=len(all_parts))
+            exploded[unit] = (all_parts, all_quantities)
+            depth[unit] = 1 + max(depth[c] for c, _ in children[unit])
+
+        self.depth = max(depth.values())
+        # 직접 항목 뒤에 펼친 항목을 붙이고 유닛 순서로 안정 정렬 (직접 항목의 순서와 합산 결과는 그대로)
+        unit_pos = np.concatenate([self.unit_pos] + nested_units)
+        order = np.argsort(unit_pos, kind="stable")
+        self.unit_pos = unit_pos[order]
+        self.part_pos = np.concatenate([self.part_pos] + nested_parts)[order]
+        self.quantities = np.concatenate([self.quantities] + nested_quantities)[order]
+
+    @property
+    def n_units(self):
+        return len(self.menu_ids)
+
+    @property
+    def n_parts(self):
+        return len(self.ingredient_ids)
+
+    # 유닛/부품 ID → menu_df / ingredient_df 행 위치 (없는 ID 는 -1)
+    def unit_positions(self, menu_ids):
+        return self._menu_index.get_indexer(np.asarray(menu_ids, dtype=self.menu_ids.dtype))
+
+    def part_positions(self, ingredient_ids):
+        return self._part_index.get_indexer(np.asarray(ingredient_ids, dtype=self.ingredient_ids.dtype))
+
+    def _check_unit_quantities(self, unit_quantities):
+        unit_quantities = np.asarray(unit_quantities, dtype=float)
+        if unit_quantities.shape != (self.n_units,):
+            raise ValueError(f"유닛 수량 길이({unit_quantities.shape})가 유닛 수({self.n_units})와 다릅니다.")
+        return unit_quantities
+
+    # 유닛 수량 벡터 → (계산할 항목, 항목별 필요 수량 = BOM 수량 × 유닛 수량, 1/1000 단위 정수)
+    def _line_milli(self, unit_quantities):
+        unit_milli = to_milli_array(self._check_unit_quantities(unit_quantities))
+        units = np.flatnonzero(unit_milli)
+        if len(units) * 8 >= self.n_units:
+            return slice(None), milli_amounts(self.line_milli, unit_milli[self.unit_pos])
+        # 주문한 유닛이 적으면 그 유닛의 항목만 계산한다 (빠지는 항목은 0 이라 합계는 같다)
+        lines = _ranges(np.searchsorted(self.unit_pos, units), np.searchsorted(self.unit_pos, units, side="right"))
+        return lines, milli_amounts(self.line_milli[lines], unit_milli[self.unit_pos[lines]])
+
+    # 몇 개 유닛만 주문했을 때의 부품별 필요 수량. 부품 전체 길이의 벡터 대신
+    # (필요한 부품 위치, 수량) 만 돌려준다. units: 유닛 위치, unit_quantities: 유닛별 수량
+    def sparse_part_quantities(self, units, unit_quantities):
+        parts, milli = self.sparse_part_milli(units, unit_quantities)
+        return parts, milli / QUANTITY_SCALE
+
+    # sparse_part_quantities 와 같지만 수량을 1/1000 단위 정수로 (견적 상태가 직접 추가한 수량과 합칠 때)
+    def sparse_part_milli(self, units, unit_quantities):
+        units = np.asarray(units, dtype=np.intp)
+        starts = np.searchsorted(self.unit_pos, units)
+        ends = np.searchsorted(self.unit_pos, units, side="right")
+        lines = _ranges(starts, ends)
+        unit_milli = np.repeat(to_milli_array(np.asarray(unit_quantities, dtype=float)), ends - starts)
+        parts, inverse = np.unique(self.part_pos[lines], return_inverse=True)
+        return parts, _bincount_int(inverse, milli_amounts(self.line_milli[lines], unit_milli), len(parts))
+
+    # 부품별 필요 수량 (ingredient_df 행 순서). 항목마다 1/1000 단위로 반올림해서 더하므로
+    # 0.1 + 0.2 가 0.30000000000000004 가 되는 부동소수점 흔적이 없다
+    def part_quantities(self, unit_quantities):
+        return self._part_milli(unit_quantities) / QUANTITY_SCALE
+
+    def _part_milli(self, unit_quantities):
+        lines, line_milli = self._line_milli(unit_quantities)
+        return _bincount_int(self.part_pos[lines], line_milli, self.n_parts)
+
+    # 유닛별 총 비용 (menu_df 행 순서, 최소 단위 int64) = 유닛 수량 × 유닛 1개 비용
+    def unit_costs(self, unit_quantities, prices):
+        return amounts(self._check_unit_quantities(unit_quantities), self.unit_prices(prices))
+
+    # 부품별 필요 수량과 합계 금액 (최소 단위 int64)
+    def part_rollup(self, unit_quantities, prices):
+        milli = self._part_milli(unit_quantities)
+        return milli / QUANTITY_SCALE, milli_amounts(milli, as_minor_array(prices))
+
+    # 유닛별 값(유닛 위치 × 열, 예: 역할별 작업 시간)에 하위 유닛의 값을 수량만큼 더한다 (하위 조립품 포함 합계)
+    def rollup_units(self, values):
+        values = np.array(values, dtype=float)
+        for unit in self._component_order:
+            for child, quantity in self._children[unit]:
+                values[unit] += quantity * values[child]
+        return values
+
+    def _part_lines(self):
+        if self._where_used is None:
+            order = np.argsort(self.part_pos, kind="stable")
+            self._where_used = (order, np.searchsorted(self.part_pos[order], np.arange(self.n_parts + 1)))
+        return self._where_used
+
+    # 부품 위치들을 쓰는 유닛 (하위 유닛을 거쳐 쓰는 상위 유닛 포함).
+    # 반환값: (parts 안의 순번, 유닛 위치) 쌍 배열 — 같은 쌍은 한 번만, 순번 → 유닛 위치 순
+    def where_used(self, parts):
+        order, starts = self._part_lines()
+        parts = np.asarray(parts, dtype=np.intp)
+        counts = starts[parts + 1] - starts[parts]
+        units = self.unit_pos[order[_ranges(starts[parts], starts[parts + 1])]]
+        keys = np.unique(np.repeat(np.arange(len(parts), dtype=np.int64), counts) * self.n_units + units)
+        return keys // self.n_units, keys % self.n_units
+
+    # 선택한 유닛(불리언 마스크)에 들어가는 부품 (하위 유닛의 부품 포함)
+    def parts_of_units(self, unit_mask):
+        part_mask = np.zeros(self.n_parts, dtype=bool)
+        part_mask[self.part_pos[np.asarray(unit_mask, dtype=bool)[self.unit_pos]]] = True
+        return part_mask
+
+    # 유닛 1개당 비용 (하위 유닛 포함, 최소 단위 int64). 단가가 바뀐 부품을 쓰는 유닛만 다시 계산한다
+    def unit_prices(self, prices):
+        prices = as_minor_array(prices).copy()
+        memo = self._unit_price_memo
+        costs = None
+        if memo is not None and len(memo[0]) == len(prices):
+            changed = np.flatnonzero(memo[0] != prices)
+            if not len(changed):
+                return memo[1]
+            order, starts = self._part_lines()
+            units = np.unique(self.unit_pos[order[_ranges(starts[changed], starts[changed + 1])]])
+            unit_starts = np.searchsorted(self.unit_pos, units)
+            unit_ends = np.searchsorted(self.unit_pos, units, side="right")
+            # 다시 계산할 항목이 전체의 1/4 이 넘으면 전체 계산이 더 빠르다
+            if (unit_ends - unit_starts).sum() * 4 < len(self.unit_pos):
+                costs = memo[1].copy()
+                lines = _ranges(unit_starts, unit_ends)
+                costs[units] = _segment_sums(milli_amounts(self.line_milli[lines], prices[self.part_pos[lines]]),
+                                             unit_ends - unit_starts)
+        if costs is None:
+            costs = _segment_sums(milli_amounts(self.line_milli, prices[self.part_pos]), np.diff(self._unit_starts))
+        # 여러 세션이 공유하므로 한 번에 바꿔 끼운다
+        costs.flags.writeable = False
+        self._unit_price_memo = (prices, costs)
+        return costs
+
+    # 단가 벡터 여러 개(부품 위치 × 시나리오, 최소 단위)에 대한 유닛 1개당 비용을 한 번에 계산한다.
+    # units 를 주면 그 유닛들만 (유닛 × 시나리오 int64). 단가 메모는 건드리지 않는다
+    def unit_price_matrix(self, price_matrix, units=None):
+        price_matrix = as_minor_array(price_matrix)
+        if units is None:
+            lines, counts = slice(None), np.diff(self._unit_starts)
+        else:
+            units = np.asarray(units, dtype=np.intp)
+            starts, ends = self._unit_starts[units], self._unit_starts[units + 1]
+            lines, counts = _ranges(starts, ends), ends - starts
+        return _segment_sums(milli_amounts(self.line_milli[lines, None], price_matrix[self.part_pos[lines]]), counts)
+
+    # 전체 부품 비용 (최소 단위 정수)
+    def total_cost(self, unit_quantities, prices):
+        return int(self.unit_costs(unit_quantities, prices).sum())
+
+
+# 위치별 정수 합. np.bincount 는 실수로 더하지만 합이 2^53 미만인 정수는 정확하므로 int64 로 되돌린다
+# (np.add.at 보다 한참 빠르다)
+def _bincount_int(positions, values, length):
+    return np.bincount(positions, weights=values, minlength=length).astype(np.int64)
+
+
+# [starts[i], ends[i]) 구간들을 이어 붙인 위치 배열
+def _ranges(starts, ends):
+    counts = ends - starts
+    offsets = np.repeat(starts - np.cumsum(counts) + counts, counts)
+    return np.arange(counts.sum()) + offsets
+
+
+# 연속된 구간(길이 counts)별 정수 합 (2차원이면 행 구간별). 빈 구간은 0 (np.add.reduceat 은 빈 구간에 다음 값을 넣는다)
+def _segment_sums(values, counts):
+    cumulative = np.cumsum(values, axis=0, dtype=np.int64)
+    cumulative = np.concatenate([np.zeros((1,) + cumulative.shape[1:], dtype=np.int64), cumulative])
+    ends = np.cumsum(counts)
+    return cumulative[ends] - cumulative[ends - counts]
@@ -0,0 +1,629 @@
+import datetime
+import os
+import queue
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+
+from .migrations import migrate
+from .profiling import StatementCounter, current_profile
+
+# 데이터베이스 파일 경로 (환경변수 GSI_DB_PATH 로 변경 가능)
+DB_PATH = os.environ.get("GSI_DB_PATH", "restaurant_menu.db")
+
+# 연결마다 적용하는 PRAGMA 설정
+PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": -20000,       # 약 20MB 페이지 캐시
+    "mmap_size": 268435456,     # 256MB 메모리 매핑
+    "temp_store": "MEMORY",
+    "foreign_keys": "ON",
+}
+
+# 자주 쓰는 SQL 문 (연결별 statement cache 에서 재사용되도록 문자열을 고정)
+SQL_INSERT_MENU = 'INSERT INTO Menus (MenuName, DateSubmitted) VALUES (?, ?)'
+SQL_INSERT_INGREDIENT = 'INSERT INTO Ingredients (IngredientName, Price) VALUES (?, ?)'
+SQL_INSERT_MENU_INGREDIENT = 'INSERT INTO MenuIngredients (MenuID, IngredientID, Quantity) VALUES (?, ?, ?)'
+SQL_INSERT_MENU_COMPONENT = 'INSERT INTO MenuComponents (ParentMenuID, ChildMenuID, Quantity) VALUES (?, ?, ?)'
+SQL_UPSERT_MENU_COMPONENT = SQL_INSERT_MENU_COMPONENT + '''
+                     ON CONFLICT (ParentMenuID, ChildMenuID) DO UPDATE SET Quantity = excluded.Quantity'''
+SQL_UPDATE_INGREDIENT_PRICE = 'UPDATE Ingredients SET Price = ? WHERE IngredientName = ?'
+SQL_UPDATE_INGREDIENT_PRICE_BY_ID = 'UPDATE Ingredients SET Price = ? WHERE IngredientID = ?'
+SQL_UPSERT_MENU_INGREDIENT = '''INSERT INTO MenuIngredients (MenuID, IngredientID, Quantity) VALUES (?, ?, ?)
+                     ON CONFLICT (MenuID, IngredientID) DO UPDATE SET Quantity = excluded.Quantity'''
+SQL_SELECT_MENUS_BASE = 'SELECT MenuID, MenuName, DateSubmitted FROM Menus'
+SQL_SELECT_INGREDIENTS_BASE = 'SELECT IngredientID, IngredientName, Price FROM Ingredients'
+SQL_SELECT_MENU_INGREDIENTS_BASE = '''SELECT mi.MenuID, m.MenuName, mi.IngredientID, i.IngredientName, mi.Quantity, i.Price
+                     FROM MenuIngredients mi
+                     JOIN Menus m ON mi.MenuID = m.MenuID
+                     JOIN Ingredients i ON mi.IngredientID = i.IngredientID'''
+SQL_SELECT_MENU_COMPONENTS_BASE = 'SELECT ParentMenuID, ChildMenuID, Quantity FROM MenuComponents'
+
+# child 유닛의 하위 구성 전체에 parent 유닛이 있는지 (있으면 parent → child 연결은 순환)
+SQL_SELECT_CREATES_CYCLE = '''WITH RECURSIVE Descendants (MenuID) AS (
+                         SELECT ?
+                         UNION
+                         SELECT mc.ChildMenuID FROM MenuComponents mc JOIN Descendants d ON mc.ParentMenuID = d.MenuID
+                     )
+                     SELECT 1 FROM Descendants WHERE MenuID = ? LIMIT 1'''
+
+# 단가 이력: 부품별로 as_of 시각 이전의 마지막 단가 (같은 시각이면 나중에 기록된 값)
+# 그 시점에 아직 없던 부품은 가장 이른 단가
+SQL_INSERT_PRICE_HISTORY = 'INSERT INTO PriceHistory (IngredientID, EffectiveFrom, Price) VALUES (?, ?, ?)'
+SQL_SELECT_PRICES_AS_OF = '''SELECT i.IngredientID, COALESCE(
+                            (SELECT h.Price FROM PriceHistory h
+                             WHERE h.IngredientID = i.IngredientID AND h.EffectiveFrom <= ?
+                             ORDER BY h.EffectiveFrom DESC, h.rowid DESC LIMIT 1),
+                            (SELECT h.Price FROM PriceHistory h
+                             WHERE h.IngredientID = i.IngredientID
+                             ORDER BY h.EffectiveFrom, h.rowid LIMIT 1))
+                     FROM Ingredients i ORDER BY i.IngredientID'''
+SQL_SELECT_PRICE_HISTORY_AFTER = '''SELECT rowid, IngredientID, EffectiveFrom, Price FROM PriceHistory
+                     WHERE rowid > ? ORDER BY rowid'''
+
+# 견적서 저장. 견적번호는 '<quote_prefix>-YYYYMM-NNNN' (DB 별 월별 순번, UTC 기준)
+SQL_NEXT_QUOTE_SEQUENCE = '''INSERT INTO QuoteSequences (Period, LastValue) VALUES (strftime('%Y%m', 'now'), 1)
+                     ON CONFLICT (Period) DO UPDATE SET LastValue = LastValue + 1
+                     RETURNING Period, LastValue'''
+SQL_INSERT_QUOTE = '''INSERT INTO Quotes (QuoteNumber, Customer, Project, NumPeople, LaborCostPerPerson,
+                         TotalMaterialCost, TotalLaborCost, TotalCost, PriceAsOf, ContentHash, MarginRate, Margin, TaxRate, Tax)
+                     VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)'''
+SQL_INSERT_QUOTE_LINE = '''INSERT INTO QuoteLines (QuoteID, LineNo, MenuID, MenuName, Quantity, UnitPrice, TotalCost)
+                     VALUES (?, ?, ?, ?, ?, ?, ?)'''
+SQL_SELECT_QUOTES_BASE = '''SELECT QuoteID, QuoteNumber, CreatedAt, Customer, Project, NumPeople, LaborCostPerPerson,
+                            TotalMaterialCost, TotalLaborCost, TotalCost, PriceAsOf, ContentHash, MarginRate, Margin, TaxRate, Tax
+                     FROM Quotes'''
+SQL_SELECT_QUOTE_BY_HASH = SQL_SELECT_QUOTES_BASE + ' WHERE ContentHash = ? ORDER BY QuoteID DESC LIMIT 1'
+SQL_SELECT_RECENT_QUOTES = SQL_SELECT_QUOTES_BASE + ' ORDER BY QuoteID DESC LIMIT ?'
+SQL_SELECT_QUOTE_LINES = '''SELECT LineNo, MenuID, MenuName, Quantity, UnitPrice, TotalCost
+                     FROM QuoteLines WHERE QuoteID = ? ORDER BY LineNo'''
+# 유닛들이 들어 있는 견적 행 (idx_quotelines_menu 사용). {} 에는 _select_in 이 자리표시자를 넣는다
+SQL_SELECT_QUOTE_LINES_FOR_MENUS = '''SELECT l.QuoteID, q.QuoteNumber, q.Customer, q.Project, l.MenuID, l.Quantity
+                     FROM QuoteLines l JOIN Quotes q ON q.QuoteID = l.QuoteID
+                     WHERE l.MenuID IN ({})'''
+
+# 전체 조회 (입력 순서 유지)
+SQL_SELECT_MENUS = SQL_SELECT_MENUS_BASE + ' ORDER BY MenuID'
+SQL_SELECT_INGREDIENTS = SQL_SELECT_INGREDIENTS_BASE + ' ORDER BY IngredientID'
+SQL_SELECT_MENU_INGREDIENTS = SQL_SELECT_MENU_INGREDIENTS_BASE + ' ORDER BY mi.rowid'
+SQL_SELECT_MENU_COMPONENTS = SQL_SELECT_MENU_COMPONENTS_BASE + ' ORDER BY rowid'
+
+# 변경 추적 조회 (Revision 인덱스 사용)
+SQL_SELECT_STATE = 'SELECT Revision, Epoch FROM CatalogState WHERE Id = 1'
+SQL_SELECT_LABOR_REVISION = 'SELECT LaborRevision FROM CatalogState WHERE Id = 1'
+SQL_SELECT_MENUS_SINCE = SQL_SELECT_MENUS_BASE + ' WHERE Revision > ?'
+SQL_SELECT_INGREDIENTS_SINCE = SQL_SELECT_INGREDIENTS_BASE + ' WHERE Revision > ?'
+SQL_SELECT_MENU_INGREDIENTS_SINCE = SQL_SELECT_MENU_INGREDIENTS_BASE + ' WHERE mi.Revision > ?'
+SQL_SELECT_MENU_COMPONENTS_SINCE = SQL_SELECT_MENU_COMPONENTS_BASE + ' WHERE Revision > ?'
+SQL_SELECT_DELETES_SINCE = 'SELECT TableName, Key1, Key2 FROM CatalogDeletes WHERE Revision > ? ORDER BY Revision'
+
+# 인건비 모델 (행 수가 적어서 항상 전체를 읽는다)
+SQL_SELECT_LABOR_SETTINGS = 'SELECT PerPersonCost, OverheadRate, MarginRate FROM LaborSettings WHERE Id = 1'
+SQL_SELECT_LABOR_ROLES = 'SELECT RoleID, RoleName, HourlyRate FROM LaborRoles ORDER BY RoleID'
+SQL_SELECT_UNIT_LABOR = 'SELECT MenuID, RoleID, Hours, SetupHours FROM UnitLabor ORDER BY MenuID, RoleID'
+SQL_UPSERT_LABOR_ROLE = '''INSERT INTO LaborRoles (RoleName, HourlyRate) VALUES (?, ?)
+                     ON CONFLICT (RoleName) DO UPDATE SET HourlyRate = excluded.HourlyRate
+                     RETURNING RoleID'''
+SQL_UPSERT_UNIT_LABOR = '''INSERT INTO UnitLabor (MenuID, RoleID, Hours, SetupHours) VALUES (?, ?, ?, ?)
+                     ON CONFLICT (MenuID, RoleID) DO UPDATE SET Hours = excluded.Hours, SetupHours = excluded.SetupHours'''
+SQL_DELETE_UNIT_LABOR = 'DELETE FROM UnitLabor WHERE MenuID = ? AND RoleID = ?'
+SQL_UPDATE_LABOR_SETTINGS = 'UPDATE LaborSettings SET PerPersonCost = ?, OverheadRate = ?, MarginRate = ? WHERE Id = 1'
+
+# 부품 검색 (한 페이지씩). 검색어가 없으면 이름순, 3글자 미만이면 LIKE, 3글자 이상이면 FTS5 부분 문자열 검색
+SQL_SEARCH_INGREDIENTS_ALL = SQL_SELECT_INGREDIENTS_BASE + ' ORDER BY IngredientName, IngredientID LIMIT ? OFFSET ?'
+SQL_SEARCH_INGREDIENTS_LIKE = SQL_SELECT_INGREDIENTS_BASE + \
+    " WHERE IngredientName LIKE ? ESCAPE '\\' ORDER BY IngredientName, IngredientID LIMIT ? OFFSET ?"
+SQL_SEARCH_INGREDIENTS_MATCH = '''SELECT i.IngredientID, i.IngredientName, i.Price
+                     FROM IngredientSearch s JOIN Ingredients i ON i.IngredientID = s.rowid
+                     WHERE IngredientSearch MATCH ? ORDER BY s.rank, i.IngredientID LIMIT ? OFFSET ?'''
+SQL_SEARCH_INGREDIENTS_ANY = 'SELECT 1 FROM IngredientSearch WHERE IngredientSearch MATCH ? LIMIT 1'
+SQL_HAS_INGREDIENT_SEARCH = "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'IngredientSearch'"
+
+# 저장된 견적서 머리. 금액은 최소 단위 정수, margin_rate/tax_rate 는 bp (gsi_core.money)
+QuoteHeader = namedtuple("QuoteHeader", "quote_id quote_number created_at customer project num_people labor_cost_per_person "
+                                        "total_material_cost total_labor_cost total_cost price_as_of content_hash "
+                                        "margin_rate margin tax_rate tax")
+
+# 부품 검색 한 페이지. rows: (부품 ID, 부품명, 단가), mode: all / substring / fuzzy
+SearchPage = namedtuple("SearchPage", "rows has_more mode")
+
+# since 이후의 변경분. full=True 이면 전체 데이터가 들어 있다 (deletes 는 비어 있음)
+# labor: 인건비 모델이 바뀌었으면 LaborRows, 그대로면 None
+CatalogChanges = namedtuple("CatalogChanges", "revision epoch full menus ingredients menu_ingredients menu_components deletes labor",
+                            defaults=(None,))
+
+# 인건비 모델 전체. settings: (1인당 인건비, 간접비율 bp, 기본 마진율 bp)
+#   roles: (역할 ID, 역할명, 시간당 단가), unit_labor: (유닛 ID, 역할 ID, 유닛 1개당 시간, 준비 시간)
+LaborRows = namedtuple("LaborRows", "settings roles unit_labor")
+
+# 쓰기 트랜잭션을 시작할 때 같은 풀의 다른 쓰기 트랜잭션이 열려 있었으면 잠금 대기로 센다.
+# 다른 프로세스(CLI 가져오기 등)가 잡은 잠금은 보이지 않으므로 BEGIN 이 이보다 오래 걸린 경우도 센다
+# (스레드가 많으면 GIL 전환(5 ms)만으로도 몇 ms 가 걸리므로 그보다 넉넉하게)
+LOCK_WAIT_THRESHOLD = 0.05
+
+# 연결 풀 누적 통계 (ConnectionPool.stats)
+#   transactions: transaction() 횟수, lock_waits / lock_wait_seconds: 그중 잠금을 기다린 횟수와 기다린 시간 합
+#   connection_waits: 풀의 연결이 모두 쓰이고 있어서 반납을 기다린 횟수
+#   busy_errors: timeout 안에 잠금을 얻지 못해 실패한 트랜잭션 수
+PoolStats = namedtuple("PoolStats", "transactions lock_waits lock_wait_seconds connection_waits busy_errors")
+
+
+# 스레드 간에 공유하는 SQLite 연결 풀
+class ConnectionPool:
+    def __init__(self, path, size=8, timeout=30.0, cached_statements=256):
+        self.path = path
+        self.size = size
+        self.timeout = timeout
+        self.cached_statements = cached_statements
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self._created = 0
+        self._closed = False
+        self._stats = dict.fromkeys(PoolStats._fields, 0)
+        self._writers = 0
+
+    def _connect(self):
+        # isolation_level=None: 트랜잭션은 transaction() 에서 직접 시작/종료
+        conn = sqlite3.connect(
+            self.path,
+            timeout=self.timeout,
+            isolation_level=None,
+            check_same_thread=False,
+            cached_statements=self.cached_statements,
+        )
+        for name, value in PRAGMAS.items():
+            conn.execute(f"PRAGMA {name}={value}")
+        return conn
+
+    def _acquire(self):
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._closed:
+                raise sqlite3.ProgrammingError("연결 풀이 이미 닫혔습니다.")
+            if self._created < self.size:
+                self._created += 1
+                try:
+                    return self._connect()
+                except Exception:
+                    self._created -= 1
+                    raise
+            self._stats["connection_waits"] += 1
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise sqlite3.OperationalError(f"{self.timeout}초 안에 사용 가능한 연결이 없습니다.") from None
+
+    def _release(self, conn):
+        if conn.in_transaction:
+            conn.rollback()
+        if self._closed:
+            conn.close()
+        else:
+            self._idle.put(conn)
+
+    # 풀에서 연결을 빌려 쓰고 자동으로 반납.
+    # 재실행을 측정 중이면 연결 대기 시간, 빌려 쓴 동안의 실행 시간과 SQL 문장 수를 기록한다
+    @contextmanager
+    def connection(self):
+        profile = current_profile()
+        if profile is None:
+            conn = self._acquire()
+            try:
+                yield conn
+            finally:
+                self._release(conn)
+            return
+
+        wait_start = time.perf_counter()
+        conn = self._acquire()
+        counter = StatementCounter()
+        conn.set_trace_callback(counter)
+        start = time.perf_counter()
+        try:
+            yield conn
+        finally:
+            conn.set_trace_callback(None)
+            profile.add_sql(counter.count, counter.first, (time.perf_counter() - start) * 1000, (start - wait_start) * 1000)
+            self._release(conn)
+
+    # 쓰기 트랜잭션: 시작 시점에 쓰기 잠금을 잡아서 잠금 승격 중 교착을 피한다
+    @contextmanager
+    def transaction(self, mode="IMMEDIATE"):
+        with self.connection() as conn:
+            writer = mode != "DEFERRED"
+            with self._lock:
+                contended = writer and self._writers > 0
+                self._writers += writer
+            try:
+                start = time.perf_counter()
+                try:
+                    conn.execute(f"BEGIN {mode}")
+                except sqlite3.OperationalError:
+                    self._count(transactions=1, busy_errors=1)
+                    raise
+                waited = time.perf_counter() - start
+                if contended or waited > LOCK_WAIT_THRESHOLD:
+                    self._count(transactions=1, lock_waits=1, lock_wait_seconds=waited)
+                else:
+                    self._count(transactions=1)
+                try:
+                    yield conn
+                except BaseException:
+                    conn.rollback()
+                    raise
+                conn.commit()
+            finally:
+                with self._lock:
+                    self._writers -= writer
+
+    def _count(self, **deltas):
+        with self._lock:
+            for name, delta in deltas.items():
+                self._stats[name] += delta
+
+    def stats(self):
+        with self._lock:
+            return PoolStats(**self._stats)
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+# 유닛/부품 테이블에 대한 데이터 접근 객체
+# 견적번호 앞부분. 기본 DB 는 예전처럼 'GSI', 그 밖의 DB(프로젝트는 projects/<프로젝트>.db)는 'GSI-<파일 이름>'.
+# 순번(QuoteSequences)은 DB 파일마다 따로 세므로 프로젝트를 번호에 넣어야 회사 전체에서 겹치지 않는다
+def quote_prefix(path):
+    if path == ':memory:' or os.path.abspath(path) == os.path.abspath(DB_PATH):
+        return "GSI"
+    return "GSI-" + os.path.splitext(os.path.basename(path))[0]
+
+
+class CatalogRepository:
+    def __init__(self, pool):
+        self.pool = pool
+
+    # 스키마 생성 및 기존 데이터베이스 업그레이드
+    def create_schema(self):
+        with self.pool.connection() as conn:
+            return migrate(conn)
+
+    # 모든 테이블 삭제 (다음 create_schema 에서 처음부터 다시 생성)
+    def drop_schema(self):
+        with self.pool.connection() as conn:
+            conn.execute('PRAGMA foreign_keys=OFF')
+            try:
+                conn.execute('BEGIN IMMEDIATE')
+                tables = [row[0] for row in conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'")]
+                for table in tables:
+                    conn.execute(f'DROP TABLE IF EXISTS "{table}"')
+                conn.execute('PRAGMA user_version=0')
+                conn.commit()
+            finally:
+                if conn.in_transaction:
+                    conn.rollback()
+                conn.execute('PRAGMA foreign_keys=ON')
+
+    def insert_ingredient(self, ingredient_name, price):
+        with self.pool.transaction() as conn:
+            return conn.execute(SQL_INSERT_INGREDIENT, (ingredient_name, price)).lastrowid
+
+    # 유닛과 구성 부품(부품 ID, 수량), 하위 유닛(유닛 ID, 수량)을 한 트랜잭션으로 추가
+    # 새 유닛은 아직 어디에도 들어 있지 않으므로 하위 유닛을 붙여도 순환이 생기지 않는다
+    def insert_menu(self, menu_name, date_submitted, ingredient_quantities=(), component_quantities=()):
+        with self.pool.transaction() as conn:
+            menu_id = conn.execute(SQL_INSERT_MENU, (menu_name, date_submitted)).lastrowid
+            conn.executemany(
+                SQL_INSERT_MENU_INGREDIENT,
+                [(menu_id, ingredient_id, quantity) for ingredient_id, quantity in ingredient_quantities],
+            )
+            conn.executemany(
+                SQL_INSERT_MENU_COMPONENT,
+                [(menu_id, child_id, quantity) for child_id, quantity in component_quantities],
+            )
+            return menu_id
+
+    # 기존 유닛에 하위 유닛을 넣거나 수량을 바꾼다. 순환 구성이면 ValueError
+    def add_component(self, parent_id, child_id, quantity):
+        with self.pool.transaction() as conn:
+            if conn.execute(SQL_SELECT_CREATES_CYCLE, (child_id, parent_id)).fetchone():
+                raise ValueError(f"유닛 {child_id} 은(는) 이미 유닛 {parent_id} 을(를) 포함하고 있어 넣을 수 없습니다.")
+            conn.execute(SQL_UPSERT_MENU_COMPONENT, (parent_id, child_id, quantity))
+
+    # 부품명 검색 결과 중 offset 부터 limit 개.
+    # 3글자 이상이면 부분 문자열로 찾고, 하나도 없으면 글자 3개 묶음(trigram)이 많이 겹치는 순으로
+    # 비슷한 이름을 보여 준다 (오타 허용). 화면에는 한 페이지만 보내므로 부품 수와 상관없이 결과 크기가 일정하다
+    def search_ingredients(self, query, limit=50, offset=0):
+        query = " ".join(query.split())
+        with self.pool.connection() as conn:
+            if not query:
+                return _search_page(conn, "all", SQL_SEARCH_INGREDIENTS_ALL, (), limit, offset)
+            # trigram 색인은 3글자 미만을 찾지 못하고, FTS5 없이 빌드된 SQLite 에는 색인이 없다.
+            # 이때는 이름순으로 훑으면서 LIKE 로 거른다 (한 페이지를 채우면 멈춘다)
+            if len(query) < 3 or not conn.execute(SQL_HAS_INGREDIENT_SEARCH).fetchone():
+                return _search_page(conn, "substring", SQL_SEARCH_INGREDIENTS_LIKE,
+                                    ("%" + _like_escape(query) + "%",), limit, offset)
+            phrase = _fts_string(query)
+            if conn.execute(SQL_SEARCH_INGREDIENTS_ANY, (phrase,)).fetchone():
+                return _search_page(conn, "substring", SQL_SEARCH_INGREDIENTS_MATCH, (phrase,), limit, offset)
+            trigrams = dict.fromkeys(query[i:i + 3].lower() for i in range(len(query) - 2))
+            fuzzy = " OR ".join(_fts_string(trigram) for trigram in trigrams)
+            return _search_page(conn, "fuzzy", SQL_SEARCH_INGREDIENTS_MATCH, (fuzzy,), limit, offset)
+
+    def insert_many(self, menus, ingredients, menu_ingredients):
+        with self.pool.transaction() as conn:
+            conn.executemany(SQL_INSERT_MENU, menus)
+            conn.executemany(SQL_INSERT_INGREDIENT, ingredients)
+            conn.executemany(SQL_INSERT_MENU_INGREDIENT, menu_ingredients)
+
+    # 부품 (이름, 단가) 묶음을 한 트랜잭션으로 반영. 같은 이름이 있으면 단가만 바꾼다
+    # 반환값: (추가 수, 변경 수, 그대로인 수)
+    def upsert_ingredients(self, rows):
+        with self.pool.transaction() as conn:
+            prices = dict(_select_in(conn, 'SELECT IngredientName, Price FROM Ingredients WHERE IngredientName IN ({})',
+                                     {name for name, _ in rows}))
+            inserts, updates, unchanged = [], [], 0
+            for name, price in rows:
+                if name not in prices:
+                    inserts.append((name, price))
+                elif prices[name] != price:
+                    updates.append((price, name))
+                else:
+                    unchanged += 1
+                    continue
+                prices[name] = price
+            conn.executemany(SQL_INSERT_INGREDIENT, inserts)
+            # 파일 안에서 같은 부품이 다시 나오면 뒤의 값이 남도록 추가 → 변경 순서로 실행
+            conn.executemany(SQL_UPDATE_INGREDIENT_PRICE, updates)
+        return len(inserts), len(updates), unchanged
+
+    # 유닛 구성 (유닛명, 부품명, 수량) 묶음을 한 트랜잭션으로 반영. 없는 유닛은 새로 만든다
+    # 반환값: (추가 수, 변경 수, 그대로인 수, 부품을 찾지 못한 행 번호 목록)
+    def upsert_menu_ingredients(self, rows, date_submitted):
+        with self.pool.transaction() as conn:
+            menu_ids = dict(_select_in(
+                conn, 'SELECT MenuName, MIN(MenuID) FROM Menus WHERE MenuName IN ({}) GROUP BY MenuName',
+                {menu_name for menu_name, _, _ in rows}))
+            ingredient_ids = dict(_select_in(
+                conn, 'SELECT IngredientName, MIN(IngredientID) FROM Ingredients WHERE IngredientName IN ({}) GROUP BY IngredientName',
+                {ingredient_name for _, ingredient_name, _ in rows}))
+            # 같은 이름의 유닛이 여러 개면 ID 가 가장 작은 유닛에 반영한다
+            quantities = {
+                (menu_id, ingredient_id): quantity
+                for menu_id, ingredient_id, quantity in _select_in(
+                    conn, 'SELECT MenuID, IngredientID, Quantity FROM MenuIngredients WHERE MenuID IN ({})', menu_ids.values())
+            }
+
+            upserts, missing = [], []
+            inserted = updated = unchanged = 0
+            for i, (menu_name, ingredient_name, quantity) in enumerate(rows):
+                ingredient_id = ingredient_ids.get(ingredient_name)
+                if ingredient_id is None:
+                    missing.append(i)
+                    continue
+                menu_id = menu_ids.get(menu_name)
+                if menu_id is None:
+                    menu_id = menu_ids[menu_name] = conn.execute(SQL_INSERT_MENU, (menu_name, date_submitted)).lastrowid
+                key = (menu_id, ingredient_id)
+                previous = quantities.get(key)
+                if previous == quantity:
+                    unchanged += 1
+                    continue
+                if previous is None:
+                    inserted += 1
+                else:
+                    updated += 1
+                quantities[key] = quantity
+                upserts.append((menu_id, ingredient_id, quantity))
+            conn.executemany(SQL_UPSERT_MENU_INGREDIENT, upserts)
+        return inserted, updated, unchanged, missing
+
+    # 부품 단가를 (부품 ID, 새 단가) 묶음으로 한 트랜잭션에서 바꾼다. 단가 이력은 트리거가 남긴다
+    # 반환값: 실제로 바뀐 (부품 ID, 이전 단가, 새 단가) 목록 (없는 부품과 같은 단가는 빠진다)
+    def update_prices(self, rows):
+        with self.pool.transaction() as conn:
+            rows = dict(rows)
+            previous = dict(_select_in(conn, 'SELECT IngredientID, Price FROM Ingredients WHERE IngredientID IN ({})', rows))
+            changed = [(ingredient_id, previous[ingredient_id], price) for ingredient_id, price in rows.items()
+                       if ingredient_id in previous and previous[ingredient_id] != price]
+            conn.executemany(SQL_UPDATE_INGREDIENT_PRICE_BY_ID, [(price, ingredient_id) for ingredient_id, _, price in changed])
+        return changed
+
+    # 유닛들이 들어 있는 견적 행: (견적 ID, 견적번호, 고객, 과제, 유닛 ID, 수량)
+    def quote_lines_for_menus(self, menu_ids):
+        with self.pool.connection() as conn:
+            return list(_select_in(conn, SQL_SELECT_QUOTE_LINES_FOR_MENUS, menu_ids))
+
+    # 과거 시점의 단가를 이력에 추가 (공급사 단가표 소급 등록 등). 현재 단가(Ingredients.Price)는 바꾸지 않는다
+    # effective_from: 'YYYY-MM-DD' 또는 'YYYY-MM-DD HH:MM:SS' (UTC)
+    def record_price(self, ingredient_id, price, effective_from):
+        with self.pool.transaction() as conn:
+            conn.execute(SQL_INSERT_PRICE_HISTORY, (ingredient_id, normalize_timestamp(effective_from), price))
+
+    # as_of 시점의 부품별 단가 {부품 ID: 단가}. 부품마다 인덱스 범위 조회 한 번 (SQL 한 문장)
+    def prices_as_of(self, as_of):
+        with self.pool.connection() as conn:
+            return dict(conn.execute(SQL_SELECT_PRICES_AS_OF, (normalize_timestamp(as_of, end_of_day=True),)))
+
+    # 단가 이력을 rowid 순서로 조회. epoch 가 같으면 after_rowid 이후에 추가된 행만 읽는다
+    # 반환값: (epoch, 전체를 읽었는지, 행 목록)
+    def fetch_price_history(self, after_rowid=0, epoch=None):
+        with self.pool.transaction(mode="DEFERRED") as conn:
+            current_epoch = conn.execute(SQL_SELECT_STATE).fetchone()[1]
+            full = epoch != current_epoch
+            rows = conn.execute(SQL_SELECT_PRICE_HISTORY_AFTER, (0 if full else after_rowid,)).fetchall()
+        return current_epoch, full, rows
+
+    # 견적서와 유닛별 행(유닛 ID, 유닛명, 수량, 단가, 합계)을 새 견적번호로 저장
+    # totals: money.QuoteTotals (금액은 모두 최소 단위 정수)
+    def save_quote(self, customer, project, num_people, labor_cost_per_person, totals, price_as_of, content_hash, lines):
+        with self.pool.transaction() as conn:
+            period, sequence = conn.execute(SQL_NEXT_QUOTE_SEQUENCE).fetchone()
+            quote_number = f"{quote_prefix(self.pool.path)}-{period}-{sequence:04d}"
+            quote_id = conn.execute(SQL_INSERT_QUOTE, (
+                quote_number, customer, project, num_people, labor_cost_per_person, totals.material, totals.labor,
+                totals.total, price_as_of, content_hash, totals.margin_rate, totals.margin, totals.tax_rate, totals.tax,
+            )).lastrowid
+            conn.executemany(SQL_INSERT_QUOTE_LINE, [(quote_id, line_no, *line) for line_no, line in enumerate(lines, 1)])
+            return QuoteHeader(*conn.execute(SQL_SELECT_QUOTES_BASE + ' WHERE QuoteID = ?', (quote_id,)).fetchone())
+
+    # 같은 내용으로 이미 발행한 견적서 (가장 최근 것)
+    def find_quote(self, content_hash):
+        with self.pool.connection() as conn:
+            row = conn.execute(SQL_SELECT_QUOTE_BY_HASH, (content_hash,)).fetchone()
+        return QuoteHeader(*row) if row else None
+
+    def recent_quotes(self, limit=20):
+        with self.pool.connection() as conn:
+            return [QuoteHeader(*row) for row in conn.execute(SQL_SELECT_RECENT_QUOTES, (limit,))]
+
+    def fetch_quote_lines(self, quote_id):
+        with self.pool.connection() as conn:
+            return conn.execute(SQL_SELECT_QUOTE_LINES, (quote_id,)).fetchall()
+
+    # 세 테이블을 같은 스냅샷에서 읽는다
+    def fetch_all(self):
+        with self.pool.transaction(mode="DEFERRED") as conn:
+            menus = conn.execute(SQL_SELECT_MENUS).fetchall()
+            ingredients = conn.execute(SQL_SELECT_INGREDIENTS).fetchall()
+            menu_ingredients = conn.execute(SQL_SELECT_MENU_INGREDIENTS).fetchall()
+        return menus, ingredients, menu_ingredients
+
+    # since 리비전 이후에 바뀐 행만 조회. epoch 가 다르면(초기화됨) 전체를 돌려준다
+    def fetch_changes(self, since=0, epoch=None):
+        with self.pool.transaction(mode="DEFERRED") as conn:
+            revision, current_epoch = conn.execute(SQL_SELECT_STATE).fetchone()
+            if since > 0 and epoch == current_epoch:
+                if revision == since:
+                    return CatalogChanges(revision, current_epoch, False, [], [], [], [], [])
+                labor = _fetch_labor(conn) if conn.execute(SQL_SELECT_LABOR_REVISION).fetchone()[0] > since else None
+                menus = conn.execute(SQL_SELECT_MENUS_SINCE, (since,)).fetchall()
+                ingredients = conn.execute(SQL_SELECT_INGREDIENTS_SINCE, (since,)).fetchall()
+                menu_ingredients = conn.execute(SQL_SELECT_MENU_INGREDIENTS_SINCE, (since,)).fetchall()
+                menu_components = conn.execute(SQL_SELECT_MENU_COMPONENTS_SINCE, (since,)).fetchall()
+                deletes = conn.execute(SQL_SELECT_DELETES_SINCE, (since,)).fetchall()
+                full = False
+            else:
+                menus = conn.execute(SQL_SELECT_MENUS).fetchall()
+                ingredients = conn.execute(SQL_SELECT_INGREDIENTS).fetchall()
+                menu_ingredients = conn.execute(SQL_SELECT_MENU_INGREDIENTS).fetchall()
+                menu_components = conn.execute(SQL_SELECT_MENU_COMPONENTS).fetchall()
+                deletes = []
+                full = True
+                labor = _fetch_labor(conn)
+        return CatalogChanges(revision, current_epoch, full, menus, ingredients, menu_ingredients, menu_components, deletes,
+                              labor)
+
+    # 작업 역할 추가 또는 시간당 단가 변경 (최소 단위). 역할 ID 를 돌려준다
+    def upsert_labor_role(self, role_name, hourly_rate):
+        with self.pool.transaction() as conn:
+            return conn.execute(SQL_UPSERT_LABOR_ROLE, (role_name, hourly_rate)).fetchone()[0]
+
+    # 유닛의 역할별 작업 시간 (유닛 1개당 시간, 주문당 준비 시간). 둘 다 0 이면 지운다
+    def set_unit_labor(self, menu_id, role_id, hours, setup_hours=0):
+        with self.pool.transaction() as conn:
+            if hours or setup_hours:
+                conn.execute(SQL_UPSERT_UNIT_LABOR, (menu_id, role_id, hours, setup_hours))
+            else:
+                conn.execute(SQL_DELETE_UNIT_LABOR, (menu_id, role_id))
+
+    # per_person_cost: 최소 단위, overhead_rate / margin_rate: bp
+    def update_labor_settings(self, per_person_cost, overhead_rate, margin_rate):
+        with self.pool.transaction() as conn:
+            conn.execute(SQL_UPDATE_LABOR_SETTINGS, (per_person_cost, overhead_rate, margin_rate))
+
+    def fetch_labor(self):
+        with self.pool.transaction(mode="DEFERRED") as conn:
+            return _fetch_labor(conn)
+
+
+def _fetch_labor(conn):
+    return LaborRows(conn.execute(SQL_SELECT_LABOR_SETTINGS).fetchone(), conn.execute(SQL_SELECT_LABOR_ROLES).fetchall(),
+                     conn.execute(SQL_SELECT_UNIT_LABOR).fetchall())
+
+
+# 다음 페이지가 있는지 알려고 한 행 더 읽는다
+def _search_page(conn, mode, sql, params, limit, offset):
+    rows = conn.execute(sql, (*params, limit + 1, offset)).fetchall()
+    return SearchPage(rows[:limit], len(rows) > limit, mode)
+
+
+def _like_escape(text):
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+# FTS5 문자열 토큰 (연산자/특수문자를 그대로 검색)
+def _fts_string(text):
+    return '"' + text.replace('"', '""') + '"'
+
+
+# 날짜/시각을 PriceHistory.EffectiveFrom 과 같은 'YYYY-MM-DD HH:MM:SS' 문자열로 바꾼다
+# 날짜만 주면 그날 시작(end_of_day=True 이면 그날 마지막 초)으로 본다
+def normalize_timestamp(value, end_of_day=False):
+    if isinstance(value, datetime.datetime):
+        return value.strftime("%Y-%m-%d %H:%M:%S")
+    if isinstance(value, datetime.date):
+        value = value.isoformat()
+    value = str(value).strip().replace("T", " ")
+    try:
+        if len(value) == 10:
+            datetime.date.fromisoformat(value)
+            return value + (" 23:59:59" if end_of_day else " 00:00:00")
+        return datetime.datetime.fromisoformat(value[:19]).strftime("%Y-%m-%d %H:%M:%S")
+    except ValueError:
+        raise ValueError(f"날짜 형식이 올바르지 않습니다: {value}") from None
+
+
+# IN (...) 조회를 SQLite 변수 개수 제한 안쪽으로 나눠서 실행
+def _select_in(conn, sql, values, chunk_size=900):
+    values = list(values)
+    for start in range(0, len(values), chunk_size):
+        chunk = values[start:start + chunk_size]
+        yield from conn.execute(sql.format(", ".join("?" * len(chunk))), chunk)
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+_init_locks = {}
+
+
+# 경로별로 하나의 연결 풀을 프로세스 전체에서 공유
+def get_pool(path=None):
+    path = path or DB_PATH
+    with _pools_lock:
+        pool = _pools.get(path)
+        if pool is not None:
+            return pool
+        init_lock = _init_locks.setdefault(path, threading.Lock())
+    # 스키마 업그레이드(v8 재구성 등)는 오래 걸릴 수 있으므로 전역 잠금 밖에서 경로별 잠금으로 한 번만 한다
+    # (다른 데이터베이스를 여는 세션은 기다리지 않는다)
+    with init_lock:
+        with _pools_lock:
+            pool = _pools.get(path)
+        if pool is None:
+            pool = ConnectionPool(path)
+            # 처음 여는 데이터베이스는 최신 스키마로 올린 뒤 사용
+            try:
+                CatalogRepository(pool).create_schema()
+            except BaseException:
+                pool.close()
+                raise
+            with _pools_lock:
+                _pools[path] = pool
+        return pool
+
+
+def get_repository(path=None):
+    return CatalogRepository(get_pool(path))
@@ -0,0 +1,45 @@
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+# 편집기에 보낼 부분 표
+#   frame: 보낼 행 (원본 인덱스 유지), matched: 검색 조건에 맞는 행 수, pages: 페이지 수, page: 실제로 보여 주는 페이지
+EditorWindow = namedtuple("EditorWindow", "frame matched pages page")
+
+
+# 전체 카탈로그 대신 편집기에 보낼 행만 고른다: 이름 검색 결과의 page 번째 묶음 + pinned 행
+# (수량이 있거나 선택된 부품처럼 어느 페이지를 보고 있든 항상 함께 보낼 행).
+# 원래 순서를 유지하므로 수량을 넣은 행이 다른 자리로 튀지 않는다
+def editor_window(df, page=0, page_size=100, query="", active_only=False, pinned=None, name_column="IngredientName"):
+    pinned = np.zeros(len(df), dtype=bool) if pinned is None else np.asarray(pinned, dtype=bool)
+    matched = pinned.copy() if active_only else np.ones(len(df), dtype=bool)
+    if query:
+        matched &= df[name_column].str.contains(query, case=False, regex=False, na=False).to_numpy()
+    positions = np.flatnonzero(matched)
+    pages = max(1, -(-len(positions) // page_size))
+    page = min(max(page, 0), pages - 1)
+
+    visible = pinned.copy()
+    visible[positions[page * page_size:(page + 1) * page_size]] = True
+    frame = df[visible]
+    # 열 스냅샷에서 온 category 이름 열은 보낼 행의 문자열로 푼다
+    # (그대로 보내면 전체 부품명 사전이 함께 전송되고 편집기는 선택 상자 열로 그린다)
+    if isinstance(frame[name_column].dtype, pd.CategoricalDtype):
+        frame = frame.assign(**{name_column: frame[name_column].astype(frame[name_column].cat.categories.dtype)})
+    return EditorWindow(frame, len(positions), pages, page)
+
+
+# 편집기가 돌려준 표를 보낸 표와 비교해서 바뀐 칸만 돌려준다 (전체 표를 다시 합치지 않도록).
+# 반환값: {열: 바뀐 행의 새 값 Series (인덱스는 보낸 표의 인덱스)}. 바뀐 칸이 없는 열은 빠진다
+def changed_cells(window, edited, columns):
+    if edited is None or window.empty:
+        return {}
+    edited = edited.reindex(window.index)
+    changes = {}
+    for column in columns:
+        before, after = window[column], edited[column]
+        diff = ((before != after) & ~(before.isna() & after.isna())).to_numpy()
+        if diff.any():
+            changes[column] = after[diff]
+    return changes
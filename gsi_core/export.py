@@ -0,0 +1,342 @@
+import csv
+import importlib.util
+import io
+from collections import namedtuple
+
+from .money import QUANTITY_SCALE, format_won, from_minor, round_div, to_milli
+
+# openpyxl / reportlab 은 문서를 실제로 만들 때만 불러온다 (가격 계산만 하는 작업에서 import 비용을 내지 않도록)
+
+# 통합문서 모양이 바뀌면 올린다 (저장해 둔 통합문서 캐시를 무효화)
+WORKBOOK_FORMAT_VERSION = 2
+EXCEL_MIME_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+MONEY_FORMAT = '#,##0 원'
+
+# 견적서 한 건을 그리는 데 필요한 값 전체. 행은 모두 목록으로 만들어 두므로 여러 형식을 다른 스레드에서 함께 그려도 된다
+#   materials: (부품 ID, 부품명, 수량, 단가, 합계), selected_menus: (유닛명, 수량, 단가, 합계)
+#   totals: money.QuoteTotals, labor_lines: (항목, 수량, 단위, 단가, 합계). 금액은 모두 최소 단위 정수
+QuoteDocument = namedtuple("QuoteDocument", "materials totals labor_cost_per_person selected_menus num_people customer "
+                                            "project quote_number quote_date labor_lines")
+
+
+# 셀마다 스타일을 따로 만들지 않고 통합문서에 한 번 등록한 이름 있는 스타일을 공유한다
+def _named_styles():
+    from openpyxl.styles import Alignment, Border, Font, NamedStyle, PatternFill, Side
+
+    thin = Side(border_style="thin", color="000000")
+    thick = Side(border_style="thick", color="000000")
+    thin_box = Border(left=thin, right=thin, top=thin, bottom=thin)
+    center = Alignment(horizontal="center", vertical="center")
+    return [
+        NamedStyle("quote_title", font=Font(size=16, bold=True), alignment=Alignment(horizontal="center")),
+        NamedStyle("quote_center", alignment=center),
+        NamedStyle("quote_label", alignment=center, border=Border(bottom=thick)),
+        NamedStyle("quote_value", border=Border(bottom=thick)),
+        NamedStyle("quote_header", font=Font(bold=True, color="FFFFFF"), border=thin_box, alignment=center,
+                   fill=PatternFill(start_color="4F81BD", end_color="4F81BD", fill_type="solid")),
+        NamedStyle("quote_cell", border=thin_box),
+        NamedStyle("quote_cell_center", border=thin_box, alignment=center),
+        NamedStyle("quote_cell_money", border=thin_box, number_format=MONEY_FORMAT),
+    ]
+
+
+# 열마다 스타일이 정해진 셀을 한 번만 만들고 값만 바꿔 가며 행을 쓴다
+# (write-only 시트는 append 시점에 행을 바로 직렬화하므로 같은 셀 객체를 다시 써도 된다)
+class _RowWriter:
+    def __init__(self, ws, styles):
+        from openpyxl.cell import WriteOnlyCell
+
+        self.ws = ws
+        self.cells = [WriteOnlyCell(ws) for _ in styles]
+        for cell, style in zip(self.cells, styles):
+            if style:
+                cell.style = style
+
+    def append(self, values):
+        for cell, value in zip(self.cells, values):
+            cell.value = value
+        self.ws.append(self.cells)
+
+
+def _styled(ws, value, style):
+    from openpyxl.cell import WriteOnlyCell
+
+    cell = WriteOnlyCell(ws, value=value)
+    cell.style = style
+    return cell
+
+
+# bp → "10%", "2.5%"
+def _rate_text(rate_bp):
+    return f"{rate_bp / 100:g}%"
+
+
+# 표제의 머리 부분 (라벨, 값, 오른쪽 라벨, 오른쪽 값). 값이 없는 칸은 None
+def _cover_header(doc):
+    total_text = format_won(doc.totals.total)
+    return [
+        ("견적금액:", total_text, "담당자.", "OOO"),
+        (None, None, None, None),
+        ("1. 인 도 조 건:", "귀사 지정도", "Tel. 041-", ""),
+        ("2. 납         기:", "협의", "Fax. 041-", ""),
+        ("3. 지 불 조 건:", "협의", "Mobile. 010-", ""),
+        ("4. 유 효 기 간:", "견적일로 부터 30일", "Quotation No.", doc.quote_number),
+        ("5. 특 기 사 항:", "", "Quotation Date.", doc.quote_date),
+        ("6. 합 계 금 액:", total_text, "담당자.", "사업자번호."),
+    ]
+
+
+COVER_COLUMNS = ['번호', '유닛명', '수량', '단위', '단가', '합계', '비고']
+
+
+# 표제의 유닛/인건비/마진/부가세 표 행: [번호, 항목, 수량, 단위, 단가, 합계, 비고] (금액은 최소 단위, 단가 없으면 None)
+def _cover_lines(doc):
+    totals = doc.totals
+    lines = [[menu_name, quantity, '단위', unit_price, total] for menu_name, quantity, unit_price, total in doc.selected_menus]
+
+    # 인건비 (인원 수 행 + 인건비 모델의 역할별 작업 시간/간접비 행. 합하면 totals.labor)
+    headcount = totals.labor if not doc.labor_lines else doc.num_people * doc.labor_cost_per_person
+    lines.append(['인건비', doc.num_people, '명', doc.labor_cost_per_person, headcount])
+    lines.extend(list(line) for line in doc.labor_lines)
+
+    # 마진/부가세는 비율이 있을 때만
+    if totals.margin_rate:
+        lines.append(['마진', _rate_text(totals.margin_rate), '', None, totals.margin])
+    if totals.tax_rate:
+        lines.append(['부가세', _rate_text(totals.tax_rate), '', None, totals.tax])
+    return [[number, *line, ""] for number, line in enumerate(lines, 1)]
+
+
+DETAIL_COLUMNS = ['번호', '부품명', '수량', '단위', '단가', '합계']
+
+
+# 세부 시트 아래의 합계 행: (라벨, 금액 문자열)
+def _detail_summary(totals):
+    rows = [('부품 총 비용:', format_won(totals.material)), ('인건비:', format_won(totals.labor))]
+    if totals.margin_rate:
+        rows.append((f'마진 ({_rate_text(totals.margin_rate)}):', format_won(totals.margin)))
+    if totals.tax_rate:
+        rows.append((f'부가세 ({_rate_text(totals.tax_rate)}):', format_won(totals.tax)))
+    rows.append(('전체 총 비용:', format_won(totals.total)))
+    return rows
+
+
+def _won(minor):
+    return None if minor is None else from_minor(minor)
+
+
+def _write_cover_sheet(wb, doc):
+    ws = wb.create_sheet(title="표제")
+
+    # 열 너비 조정
+    for column, width in (('A', 15), ('B', 30), ('C', 6), ('E', 15), ('F', 15), ('G', 20)):
+        ws.column_dimensions[column].width = width
+
+    def center(text):
+        return _styled(ws, text, "quote_center")
+
+    rows = [
+        [_styled(ws, "견적서", "quote_title")],
+        [],
+        [center("고객명:"), doc.customer],
+        [center("PROJECT:"), doc.project],
+        [None, "아래와 같이 견적을 제출 합니다."],
+        [],
+    ]
+    # 견적금액 및 담당자 정보
+    rows += [[_styled(ws, label, "quote_label"), _styled(ws, value, "quote_value"), right_label, right_value]
+             if right_label is not None else [_styled(ws, None, "quote_label"), _styled(ws, None, "quote_value")]
+             for label, value, right_label, right_value in _cover_header(doc)]
+    # 유닛 정보 표 헤더 (16번째 행)
+    rows += [[], [_styled(ws, header, "quote_header") for header in COVER_COLUMNS]]
+    for row in rows:
+        ws.append(row)
+
+    # 유닛/인건비 정보 추가 (금액 셀은 원 단위 값)
+    writer = _RowWriter(ws, ["quote_cell_center", "quote_cell", "quote_cell_center", "quote_cell_center",
+                             "quote_cell_money", "quote_cell_money", "quote_cell"])
+    for number, name, quantity, unit, price, total, note in _cover_lines(doc):
+        writer.append([number, name, quantity, unit, _won(price), from_minor(total), note])
+
+
+def _write_detail_sheet(wb, doc):
+    ws = wb.create_sheet(title="세부")
+
+    # 열 너비 조정
+    for column, width in (('A', 5), ('B', 10), ('E', 15), ('F', 15)):
+        ws.column_dimensions[column].width = width
+
+    # 세부 정보 표 헤더
+    ws.append([_styled(ws, header, "quote_header") for header in DETAIL_COLUMNS])
+
+    # 세부 부품 및 비용 정보 추가
+    writer = _RowWriter(ws, ["quote_cell_center", "quote_cell_center", "quote_cell_center", "quote_cell_center",
+                             "quote_cell_money", "quote_cell_money"])
+    for part_id, name, quantity, price, total in doc.materials:
+        writer.append([part_id, name, quantity, '단위', from_minor(price), from_minor(total)])
+
+    # 합계
+    summary = _RowWriter(ws, ["quote_center"] * 5 + [None])
+    for label, text in _detail_summary(doc.totals):
+        summary.append(['', '', '', '', label, text])
+
+
+# 통합문서를 스트리밍(write-only) 방식으로 만들어 xlsx 바이트로 돌려준다
+def render_xlsx(doc):
+    from openpyxl import Workbook
+
+    wb = Workbook(write_only=True)
+    for style in _named_styles():
+        wb.add_named_style(style)
+
+    _write_cover_sheet(wb, doc)
+    _write_detail_sheet(wb, doc)
+
+    buffer = io.BytesIO()
+    wb.save(buffer)
+    return buffer.getvalue()
+
+
+# 표제/세부를 한 CSV 에 순서대로 쓴다 (빈 줄로 구분, 엑셀에서 바로 열리도록 BOM 포함 UTF-8). 금액은 원 단위
+def render_csv(doc):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(["견적서"])
+    writer.writerow(["고객명", doc.customer])
+    writer.writerow(["PROJECT", doc.project])
+    for label, value, right_label, right_value in _cover_header(doc):
+        if label is not None:
+            writer.writerow([label.rstrip(":"), value, right_label.rstrip("."), right_value])
+    writer.writerow([])
+    writer.writerow(COVER_COLUMNS)
+    for number, name, quantity, unit, price, total, note in _cover_lines(doc):
+        writer.writerow([number, name, quantity, unit, _won(price), from_minor(total), note])
+    writer.writerow([])
+    writer.writerow(DETAIL_COLUMNS)
+    for part_id, name, quantity, price, total in doc.materials:
+        writer.writerow([part_id, name, quantity, '단위', from_minor(price), from_minor(total)])
+    for label, text in _detail_summary(doc.totals):
+        writer.writerow(['', '', '', '', label, text])
+    return buffer.getvalue().encode("utf-8-sig")
+
+
+# 한글은 reportlab 내장 CID 글꼴로 쓴다 (글꼴 파일을 넣지 않아도 되고 PDF 뷰어의 글꼴을 쓴다)
+PDF_FONT = "HYSMyeongJo-Medium"
+# 세부 표를 이 행 수씩 끊어서 만든다 (A4 한 쪽에 들어가는 정도)
+PDF_DETAIL_ROWS = 45
+
+
+# 표제와 세부를 각각 한 쪽부터 시작하는 A4 PDF. 세부 표는 쪽이 넘어가면 머리글을 다시 찍는다
+def render_pdf(doc):
+    from reportlab.lib import colors
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import ParagraphStyle
+    from reportlab.pdfbase import pdfmetrics
+    from reportlab.pdfbase.cidfonts import UnicodeCIDFont
+    from reportlab.platypus import PageBreak, Paragraph, SimpleDocTemplate, Spacer, Table, TableStyle
+
+    if PDF_FONT not in pdfmetrics.getRegisteredFontNames():
+        pdfmetrics.registerFont(UnicodeCIDFont(PDF_FONT))
+    title = ParagraphStyle("quote_title", fontName=PDF_FONT, fontSize=16, alignment=1, spaceAfter=12)
+    text = ParagraphStyle("quote_text", fontName=PDF_FONT, fontSize=9)
+    header_fill = colors.HexColor("#4F81BD")
+
+    def grid(rows, widths, money_columns):
+        table = Table(rows, colWidths=widths, repeatRows=1)
+        table.setStyle(TableStyle([
+            ("FONT", (0, 0), (-1, -1), PDF_FONT, 8),
+            ("GRID", (0, 0), (-1, -1), 0.5, colors.black),
+            ("BACKGROUND", (0, 0), (-1, 0), header_fill),
+            ("TEXTCOLOR", (0, 0), (-1, 0), colors.white),
+            ("ALIGN", (0, 0), (-1, -1), "CENTER"),
+            *[("ALIGN", (column, 1), (column, -1), "RIGHT") for column in money_columns],
+        ]))
+        return table
+
+    def money(minor):
+        return "" if minor is None else format_won(minor)
+
+    story = [Paragraph("견적서", title),
+             Paragraph(f"고객명: {doc.customer}", text), Paragraph(f"PROJECT: {doc.project}", text),
+             Paragraph("아래와 같이 견적을 제출 합니다.", text), Spacer(1, 8)]
+    header = Table([[label or "", value or "", right_label or "", right_value or ""]
+                    for label, value, right_label, right_value in _cover_header(doc)], colWidths=[90, 150, 90, 150])
+    header.setStyle(TableStyle([("FONT", (0, 0), (-1, -1), PDF_FONT, 9),
+                                ("LINEBELOW", (0, 0), (1, -1), 1, colors.black)]))
+    story += [header, Spacer(1, 12)]
+    story.append(grid([COVER_COLUMNS] + [[number, Paragraph(str(name), text), quantity, unit, money(price), money(total), note]
+                                         for number, name, quantity, unit, price, total, note in _cover_lines(doc)],
+                      [30, 170, 40, 35, 75, 85, 60], (4, 5)))
+
+    story.append(PageBreak())
+    # 긴 표 하나를 쪽마다 나누게 하면 나눌 때마다 남은 행 전체를 다시 재므로, 한 쪽 분량씩 따로 만든다
+    detail = [[part_id, name, quantity, '단위', money(price), money(total)]
+              for part_id, name, quantity, price, total in doc.materials]
+    for start in range(0, max(len(detail), 1), PDF_DETAIL_ROWS):
+        story.append(grid([DETAIL_COLUMNS] + detail[start:start + PDF_DETAIL_ROWS], [40, 190, 50, 40, 90, 90], (4, 5)))
+    summary = Table([[label, value] for label, value in _detail_summary(doc.totals)], colWidths=[120, 110], hAlign="RIGHT")
+    summary.setStyle(TableStyle([("FONT", (0, 0), (-1, -1), PDF_FONT, 9), ("ALIGN", (1, 0), (1, -1), "RIGHT")]))
+    story += [Spacer(1, 8), summary]
+
+    buffer = io.BytesIO()
+    SimpleDocTemplate(buffer, pagesize=A4, title=f"견적서 {doc.quote_number}", leftMargin=36, rightMargin=36,
+                      topMargin=36, bottomMargin=36).build(story)
+    return buffer.getvalue()
+
+
+# 내보내기 형식: (그리는 함수, MIME 형식, 확장자, 필요한 모듈)
+EXPORT_FORMATS = {
+    "xlsx": (render_xlsx, EXCEL_MIME_TYPE, ".xlsx", "openpyxl"),
+    "pdf": (render_pdf, "application/pdf", ".pdf", "reportlab"),
+    "csv": (render_csv, "text/csv", ".csv", None),
+}
+
+
+# 이 환경에서 만들 수 있는 형식 (PDF 는 reportlab 이 설치되어 있을 때만)
+def available_formats():
+    return [name for name, (_, _, _, module) in EXPORT_FORMATS.items()
+            if module is None or importlib.util.find_spec(module) is not None]
+
+
+def render(doc, format_name):
+    return EXPORT_FORMATS[format_name][0](doc)
+
+
+# 견적서 통합문서를 xlsx 바이트로 돌려준다
+#   selected_menus: (유닛명, 수량, 단가, 합계) 행들
+#   materials: (부품 ID, 부품명, 수량, 단가, 합계) 행들
+#   totals: money.QuoteTotals. 금액은 모두 최소 단위 정수이고 셀에는 원 단위로 쓴다
+#   labor_lines: 인건비 모델의 (항목, 수량, 단위, 단가, 합계) 행들 (labor.LaborModel.lines)
+def build_quote_workbook(materials, totals, labor_cost_per_person, selected_menus, num_people,
+                         customer="고객명", project="과제명", quote_number="", quote_date="", labor_lines=()):
+    return render_xlsx(QuoteDocument(list(materials), totals, labor_cost_per_person, list(selected_menus), num_people,
+                                     customer, project, quote_number, quote_date, list(labor_lines)))
+
+
+# DataFrame 에서 세부 시트용 행을 꺼낸다 (iterrows 없이 열 단위로)
+def material_rows(materials_df):
+    return zip(*(materials_df[column].tolist() for column in ['ID', 'IngredientName', 'Quantity', 'Price', 'TotalCost']))
+
+
+# 선택한 유닛 DataFrame(ID, MenuName, Price, Quantity, TotalCost) 에서 표제 시트용 행을 꺼낸다
+# 단가(Price) 열이 없으면 합계를 수량으로 나눠서 최소 단위로 반올림한다 (수량이 0 이하면 0)
+def selected_menu_rows(selected_menus_df):
+    names, quantities, totals = (selected_menus_df[column].tolist() for column in ['MenuName', 'Quantity', 'TotalCost'])
+    if 'Price' in selected_menus_df.columns:
+        prices = selected_menus_df['Price'].tolist()
+    else:
+        prices = [_unit_price(total, quantity) for quantity, total in zip(quantities, totals)]
+    return list(zip(names, quantities, prices, totals))
+
+
+def _unit_price(total, quantity):
+    milli = to_milli(quantity)
+    return round_div(int(total) * QUANTITY_SCALE, milli) if milli > 0 else 0
+
+
+# 엑셀 저장 (xlsx 바이트를 돌려준다)
+def save_to_excel(materials_df, totals, labor_cost_per_person, selected_menus_df, num_people,
+                  customer="고객명", project="과제명", quote_number="", quote_date="", labor_lines=()):
+    return build_quote_workbook(material_rows(materials_df), totals, labor_cost_per_person,
+                                selected_menu_rows(selected_menus_df), num_people, customer, project, quote_number, quote_date,
+                                labor_lines)
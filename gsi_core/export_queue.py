@@ -0,0 +1,111 @@
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+# 견적서 내보내기를 화면 스레드 밖에서 실행하는 작업 대기열
+# (환경변수 GSI_EXPORT_WORKERS 로 작업 스레드 수 변경 가능)
+EXPORT_WORKERS = int(os.environ.get("GSI_EXPORT_WORKERS", "3"))
+# 끝난 작업은 이만큼만 결과를 들고 있는다 (오래된 것부터 버림)
+EXPORT_KEEP_JOBS = 100
+
+# 작업 상태 (status 가 돌려주는 복사본)
+#   state: "queued" (아직 아무 형식도 시작 안 함), "running", "done" (모든 형식이 끝남. 실패한 형식은 errors 에)
+#   done/total: 끝난 형식 수 / 전체 형식 수, files: {형식: 바이트}, errors: {형식: 오류 문구}
+#   seconds: 제출부터 지금(끝났으면 끝날 때)까지 걸린 시간
+ExportJob = namedtuple("ExportJob", "job_id state done total files errors seconds")
+
+
+class _Job:
+    def __init__(self, names):
+        self.names = list(names)
+        self.started = 0
+        self.files = {}
+        self.errors = {}
+        self.submitted_at = time.perf_counter()
+        self.finished_at = None
+
+
+# 작업 하나 = 형식별 만드는 함수 묶음 ({형식: build()}). 형식마다 따로 작업 스레드에 넣어서 함께 만든다.
+# 작업 스레드는 Streamlit 세션 상태에 손대지 않으므로 화면은 작업 ID 로 상태만 물어보면 된다
+class ExportQueue:
+    def __init__(self, workers=EXPORT_WORKERS, keep=EXPORT_KEEP_JOBS):
+        self.keep = keep
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="gsi-export")
+        self._jobs = OrderedDict()
+        self._changed = threading.Condition()
+
+    # 작업을 넣고 작업 ID 를 바로 돌려준다
+    def submit(self, tasks):
+        job_id = uuid.uuid4().hex
+        job = _Job(tasks)
+        with self._changed:
+            self._jobs[job_id] = job
+            self._forget_finished()
+        for name, build in tasks.items():
+            self._executor.submit(self._run, job, name, build)
+        return job_id
+
+    def _run(self, job, name, build):
+        with self._changed:
+            job.started += 1
+        try:
+            data = build()
+        except Exception as e:
+            with self._changed:
+                job.errors[name] = f"{type(e).__name__}: {e}"
+        else:
+            with self._changed:
+                job.files[name] = data
+        with self._changed:
+            if len(job.files) + len(job.errors) == len(job.names):
+                job.finished_at = time.perf_counter()
+            self._changed.notify_all()
+
+    # 끝난 작업이 keep 개를 넘으면 오래된 것부터 버린다 (진행 중인 작업은 남긴다)
+    def _forget_finished(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished_at is not None]
+        for job_id in finished[:max(len(finished) - self.keep, 0)]:
+            del self._jobs[job_id]
+
+    def _snapshot(self, job_id, job):
+        done = len(job.files) + len(job.errors)
+        if job.finished_at is not None:
+            state = "done"
+        else:
+            state = "running" if job.started else "queued"
+        end = job.finished_at if job.finished_at is not None else time.perf_counter()
+        return ExportJob(job_id, state, done, len(job.names), dict(job.files), dict(job.errors), end - job.submitted_at)
+
+    # 작업 상태 (모르는 작업 ID 이면 None — 오래돼서 버렸거나 다른 프로세스의 작업)
+    def status(self, job_id):
+        with self._changed:
+            job = self._jobs.get(job_id)
+            return None if job is None else self._snapshot(job_id, job)
+
+    # 작업이 끝날 때까지 (또는 timeout 초까지) 기다렸다가 상태를 돌려준다
+    def wait(self, job_id, timeout=None):
+        with self._changed:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            self._changed.wait_for(lambda: job.finished_at is not None, timeout)
+            return self._snapshot(job_id, job)
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+# 프로세스 전체에서 대기열 하나를 공유 (모든 세션의 내보내기가 같은 작업 스레드를 나눠 쓴다)
+def get_export_queue():
+    global _queue
+    with _queue_lock:
+        if _queue is None:
+            _queue = ExportQueue()
+        return _queue
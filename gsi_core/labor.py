@@ -0,0 +1,86 @@
+from collections import namedtuple
+
+import numpy as np
+
+from .money import apply_rate, milli_amounts, to_milli_array
+
+# 인건비 계산 결과 (금액은 최소 단위). 여러 견적을 한 번에 계산하면 각 필드 앞에 견적 축이 붙는다
+#   hours: 역할별 작업 시간 (준비 시간 포함), costs: 역할별 금액 = 시간 × 시간당 단가
+#   headcount: 인원 수 × 1인당 인건비, overhead: (역할 금액 + 인원 금액) × 간접비율
+#   total: 견적의 인건비 (QuoteTotals.labor)
+LaborCost = namedtuple("LaborCost", "hours costs headcount overhead total")
+
+
+# DB 의 인건비 모델을 카탈로그 엔진의 유닛 순서에 맞춘 행렬로 들고 있다
+#   run_hours: 유닛 1개당 역할별 시간 (유닛 위치 × 역할, 하위 유닛 시간 포함)
+#   setup_hours: 유닛을 주문하면 수량과 상관없이 한 번 드는 역할별 준비 시간 (하위 유닛으로 전파하지 않음)
+# 견적 계산은 주문한 유닛의 행만 골라 행렬 곱 한 번으로 끝난다
+class LaborModel:
+    def __init__(self, role_ids, role_names, hourly_rates, run_hours, setup_hours, per_person_cost=0, overhead_rate=0,
+                 margin_rate=0):
+        self.role_ids = np.asarray(role_ids, dtype=np.int64)
+        self.role_names = list(role_names)
+        self.hourly_rates = np.asarray(hourly_rates, dtype=np.int64)
+        self.run_hours = run_hours
+        self.setup_hours = setup_hours
+        self.per_person_cost = per_person_cost
+        self.overhead_rate = overhead_rate
+        self.margin_rate = margin_rate
+
+    # DB 행(db.LaborRows)과 비용 엔진으로 만든다. 엔진에 없는 유닛/역할의 행은 무시한다
+    @classmethod
+    def from_rows(cls, rows, engine):
+        settings = rows.settings or (0, 0, 0)
+        role_ids = [role_id for role_id, _, _ in rows.roles]
+        run_hours = np.zeros((engine.n_units, len(role_ids)))
+        setup_hours = np.zeros((engine.n_units, len(role_ids)))
+        if rows.unit_labor:
+            menu_ids, unit_role_ids, hours, setups = (np.array(column) for column in zip(*rows.unit_labor))
+            units = engine.unit_positions(menu_ids)
+            roles = np.searchsorted(role_ids, unit_role_ids)
+            valid = (units >= 0) & (roles < len(role_ids))
+            valid[valid] = np.asarray(role_ids)[roles[valid]] == unit_role_ids[valid]
+            run_hours[units[valid], roles[valid]] = hours[valid]
+            setup_hours[units[valid], roles[valid]] = setups[valid]
+        return cls(role_ids, [name for _, name, _ in rows.roles], [rate for _, _, rate in rows.roles],
+                   engine.rollup_units(run_hours), setup_hours, *settings)
+
+    @property
+    def n_roles(self):
+        return len(self.role_ids)
+
+    # 유닛 수량으로 인건비를 계산한다.
+    #   unit_quantities: 유닛 수량 벡터 (유닛 위치 순서) 또는 견적 여러 개의 행렬 (견적 × 유닛)
+    #   units: 주어지면 unit_quantities 의 열이 이 유닛 위치들에 해당한다 (주문한 유닛만 넘길 때)
+    #   num_people: 인원 수 (견적마다 다르면 견적 수 길이의 배열)
+    def evaluate(self, unit_quantities, num_people=0, units=None):
+        quantities = np.asarray(unit_quantities, dtype=float)
+        if units is None:
+            # 수량이 있는 유닛의 행만 곱한다
+            units = np.flatnonzero(quantities.any(axis=0) if quantities.ndim == 2 else quantities)
+            quantities = quantities[..., units]
+        units = np.asarray(units, dtype=np.intp)
+        hours = quantities @ self.run_hours[units] + (quantities > 0) @ self.setup_hours[units]
+        costs = milli_amounts(to_milli_array(hours), self.hourly_rates)
+        headcount = np.asarray(num_people, dtype=np.int64) * self.per_person_cost
+        labor = costs.sum(axis=-1) + headcount
+        overhead = apply_rate(labor, self.overhead_rate)
+        if quantities.ndim == 1:
+            headcount, labor, overhead = int(headcount), int(labor), int(overhead)
+        return LaborCost(hours, costs, headcount, overhead, labor + overhead)
+
+    # 견적서 표제 시트에 넣을 인건비 행: (항목, 수량, 단위, 단가, 합계). 시간이 있는 역할과 간접비
+    # (인원 수 × 1인당 인건비 행은 기존처럼 따로 쓴다)
+    def lines(self, labor_cost):
+        rows = [(f"작업: {name}", round(float(hours), 3), "시간", int(rate), int(cost))
+                for name, hours, rate, cost in zip(self.role_names, labor_cost.hours, self.hourly_rates, labor_cost.costs)
+                if hours]
+        if labor_cost.overhead:
+            rows.append(("간접비", f"{self.overhead_rate / 100:g}%", "", None, labor_cost.overhead))
+        return rows
+
+
+# 역할과 작업 시간이 없는 기본 모델 (인원 수 × 1인당 인건비만)
+def headcount_model(n_units, per_person_cost, overhead_rate=0, margin_rate=0):
+    return LaborModel([], [], [], np.zeros((n_units, 0)), np.zeros((n_units, 0)), per_person_cost, overhead_rate,
+                      margin_rate)
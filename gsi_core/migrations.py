@@ -0,0 +1,352 @@
+import sqlite3
+
+# 스키마 버전은 PRAGMA user_version 에 기록한다.
+# 새 마이그레이션은 MIGRATIONS 끝에 추가만 하고, 이미 배포된 항목은 수정하지 않는다.
+
+
+# v1: 기존 create_database() 와 같은 기본 스키마
+def _v1_base_schema(conn):
+    # Menus 테이블 생성
+    conn.execute('''CREATE TABLE IF NOT EXISTS Menus (
+                    MenuID INTEGER PRIMARY KEY AUTOINCREMENT,
+                    MenuName TEXT NOT NULL,
+                    DateSubmitted TEXT NOT NULL
+                )''')
+
+    # Ingredients 테이블 생성
+    conn.execute('''CREATE TABLE IF NOT EXISTS Ingredients (
+                    IngredientID INTEGER PRIMARY KEY AUTOINCREMENT,
+                    IngredientName TEXT NOT NULL,
+                    Price REAL NOT NULL
+                )''')
+
+    # MenuIngredients 테이블 생성
+    conn.execute('''CREATE TABLE IF NOT EXISTS MenuIngredients (
+                    MenuID INTEGER,
+                    IngredientID INTEGER,
+                    Quantity REAL NOT NULL,
+                    FOREIGN KEY (MenuID) REFERENCES Menus(MenuID),
+                    FOREIGN KEY (IngredientID) REFERENCES Ingredients(IngredientID)
+                )''')
+
+
+# v2: MenuIngredients 복합 기본키, 외래키 CASCADE, 조회용 인덱스
+def _v2_keys_and_indexes(conn):
+    conn.execute('''CREATE TABLE MenuIngredients_new (
+                    MenuID INTEGER NOT NULL REFERENCES Menus(MenuID) ON DELETE CASCADE,
+                    IngredientID INTEGER NOT NULL REFERENCES Ingredients(IngredientID) ON DELETE CASCADE,
+                    Quantity REAL NOT NULL,
+                    PRIMARY KEY (MenuID, IngredientID)
+                )''')
+
+    # 같은 (유닛, 부품) 중복 행은 수량을 합쳐서 옮기고, 부모가 없는 행은 조인에서도 빠지므로 버린다
+    conn.execute('''INSERT INTO MenuIngredients_new (MenuID, IngredientID, Quantity)
+                    SELECT mi.MenuID, mi.IngredientID, SUM(mi.Quantity)
+                    FROM MenuIngredients mi
+                    JOIN Menus m ON mi.MenuID = m.MenuID
+                    JOIN Ingredients i ON mi.IngredientID = i.IngredientID
+                    GROUP BY mi.MenuID, mi.IngredientID
+                    ORDER BY MIN(mi.rowid)''')
+    conn.execute('DROP TABLE MenuIngredients')
+    conn.execute('ALTER TABLE MenuIngredients_new RENAME TO MenuIngredients')
+
+    # 부품 → 유닛 역방향 조회용 커버링 인덱스
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_menuingredients_ingredient ON MenuIngredients (IngredientID, MenuID, Quantity)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_ingredients_name ON Ingredients (IngredientName)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_menus_name ON Menus (MenuName)')
+
+
+# v3: 변경 추적 (전역 리비전 카운터, 행별 Revision, 삭제 기록)
+# 행이 추가/수정/삭제될 때마다 트리거가 카운터를 올리고 그 값을 행(또는 삭제 기록)에 남긴다.
+# Epoch 는 초기화(테이블 재생성) 때마다 새로 만들어지므로, 세션은 Epoch 가 바뀌면 전체를 다시 읽는다.
+_TRACKED_TABLES = [
+    # (테이블, 감시할 열, 삭제 기록의 Key1, Key2)
+    ("Menus", "MenuName, DateSubmitted", "OLD.MenuID", "NULL"),
+    ("Ingredients", "IngredientName, Price", "OLD.IngredientID", "NULL"),
+    ("MenuIngredients", "Quantity", "OLD.MenuID", "OLD.IngredientID"),
+]
+
+
+def _v3_change_tracking(conn):
+    conn.execute('''CREATE TABLE CatalogState (
+                    Id INTEGER PRIMARY KEY CHECK (Id = 1),
+                    Revision INTEGER NOT NULL,
+                    Epoch TEXT NOT NULL
+                )''')
+    conn.execute("INSERT INTO CatalogState (Id, Revision, Epoch) VALUES (1, 1, lower(hex(randomblob(8))))")
+
+    conn.execute('''CREATE TABLE CatalogDeletes (
+                    Revision INTEGER NOT NULL,
+                    TableName TEXT NOT NULL,
+                    Key1 INTEGER NOT NULL,
+                    Key2 INTEGER
+                )''')
+    conn.execute('CREATE INDEX idx_catalogdeletes_revision ON CatalogDeletes (Revision)')
+
+    for table, watched, key1, key2 in _TRACKED_TABLES:
+        _track_changes(conn, table, watched, key1, key2)
+
+
+# 테이블에 Revision 열과 변경 추적 트리거를 붙인다
+def _track_changes(conn, table, watched, key1, key2):
+    # 기존 행은 모두 리비전 1 로 시작
+    conn.execute(f'ALTER TABLE {table} ADD COLUMN Revision INTEGER NOT NULL DEFAULT 1')
+    conn.execute(f'CREATE INDEX idx_{table.lower()}_revision ON {table} (Revision)')
+
+    conn.execute(f'CREATE TRIGGER trg_{table.lower()}_insert AFTER INSERT ON {table} BEGIN {_bump_revision(table)} END')
+    _tracking_update_trigger(conn, table, watched)
+    conn.execute(f'''CREATE TRIGGER trg_{table.lower()}_delete AFTER DELETE ON {table} BEGIN
+                        UPDATE CatalogState SET Revision = Revision + 1;
+                        INSERT INTO CatalogDeletes (Revision, TableName, Key1, Key2)
+                        VALUES ((SELECT Revision FROM CatalogState), '{table}', {key1}, {key2});
+                    END''')
+
+
+# v8 에서 감시 열을 지웠다 다시 만들 때도 같은 트리거를 쓴다
+def _tracking_update_trigger(conn, table, watched):
+    conn.execute(f'CREATE TRIGGER trg_{table.lower()}_update AFTER UPDATE OF {watched} ON {table} BEGIN {_bump_revision(table)} END')
+
+
+def _bump_revision(table):
+    return f'''UPDATE CatalogState SET Revision = Revision + 1;
+               UPDATE {table} SET Revision = (SELECT Revision FROM CatalogState) WHERE rowid = NEW.rowid;'''
+
+
+# v4: 유닛 안에 다른 유닛(하위 조립품)을 넣는 다단계 구성
+# 순환 구성은 트리거 안에서 재귀 CTE 를 쓸 수 없으므로 CatalogRepository.add_component 에서 막는다
+def _v4_subassemblies(conn):
+    conn.execute('''CREATE TABLE MenuComponents (
+                    ParentMenuID INTEGER NOT NULL REFERENCES Menus(MenuID) ON DELETE CASCADE,
+                    ChildMenuID INTEGER NOT NULL REFERENCES Menus(MenuID) ON DELETE CASCADE,
+                    Quantity REAL NOT NULL,
+                    PRIMARY KEY (ParentMenuID, ChildMenuID),
+                    CHECK (ParentMenuID <> ChildMenuID)
+                )''')
+    # 하위 유닛 → 상위 유닛 역방향 조회 (유닛 삭제 시 CASCADE 에도 사용)
+    conn.execute('CREATE INDEX idx_menucomponents_child ON MenuComponents (ChildMenuID, ParentMenuID, Quantity)')
+    _track_changes(conn, "MenuComponents", "Quantity", "OLD.ParentMenuID", "OLD.ChildMenuID")
+
+
+# v5: 추가만 가능한 부품 단가 이력 (시점별 견적 재계산용)
+# Ingredients.Price 는 현재 단가로 그대로 두고, 단가가 들어오거나 바뀔 때마다 트리거가 이력을 남긴다.
+# 시각은 SQLite datetime('now') 형식(UTC, 'YYYY-MM-DD HH:MM:SS')이다.
+def _v5_price_history(conn):
+    conn.execute('''CREATE TABLE PriceHistory (
+                    IngredientID INTEGER NOT NULL REFERENCES Ingredients(IngredientID) ON DELETE CASCADE,
+                    EffectiveFrom TEXT NOT NULL,
+                    Price REAL NOT NULL
+                )''')
+    # (부품, 시작 시각) 범위 조회용 인덱스. 인덱스 끝의 rowid 가 같은 시각 안의 기록 순서가 되도록 Price 는 넣지 않는다
+    conn.execute('CREATE INDEX idx_pricehistory_lookup ON PriceHistory (IngredientID, EffectiveFrom)')
+
+    # 기존 단가는 언제부터였는지 알 수 없으므로 가장 이른 시각부터 유효한 것으로 둔다
+    conn.execute('''INSERT INTO PriceHistory (IngredientID, EffectiveFrom, Price)
+                    SELECT IngredientID, '0001-01-01 00:00:00', Price FROM Ingredients ORDER BY IngredientID''')
+    _price_history_triggers(conn)
+
+
+def _price_history_triggers(conn):
+    conn.execute('''CREATE TRIGGER trg_ingredients_price_insert AFTER INSERT ON Ingredients BEGIN
+                        INSERT INTO PriceHistory (IngredientID, EffectiveFrom, Price) VALUES (NEW.IngredientID, datetime('now'), NEW.Price);
+                    END''')
+    conn.execute('''CREATE TRIGGER trg_ingredients_price_update AFTER UPDATE OF Price ON Ingredients
+                    WHEN NEW.Price IS NOT OLD.Price BEGIN
+                        INSERT INTO PriceHistory (IngredientID, EffectiveFrom, Price) VALUES (NEW.IngredientID, datetime('now'), NEW.Price);
+                    END''')
+
+    # 이력은 고치거나 지울 수 없다 (부품이 삭제될 때의 CASCADE 만 허용)
+    conn.execute('''CREATE TRIGGER trg_pricehistory_update BEFORE UPDATE ON PriceHistory BEGIN
+                        SELECT RAISE(ABORT, '단가 이력은 수정할 수 없습니다.');
+                    END''')
+    conn.execute('''CREATE TRIGGER trg_pricehistory_delete BEFORE DELETE ON PriceHistory
+                    WHEN EXISTS (SELECT 1 FROM Ingredients WHERE IngredientID = OLD.IngredientID) BEGIN
+                        SELECT RAISE(ABORT, '단가 이력은 삭제할 수 없습니다.');
+                    END''')
+
+
+# v6: 발행한 견적서 (머리 + 유닛별 행)와 월별 견적번호 순번
+def _v6_quotes(conn):
+    conn.execute('''CREATE TABLE Quotes (
+                    QuoteID INTEGER PRIMARY KEY AUTOINCREMENT,
+                    QuoteNumber TEXT NOT NULL UNIQUE,
+                    CreatedAt TEXT NOT NULL DEFAULT (datetime('now')),
+                    Customer TEXT NOT NULL,
+                    Project TEXT NOT NULL,
+                    NumPeople INTEGER NOT NULL,
+                    LaborCostPerPerson REAL NOT NULL,
+                    TotalMaterialCost REAL NOT NULL,
+                    TotalLaborCost REAL NOT NULL,
+                    TotalCost REAL NOT NULL,
+                    PriceAsOf TEXT,
+                    ContentHash TEXT NOT NULL
+                )''')
+    conn.execute('CREATE INDEX idx_quotes_contenthash ON Quotes (ContentHash)')
+
+    # 유닛이 나중에 삭제돼도 견적 기록은 남도록 유닛명/금액을 복사해 둔다
+    conn.execute('''CREATE TABLE QuoteLines (
+                    QuoteID INTEGER NOT NULL REFERENCES Quotes(QuoteID) ON DELETE CASCADE,
+                    LineNo INTEGER NOT NULL,
+                    MenuID INTEGER REFERENCES Menus(MenuID) ON DELETE SET NULL,
+                    MenuName TEXT NOT NULL,
+                    Quantity REAL NOT NULL,
+                    UnitPrice REAL NOT NULL,
+                    TotalCost REAL NOT NULL,
+                    PRIMARY KEY (QuoteID, LineNo)
+                )''')
+    conn.execute('CREATE INDEX idx_quotelines_menu ON QuoteLines (MenuID)')
+
+    conn.execute('''CREATE TABLE QuoteSequences (
+                    Period TEXT PRIMARY KEY,
+                    LastValue INTEGER NOT NULL
+                )''')
+
+
+# v7: 부품명 전문 검색 (FTS5 trigram). Ingredients 를 원본으로 쓰는 외부 콘텐츠 색인이라 이름을 두 번 저장하지 않는다
+# trigram 토크나이저는 대소문자 구분 없이 부분 문자열로 찾으므로 "stm" 으로 "STM32F103" 을 찾는다.
+# FTS5 없이 빌드된 SQLite 에서는 색인을 만들지 않고, 검색은 LIKE 로 대신한다 (CatalogRepository.search_ingredients)
+def _v7_ingredient_search(conn):
+    try:
+        conn.execute('''CREATE VIRTUAL TABLE IngredientSearch USING fts5(
+                        IngredientName, content='Ingredients', content_rowid='IngredientID', tokenize='trigram'
+                    )''')
+    except sqlite3.OperationalError as e:
+        if "fts5" not in str(e) and "trigram" not in str(e):
+            raise
+        return
+    conn.execute("INSERT INTO IngredientSearch (IngredientSearch) VALUES ('rebuild')")
+    conn.execute('''CREATE TRIGGER trg_ingredientsearch_insert AFTER INSERT ON Ingredients BEGIN
+                        INSERT INTO IngredientSearch (rowid, IngredientName) VALUES (NEW.IngredientID, NEW.IngredientName);
+                    END''')
+    conn.execute('''CREATE TRIGGER trg_ingredientsearch_delete AFTER DELETE ON Ingredients BEGIN
+                        INSERT INTO IngredientSearch (IngredientSearch, rowid, IngredientName)
+                        VALUES ('delete', OLD.IngredientID, OLD.IngredientName);
+                    END''')
+    conn.execute('''CREATE TRIGGER trg_ingredientsearch_update AFTER UPDATE OF IngredientName ON Ingredients BEGIN
+                        INSERT INTO IngredientSearch (IngredientSearch, rowid, IngredientName)
+                        VALUES ('delete', OLD.IngredientID, OLD.IngredientName);
+                        INSERT INTO IngredientSearch (rowid, IngredientName) VALUES (NEW.IngredientID, NEW.IngredientName);
+                    END''')
+
+
+# v8: 금액을 원 단위 REAL 에서 1/100 원 단위 INTEGER 로 (gsi_core.money)
+# 열 형식은 바꿀 수 없으므로 정수 열을 추가해서 채운 뒤 기존 열을 지우고 이름을 바꾼다.
+# 지울 열을 참조하는 트리거는 먼저 지우고 마지막에 다시 만든다. 새 열은 정수만 받는다 (CHECK).
+# 값이 바뀌었으므로 Epoch 를 새로 만들어 실행 중인 캐시가 전체를 다시 읽게 한다
+_MONEY_COLUMNS = [
+    ("Ingredients", "Price"),
+    ("PriceHistory", "Price"),
+    ("Quotes", "LaborCostPerPerson"),
+    ("Quotes", "TotalMaterialCost"),
+    ("Quotes", "TotalLaborCost"),
+    ("Quotes", "TotalCost"),
+    ("QuoteLines", "UnitPrice"),
+    ("QuoteLines", "TotalCost"),
+]
+
+
+def _v8_integer_money(conn):
+    for trigger in ("trg_ingredients_update", "trg_ingredients_price_insert", "trg_ingredients_price_update",
+                    "trg_pricehistory_update", "trg_pricehistory_delete"):
+        conn.execute(f'DROP TRIGGER {trigger}')
+
+    for table, column in _MONEY_COLUMNS:
+        conn.execute(f'''ALTER TABLE {table} ADD COLUMN {column}Minor INTEGER NOT NULL DEFAULT 0
+                        CHECK (typeof({column}Minor) = 'integer')''')
+        # 곱셈 오차(34.999…)는 소수 6자리에서 먼저 정리하고, round() 는 0 에서 먼 쪽으로 반올림한다
+        conn.execute(f'UPDATE {table} SET {column}Minor = CAST(round(round({column} * 100, 6)) AS INTEGER)')
+        conn.execute(f'ALTER TABLE {table} DROP COLUMN {column}')
+        conn.execute(f'ALTER TABLE {table} RENAME COLUMN {column}Minor TO {column}')
+
+    # 견적서 마진/부가세 줄 (비율은 bp, 금액은 최소 단위)
+    for column in ("MarginRate", "Margin", "TaxRate", "Tax"):
+        conn.execute(f'''ALTER TABLE Quotes ADD COLUMN {column} INTEGER NOT NULL DEFAULT 0
+                        CHECK (typeof({column}) = 'integer')''')
+
+    _tracking_update_trigger(conn, *_TRACKED_TABLES[1][:2])
+    _price_history_triggers(conn)
+    conn.execute("UPDATE CatalogState SET Epoch = lower(hex(randomblob(8)))")
+
+
+# v9: DB 에 두는 인건비/간접비 모델
+#   LaborRoles: 작업 역할별 시간당 단가 (최소 단위)
+#   UnitLabor: 유닛 1개당 역할별 작업 시간과, 유닛을 주문하면 한 번 드는 준비(셋업) 시간
+#   LaborSettings: 1인당 인건비(기존 인원 수 방식), 간접비율과 기본 마진율 (bp)
+# 세 테이블이 바뀌면 카탈로그 리비전을 올리고 LaborRevision 에 그 값을 남긴다.
+# 행 수가 적으므로 변경분을 따로 추적하지 않고 LaborRevision 이 바뀌면 전부 다시 읽는다
+_LABOR_TABLES = ["LaborRoles", "UnitLabor", "LaborSettings"]
+
+
+def _v9_labor_model(conn):
+    conn.execute('''CREATE TABLE LaborRoles (
+                    RoleID INTEGER PRIMARY KEY AUTOINCREMENT,
+                    RoleName TEXT NOT NULL UNIQUE,
+                    HourlyRate INTEGER NOT NULL CHECK (typeof(HourlyRate) = 'integer' AND HourlyRate >= 0)
+                )''')
+    conn.execute('''CREATE TABLE UnitLabor (
+                    MenuID INTEGER NOT NULL REFERENCES Menus(MenuID) ON DELETE CASCADE,
+                    RoleID INTEGER NOT NULL REFERENCES LaborRoles(RoleID) ON DELETE CASCADE,
+                    Hours REAL NOT NULL DEFAULT 0 CHECK (Hours >= 0),
+                    SetupHours REAL NOT NULL DEFAULT 0 CHECK (SetupHours >= 0),
+                    PRIMARY KEY (MenuID, RoleID)
+                )''')
+    # 역할 삭제 시 CASCADE 용
+    conn.execute('CREATE INDEX idx_unitlabor_role ON UnitLabor (RoleID)')
+    conn.execute('''CREATE TABLE LaborSettings (
+                    Id INTEGER PRIMARY KEY CHECK (Id = 1),
+                    PerPersonCost INTEGER NOT NULL CHECK (typeof(PerPersonCost) = 'integer'),
+                    OverheadRate INTEGER NOT NULL DEFAULT 0 CHECK (typeof(OverheadRate) = 'integer'),
+                    MarginRate INTEGER NOT NULL DEFAULT 0 CHECK (typeof(MarginRate) = 'integer')
+                )''')
+    # 기존 1인당 인건비 10,000 원
+    conn.execute('INSERT INTO LaborSettings (Id, PerPersonCost) VALUES (1, 1000000)')
+
+    conn.execute('ALTER TABLE CatalogState ADD COLUMN LaborRevision INTEGER NOT NULL DEFAULT 1')
+    bump = 'UPDATE CatalogState SET Revision = Revision + 1, LaborRevision = Revision + 1;'
+    for table in _LABOR_TABLES:
+        for event in ("INSERT", "UPDATE", "DELETE"):
+            conn.execute(f'CREATE TRIGGER trg_{table.lower()}_{event.lower()} AFTER {event} ON {table} BEGIN {bump} END')
+
+
+MIGRATIONS = [
+    _v1_base_schema,
+    _v2_keys_and_indexes,
+    _v3_change_tracking,
+    _v4_subassemblies,
+    _v5_price_history,
+    _v6_quotes,
+    _v7_ingredient_search,
+    _v8_integer_money,
+    _v9_labor_model,
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def get_version(conn):
+    return conn.execute('PRAGMA user_version').fetchone()[0]
+
+
+# 데이터베이스를 최신 스키마로 올린다 (autocommit 연결에서 호출)
+def migrate(conn):
+    # 테이블 재생성 중에는 외래키 검사를 끄고, 커밋 전에 foreign_key_check 로 확인한다
+    conn.execute('PRAGMA foreign_keys=OFF')
+    try:
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            # 다른 프로세스가 먼저 올렸을 수 있으므로 잠금을 잡은 뒤 버전을 읽는다
+            version = get_version(conn)
+            if version > SCHEMA_VERSION:
+                raise sqlite3.DatabaseError(f"데이터베이스 스키마 버전({version})이 프로그램({SCHEMA_VERSION})보다 높습니다.")
+            for target, migration in enumerate(MIGRATIONS[version:], start=version + 1):
+                migration(conn)
+                conn.execute(f'PRAGMA user_version={target}')
+            violations = conn.execute('PRAGMA foreign_key_check').fetchall()
+            if violations:
+                raise sqlite3.IntegrityError(f"외래키 위반 {len(violations)}건: {violations[:5]}")
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+        return get_version(conn)
+    finally:
+        conn.execute('PRAGMA foreign_keys=ON')
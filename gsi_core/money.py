@@ -0,0 +1,143 @@
+from collections import namedtuple
+from decimal import ROUND_HALF_UP, Decimal
+
+# 금액은 원 단위 실수 대신 1/100 원 단위 정수("최소 단위")로 저장하고 계산한다.
+#   DB: Ingredients.Price, PriceHistory.Price, Quotes/QuoteLines 의 금액 열은 모두 INTEGER 최소 단위
+#   계산: 비용 엔진과 견적 상태는 int64 배열 / 파이썬 정수로만 더한다 (합계에 부동소수점 오차가 없다)
+#   화면/엑셀: from_minor, format_won 으로 바꿔서 보여 준다
+#
+# 반올림 규칙 (모두 0 에서 먼 쪽으로 반올림):
+#   1. 원 단위 입력(단가표, 입력 양식)은 최소 단위로 반올림해서 저장한다
+#   2. 수량은 1/1000 단위로 반올림한 뒤 단가를 곱한다 (수량 × 단가는 정수 곱셈)
+#   3. 줄 금액 = 수량 × 단가 를 최소 단위로 반올림. 합계는 반올림된 줄 금액의 합이다.
+#      견적 부품비는 유닛 줄 금액과 직접 추가한 부품 줄 금액의 합이다. 세부 시트의 부품별 금액은
+#      부품마다 따로 반올림하므로 그 합은 부품비와 최소 단위 몇 개만큼 다를 수 있다
+#   4. 마진 = 소계 × 마진율, 부가세 = (소계 + 마진) × 세율 을 각각 최소 단위로 반올림한다
+# numpy 는 배열을 다루는 함수에서만 불러온다 (인건비 계산처럼 가벼운 import 를 위해)
+
+MONEY_SCALE = 100
+QUANTITY_SCALE = 1000
+# 세율/마진율 단위 (1 bp = 0.01%)
+RATE_SCALE = 10000
+
+_INT64_MAX = 2 ** 63 - 1
+
+# 견적 합계 (모두 최소 단위 정수, 비율은 bp). 배치/시나리오 계산에서는 각 필드가 배열일 수도 있다
+QuoteTotals = namedtuple("QuoteTotals", "material labor subtotal margin_rate margin tax_rate tax total")
+
+
+def _scaled(value, scale):
+    return int((Decimal(str(value)) * scale).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+
+# 원 단위 값 → 최소 단위 정수 (10진 문자열 기준으로 반올림하므로 0.35 → 35 처럼 입력한 그대로 바뀐다)
+def to_minor(won):
+    return _scaled(won, MONEY_SCALE)
+
+
+# 수량 → 1/1000 단위 정수
+def to_milli(quantity):
+    if isinstance(quantity, int):
+        return quantity * QUANTITY_SCALE
+    return _scaled(quantity, QUANTITY_SCALE)
+
+
+# 원 단위 배열 → 최소 단위 int64 배열 (곱셈 오차로 생긴 34.999999… 같은 값은 10^-6 에서 먼저 정리)
+def to_minor_array(won):
+    return _round_array(won, MONEY_SCALE)
+
+
+def to_milli_array(quantities):
+    return _round_array(quantities, QUANTITY_SCALE)
+
+
+def _round_array(values, scale):
+    import numpy as np
+
+    values = np.asarray(values)
+    if values.dtype.kind in "iu":
+        return values.astype(np.int64) * scale
+    scaled = np.round(values.astype(float) * scale, 6)
+    return (np.sign(scaled) * np.floor(np.abs(scaled) + 0.5)).astype(np.int64)
+
+
+# 최소 단위 → 원 (화면 표시, 엑셀 셀 값). 정수와 배열 모두 받는다
+def from_minor(minor):
+    return minor / MONEY_SCALE
+
+
+# 최소 단위 금액을 "1,234 원" / "1,234.5 원" 형식으로 (실수를 거치지 않아 반올림 흔적이 없다)
+def format_won(minor):
+    minor = int(minor)
+    sign = "-" if minor < 0 else ""
+    won, cents = divmod(abs(minor), MONEY_SCALE)
+    text = f"{sign}{won:,}"
+    if cents:
+        text += f".{cents:02d}".rstrip("0")
+    return f"{text} 원"
+
+
+# 정수 나눗셈 반올림 (0 에서 먼 쪽, denominator > 0)
+def round_div(numerator, denominator):
+    quotient = (abs(numerator) + denominator // 2) // denominator
+    return -quotient if numerator < 0 else quotient
+
+
+def round_div_array(numerator, denominator):
+    import numpy as np
+
+    quotient = (np.abs(numerator) + denominator // 2) // denominator
+    return np.where(numerator < 0, -quotient, quotient)
+
+
+# 줄 금액 = 수량 × 단가 (단가는 최소 단위). 정수면 파이썬 정수, 배열이면 int64 배열
+def amount(quantity, price):
+    return round_div(to_milli(quantity) * int(price), QUANTITY_SCALE)
+
+
+def amounts(quantities, prices):
+    return milli_amounts(to_milli_array(quantities), as_minor_array(prices))
+
+
+# 이미 1/1000 단위로 바꿔 둔 수량 배열 × 단가 배열 (비용 엔진은 BOM 수량을 한 번만 바꿔 둔다)
+def milli_amounts(milli, prices):
+    check_product(milli, prices)
+    return round_div_array(milli * prices, QUANTITY_SCALE)
+
+
+# 단가 배열을 int64 로. 원 단위 실수 배열이 잘못 넘어오면 소수점이 잘려 나가므로 거부한다
+def as_minor_array(prices):
+    import numpy as np
+
+    prices = np.asarray(prices)
+    if prices.dtype.kind == "f":
+        raise TypeError("단가는 최소 단위 정수 배열이어야 합니다 (money.to_minor_array 로 바꾸세요).")
+    return prices.astype(np.int64, copy=False)
+
+
+# int64 곱셈이 넘치지 않는지 미리 확인 (넘치면 조용히 틀린 값이 나오므로)
+def check_product(left, right):
+    if left.size and right.size:
+        bound = int(abs(left).max()) * int(abs(right).max())
+        if bound > _INT64_MAX:
+            raise OverflowError(f"금액 계산이 int64 범위를 넘습니다 (최대 {bound:,}).")
+
+
+# 금액 × 비율(bp) 을 최소 단위로 반올림. 정수와 배열 모두 받는다
+def apply_rate(amount_minor, rate_bp):
+    if hasattr(amount_minor, "shape"):
+        return round_div_array(amount_minor * rate_bp, RATE_SCALE)
+    return round_div(int(amount_minor) * int(rate_bp), RATE_SCALE)
+
+
+# 퍼센트(예: 10, 2.5) → bp 정수
+def percent_to_bp(percent):
+    return _scaled(percent, 100)
+
+
+# 부품비 + 인건비에 마진과 부가세를 더한 합계. 여러 견적을 한 번에 계산할 때는 배열을 넘긴다
+def quote_totals(material, labor, margin_rate=0, tax_rate=0):
+    subtotal = material + labor
+    margin = apply_rate(subtotal, margin_rate)
+    tax = apply_rate(subtotal + margin, tax_rate)
+    return QuoteTotals(material, labor, subtotal, margin_rate, margin, tax_rate, tax, subtotal + margin + tax)
@@ -0,0 +1,105 @@
+import threading
+
+import numpy as np
+
+from .db import get_repository, normalize_timestamp
+
+
+# 단가 이력 전체를 메모리에 올려 두고 시점별 단가를 벡터 연산으로 찾는다
+#
+# 단가는 최소 단위 int64 (gsi_core.money).
+# 항목은 (부품 ID, 시작 시각, 기록 순서)로 정렬해서 하나의 정수 키로 이어 붙인다.
+# 어떤 시점의 부품별 단가는 키 배열에서 np.searchsorted 한 번으로 찾으므로,
+# 과거 견적 수천 건을 다시 계산해도 부품마다 쿼리를 보내지 않는다.
+class PriceHistory:
+    # rows: (rowid, 부품 ID, 시작 시각 문자열, 단가)
+    def __init__(self, rows=()):
+        rows = list(rows)
+        self._build(
+            np.array([row[0] for row in rows], dtype=np.int64),
+            np.array([row[1] for row in rows], dtype=np.int64),
+            _seconds([row[2] for row in rows]),
+            np.array([row[3] for row in rows], dtype=np.int64),
+        )
+
+    def _build(self, rowids, ingredient_ids, times, prices):
+        order = np.lexsort((rowids, times, ingredient_ids))
+        self.rowids = rowids[order]
+        self.last_rowid = int(rowids.max()) if len(rowids) else 0
+        self.ingredient_ids = ingredient_ids[order]
+        self.times = times[order]
+        self.prices = prices[order]
+
+        # 부품별 구간을 겹치지 않게 이어 붙인 키: 부품 순번 × 폭 + (시각 - 최소 시각)
+        self._ids, self._groups = np.unique(self.ingredient_ids, return_inverse=True)
+        self._t0 = self.times.min() if len(self.times) else 0
+        self._span = (self.times.max() - self._t0 + 2) if len(self.times) else 1
+        self._keys = self._groups * self._span + (self.times - self._t0)
+        # 부품별 첫 항목 위치 (그 시점에 아직 없던 부품은 가장 이른 단가를 쓴다)
+        self._first = np.searchsorted(self._groups, np.arange(len(self._ids)))
+
+    def __len__(self):
+        return len(self.prices)
+
+    # 새로 추가된 이력 행을 합친 새 객체 (이력은 추가만 되므로 기존 행은 그대로)
+    def extend(self, rows):
+        if not rows:
+            return self
+        added = PriceHistory(rows)
+        history = PriceHistory.__new__(PriceHistory)
+        history._build(*(np.concatenate([getattr(self, name), getattr(added, name)])
+                         for name in ("rowids", "ingredient_ids", "times", "prices")))
+        return history
+
+    # as_of 시점의 단가 (ingredient_ids 순서). 이력이 없는 부품은 fallback (없으면 0)
+    # 그 시점보다 나중에 등록된 부품은 가장 이른 단가를 쓴다
+    def prices_as_of(self, as_of, ingredient_ids, fallback=None):
+        ingredient_ids = np.asarray(ingredient_ids, dtype=np.int64)
+        result = np.zeros(len(ingredient_ids), dtype=np.int64) if fallback is None else np.array(fallback, dtype=np.int64)
+        if not len(self._ids):
+            return result
+        group = np.searchsorted(self._ids, ingredient_ids)
+        known = (group < len(self._ids)) & (self._ids[np.minimum(group, len(self._ids) - 1)] == ingredient_ids)
+        group = group[known]
+
+        offset = np.clip(_seconds([normalize_timestamp(as_of, end_of_day=True)])[0] - self._t0, -1, self._span - 1)
+        found = np.searchsorted(self._keys, group * self._span + offset, side="right") - 1
+        # 찾은 항목이 다른 부품이면 그 시점 이전 이력이 없는 것
+        before = (found < 0) | (self._groups[np.maximum(found, 0)] != group)
+        found[before] = self._first[group[before]]
+        result[known] = self.prices[found]
+        return result
+
+
+def _seconds(timestamps):
+    return np.array(timestamps, dtype="datetime64[s]").astype(np.int64)
+
+
+# 데이터베이스의 단가 이력을 프로세스 안에서 공유. 새로 추가된 행만 읽어서 합친다
+class PriceHistoryCache:
+    def __init__(self, repo):
+        self.repo = repo
+        self._lock = threading.Lock()
+        self._epoch = None
+        self._history = PriceHistory()
+
+    def get(self):
+        with self._lock:
+            epoch, full, rows = self.repo.fetch_price_history(self._history.last_rowid, self._epoch)
+            # 초기화로 Epoch 가 바뀌면 rowid 가 다시 시작되므로 처음부터 만든다
+            self._history = PriceHistory(rows) if full else self._history.extend(rows)
+            self._epoch = epoch
+            return self._history
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def get_price_history(path=None):
+    repo = get_repository(path)
+    with _caches_lock:
+        cache = _caches.get(repo.pool.path)
+        if cache is None:
+            cache = _caches[repo.pool.path] = PriceHistoryCache(repo)
+    return cache.get()
@@ -0,0 +1,91 @@
+from collections import namedtuple
+
+from .money import MONEY_SCALE, amounts, quote_totals
+
+# numpy/pandas 는 price_units 에서만 불러온다 (인건비 등 단순 계산은 가볍게 import 할 수 있도록)
+# 금액은 모두 최소 단위 정수 (gsi_core.money)
+
+# 1인당 인건비 (10,000 원)
+LABOR_COST_PER_PERSON = 10000 * MONEY_SCALE
+
+# 견적 계산 결과
+#   selected_menus_df: ID, MenuName, Price, Quantity, TotalCost (선택한 유닛별)
+#   materials_df: ID, IngredientName, Price, Quantity, TotalCost (부품별)
+#   totals: money.QuoteTotals (부품비, 인건비, 마진, 부가세, 합계)
+#   labor_lines: 인건비 모델의 역할별/간접비 행 (LaborModel.lines, 모델 없이 계산하면 비어 있음)
+Quote = namedtuple("Quote", "selected_menus_df materials_df totals labor_cost_per_person num_people labor_lines")
+
+
+def calculate_material_costs(df):
+    return int(df["TotalCost"].sum()) if "TotalCost" in df.columns else 0
+
+
+def calculate_labor_cost(num_people, labor_cost_per_person=LABOR_COST_PER_PERSON):
+    return num_people * labor_cost_per_person
+
+
+# 유닛별 수량({유닛명: 수량})으로 견적을 계산한다 (Streamlit 없이 배치에서 사용)
+# all_parts=False 이면 세부 부품 목록에는 필요 수량이 있는 부품만 남긴다
+# prices 를 주면 (예: 과거 시점 단가) ingredient_df 의 현재 단가 대신 사용한다 (ingredient_df 행 순서, 최소 단위)
+# margin_rate, tax_rate: bp (money.percent_to_bp)
+# labor: labor.LaborModel 을 주면 유닛별 작업 시간과 간접비까지 인건비에 넣는다 (없으면 인원 수 × 1인당 인건비)
+def price_units(menu_df, ingredient_df, engine, unit_quantities, num_people, all_parts=False, prices=None,
+                margin_rate=0, tax_rate=0, labor=None):
+    import numpy as np
+    import pandas as pd
+
+    # 같은 이름의 유닛이 여러 개면 화면의 유닛 선택과 같이 첫 번째 유닛을 쓴다
+    by_name = pd.Series(np.arange(len(menu_df)), index=menu_df["MenuName"].to_numpy())
+    by_name = by_name[~by_name.index.duplicated()]
+    found = by_name.reindex(list(unit_quantities))
+    if found.isna().any():
+        raise ValueError(f"알 수 없는 유닛: {', '.join(map(str, found.index[found.isna()]))}")
+    positions = found.to_numpy(dtype=int)
+
+    quantities = np.zeros(len(menu_df))
+    quantities[positions] = list(unit_quantities.values())
+    prices = ingredient_df["Price"].to_numpy() if prices is None else np.asarray(prices)
+    unit_costs = engine.unit_costs(quantities, prices)
+    part_quantities, part_costs = engine.part_rollup(quantities, prices)
+
+    selected_menus_df = pd.DataFrame({
+        "ID": menu_df["ID"].to_numpy()[positions],
+        "MenuName": list(unit_quantities),
+        "Price": engine.unit_prices(prices)[positions],
+        "Quantity": list(unit_quantities.values()),
+        "TotalCost": unit_costs[positions],
+    })
+    materials_df = ingredient_df[["ID", "IngredientName"]].assign(Price=prices, Quantity=part_quantities, TotalCost=part_costs)
+    if not all_parts:
+        materials_df = materials_df[part_quantities != 0]
+
+    if labor is None:
+        labor_total, labor_cost_per_person, labor_lines = calculate_labor_cost(num_people), LABOR_COST_PER_PERSON, []
+    else:
+        labor_cost = labor.evaluate(quantities[positions], num_people, units=positions)
+        labor_total, labor_cost_per_person, labor_lines = labor_cost.total, labor.per_person_cost, labor.lines(labor_cost)
+
+    # 부품비는 화면 견적과 같이 유닛 줄 금액의 합 (money 의 반올림 규칙 3)
+    totals = quote_totals(int(unit_costs[positions].sum()), labor_total, margin_rate, tax_rate)
+    return Quote(selected_menus_df, materials_df, totals, labor_cost_per_person, num_people, labor_lines)
+
+
+# 견적 여러 건의 합계만 한 번에 계산한다 (엑셀 없이 수천 건의 시나리오를 비교할 때)
+#   unit_quantities: 견적 × 유닛 위치 수량 행렬, units 를 주면 열이 그 유닛 위치들에 해당한다
+#   num_people: 견적별 인원 수 (정수 하나면 모든 견적에 같게)
+# 부품비는 price_units 와 같이 유닛 줄 금액의 합이고, 결과 QuoteTotals 의 금액 필드는 견적 수 길이의 int64 배열
+def price_scenarios(engine, unit_quantities, prices, num_people=0, labor=None, margin_rate=0, tax_rate=0, units=None):
+    import numpy as np
+
+    quantities = np.atleast_2d(np.asarray(unit_quantities, dtype=float))
+    unit_prices = engine.unit_prices(prices)
+    if units is not None:
+        unit_prices = unit_prices[units]
+    material = amounts(quantities, unit_prices).sum(axis=1)
+    if labor is None:
+        labor_total = np.broadcast_to(np.asarray(num_people, dtype=np.int64) * LABOR_COST_PER_PERSON, material.shape)
+    else:
+        if units is None:
+            units = np.arange(engine.n_units)
+        labor_total = np.broadcast_to(labor.evaluate(quantities, num_people, units=units).total, material.shape)
+    return quote_totals(material, labor_total, margin_rate, tax_rate)
@@ -0,0 +1,172 @@
+import argparse
+import contextvars
+import json
+import math
+import os
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+# 사용법: python -m gsi_core.profiling profile.jsonl --last 1000
+
+# Streamlit 재실행 한 번의 구간별 소요 시간, SQL 실행 횟수/시간, DataFrame 크기를 잰다.
+# 켜져 있지 않으면(현재 측정 중인 재실행이 없으면) span() 과 SQL 기록은 아무것도 하지 않는다.
+# GSI_PROFILE_LOG 를 지정하면 모든 세션의 재실행 기록을 JSON 한 줄씩 그 파일에 덧붙인다.
+PROFILE_LOG = os.environ.get("GSI_PROFILE_LOG") or None
+
+# 재실행마다 스크립트 스레드에서 바꿔 끼우는 현재 측정 대상
+_current = contextvars.ContextVar("gsi_profile", default=None)
+_log_lock = threading.Lock()
+
+
+# 재실행 한 번의 측정값
+#   spans: [이름, 깊이, 시작(ms), 소요(ms)] (시작 순서), sql: [블록 수, 문장 수, 실행(ms), 연결 대기(ms)]
+#   frames: {이름: [행, 열, 바이트]}
+class RerunProfile:
+    __slots__ = ("started", "spans", "sql", "slowest_sql", "frames", "_depth")
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.spans = []
+        self.sql = [0, 0, 0.0, 0.0]
+        # 가장 오래 걸린 연결 블록: (실행 ms, 문장 수, 첫 문장)
+        self.slowest_sql = None
+        self.frames = {}
+        self._depth = 0
+
+    def add_sql(self, statements, first_statement, ms, wait_ms):
+        self.sql[0] += 1
+        self.sql[1] += statements
+        self.sql[2] += ms
+        self.sql[3] += wait_ms
+        if self.slowest_sql is None or ms > self.slowest_sql[0]:
+            self.slowest_sql = (ms, statements, first_statement)
+
+
+# 연결 하나에 걸어 두는 SQL 문장 계수기 (executemany 는 행마다 불리므로 문장을 모아 두지 않는다)
+class StatementCounter:
+    __slots__ = ("count", "first")
+
+    def __init__(self):
+        self.count = 0
+        self.first = None
+
+    def __call__(self, statement):
+        if self.first is None:
+            self.first = " ".join(statement.split())[:120]
+        self.count += 1
+
+
+def current_profile():
+    return _current.get()
+
+
+# 이 스레드(세션의 스크립트 실행)에서 측정을 시작한다. finish_rerun 에 넘길 토큰을 함께 돌려준다
+def start_rerun():
+    profile = RerunProfile()
+    return profile, _current.set(profile)
+
+
+# 측정을 끝내고 기록(dict)을 만든다. log_path 가 있으면 JSON 한 줄로 덧붙인다
+def finish_rerun(profile, token, log_path=PROFILE_LOG):
+    total_ms = (time.perf_counter() - profile.started) * 1000
+    _current.reset(token)
+    record = {
+        "ts": datetime.now(timezone.utc).isoformat(timespec="milliseconds"),
+        "total_ms": round(total_ms, 3),
+        "spans": [[name, depth, round(start, 3), round(ms, 3)] for name, depth, start, ms in sorted(profile.spans, key=lambda s: s[2])],
+        "sql": {"blocks": profile.sql[0], "statements": profile.sql[1],
+                "ms": round(profile.sql[2], 3), "wait_ms": round(profile.sql[3], 3)},
+        "slowest_sql": list(profile.slowest_sql) if profile.slowest_sql else None,
+        "frames": profile.frames,
+    }
+    if log_path:
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with _log_lock, open(log_path, "a", encoding="utf-8") as f:
+            f.write(line)
+    return record
+
+
+# 구간 시간 측정. 중첩하면 깊이가 함께 기록된다
+@contextmanager
+def span(name):
+    profile = _current.get()
+    if profile is None:
+        yield
+        return
+    depth = profile._depth
+    profile._depth = depth + 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        end = time.perf_counter()
+        profile._depth = depth
+        profile.spans.append((name, depth, (start - profile.started) * 1000, (end - start) * 1000))
+
+
+# DataFrame 크기 기록 (행, 열, 메모리 바이트 — 문자열 열은 얕게 잰다)
+def record_frame(name, df):
+    profile = _current.get()
+    if profile is not None:
+        profile.frames[name] = [len(df), len(df.columns), int(df.memory_usage(index=True, deep=False).sum())]
+
+
+# 최근접 순위 백분위수
+def _percentile(sorted_values, q):
+    return sorted_values[max(0, math.ceil(q / 100 * len(sorted_values)) - 1)]
+
+
+# 재실행 기록들에서 전체/구간별/SQL 소요 시간의 p50, p95 를 구한다.
+# 반환값: [(이름, 표본 수, p50, p95, 최대)] — 전체, SQL, 구간 순 (구간은 처음 나온 순서)
+def latency_summary(records):
+    samples = {"rerun": [], "sql": []}
+    for record in records:
+        samples["rerun"].append(record["total_ms"])
+        samples["sql"].append(record["sql"]["ms"])
+        per_name = {}
+        for name, _, _, ms in record["spans"]:
+            per_name[name] = per_name.get(name, 0.0) + ms
+        for name, ms in per_name.items():
+            samples.setdefault(name, []).append(ms)
+    summary = []
+    for name, values in samples.items():
+        values.sort()
+        if values:
+            summary.append((name, len(values), _percentile(values, 50), _percentile(values, 95), values[-1]))
+    return summary
+
+
+# JSON-lines 기록 파일의 마지막 last 줄을 읽는다 (깨진 줄은 건너뜀)
+def read_log(path, last=None):
+    records = deque(maxlen=last)
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return list(records)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="재실행 측정 기록(JSON-lines)의 구간별 p50/p95 소요 시간을 보여 줍니다.")
+    parser.add_argument("log", nargs="?", default=PROFILE_LOG, help="기록 파일 (기본: GSI_PROFILE_LOG)")
+    parser.add_argument("--last", type=int, default=None, help="마지막 N 개 재실행만 집계")
+    args = parser.parse_args(argv)
+    if not args.log:
+        parser.error("기록 파일을 지정하거나 GSI_PROFILE_LOG 를 설정하세요.")
+
+    records = read_log(args.log, args.last)
+    print(f"재실행 {len(records)}건")
+    print(f"{'구간':<24} {'표본':>6} {'p50(ms)':>9} {'p95(ms)':>9} {'최대(ms)':>9}")
+    for name, count, p50, p95, worst in latency_summary(records):
+        print(f"{name:<24} {count:>6} {p50:>9.1f} {p95:>9.1f} {worst:>9.1f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
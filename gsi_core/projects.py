@@ -0,0 +1,60 @@
+import os
+import re
+
+from . import db
+
+# 사업 분야(프로젝트)마다 카탈로그/견적을 별도 SQLite 파일에 둔다.
+# 파일이 다르므로 쓰기 잠금, 연결 풀, 카탈로그 캐시, 열 스냅샷이 모두 프로젝트별로 따로 있고
+# 한 프로젝트의 초기화/가져오기/견적 발행이 다른 프로젝트를 기다리게 하지 않는다.
+# 기본 프로젝트는 예전 단일 DB(GSI_DB_PATH), 나머지는 PROJECTS_DIR 아래 <프로젝트>.db
+# (환경변수 GSI_PROJECTS_DIR 로 위치 변경 가능)
+PROJECTS_DIR = os.environ.get("GSI_PROJECTS_DIR", "projects")
+DEFAULT_PROJECT = "기본"
+PROJECT_SUFFIX = ".db"
+
+# 파일 이름으로 그대로 쓰므로 글자/숫자/밑줄/하이픈만 (한글 가능)
+_PROJECT_NAME = re.compile(r"\w[\w-]{0,63}")
+
+
+def _check_name(project):
+    if not _PROJECT_NAME.fullmatch(project):
+        raise ValueError(f"프로젝트 이름은 글자, 숫자, '_', '-' 로 64자 이내여야 합니다: {project!r}")
+
+
+# 프로젝트 이름 → DB 파일 경로 (None 이나 빈 문자열은 기본 프로젝트)
+def project_db_path(project=None):
+    if not project or project == DEFAULT_PROJECT:
+        return db.DB_PATH
+    _check_name(project)
+    return os.path.join(PROJECTS_DIR, project + PROJECT_SUFFIX)
+
+
+# 기본 프로젝트 + PROJECTS_DIR 의 프로젝트 (이름순)
+def list_projects():
+    try:
+        with os.scandir(PROJECTS_DIR) as it:
+            names = sorted(entry.name[:-len(PROJECT_SUFFIX)] for entry in it
+                           if entry.is_file() and entry.name.endswith(PROJECT_SUFFIX)
+                           and _PROJECT_NAME.fullmatch(entry.name[:-len(PROJECT_SUFFIX)]))
+    except FileNotFoundError:
+        names = []
+    return [DEFAULT_PROJECT] + [name for name in names if name != DEFAULT_PROJECT]
+
+
+# 프로젝트 DB 를 열어(처음이면 스키마 생성) 경로를 돌려준다.
+# create=False 이면 없는 프로젝트는 ValueError (CLI 에서 오타로 빈 DB 를 만들지 않도록)
+def open_project(project=None, create=False):
+    path = project_db_path(project)
+    if path != db.DB_PATH and not os.path.exists(path):
+        if not create:
+            raise ValueError(f"없는 프로젝트입니다: {project}")
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    db.get_pool(path)
+    return path
+
+
+# CLI 의 --db / --project 를 DB 경로로 (둘 다 없으면 None: 기본 DB)
+def resolve_db(db_path=None, project=None):
+    if db_path is not None and project is not None:
+        raise ValueError("--db 와 --project 는 함께 쓸 수 없습니다.")
+    return db_path if project is None else open_project(project)
@@ -0,0 +1,147 @@
+import numpy as np
+import pandas as pd
+
+from .money import QUANTITY_SCALE, amount, as_minor_array, milli_amounts, to_milli
+
+
+# 견적 한 줄 (유닛 또는 부품). price/total 은 최소 단위 정수. 세션마다 수십 개씩 만들어지므로 __slots__ 로 인스턴스 dict 를 없앤다
+class QuoteLine:
+    __slots__ = ("item_id", "name", "quantity", "price", "total")
+
+    def __init__(self, item_id, name, quantity, price):
+        self.item_id = item_id
+        self.name = name
+        self.quantity = quantity
+        self.price = price
+        self.total = amount(quantity, price)
+
+    def __repr__(self):
+        return f"QuoteLine({self.item_id!r}, {self.name!r}, quantity={self.quantity!r}, price={self.price!r})"
+
+
+# 세션별 견적 입력.
+# 카탈로그 전체 길이의 수량/합계/선택 열 대신 수량이 0 이 아닌 줄만 ID 로 들고 있고,
+# 줄이 바뀔 때마다 합계를 차이만큼 고친다. DataFrame 은 화면 표시나 내보내기 때만 만든다.
+#   units: 유닛 ID → 줄 (price 는 하위 유닛까지 포함한 유닛 1개 비용)
+#   parts: 직접 추가한 부품 ID → 줄
+#   included: "선택된 부품" 에 보여 줄 부품 ID
+class QuoteState:
+    __slots__ = ("units", "parts", "included", "unit_total", "part_total", "_catalog")
+
+    def __init__(self):
+        self.units = {}
+        self.parts = {}
+        self.included = set()
+        self.unit_total = 0
+        self.part_total = 0
+        # 마지막으로 맞춘 카탈로그: (버전, 엔진, 부품 단가, 유닛 1개 비용, 유닛명, 부품명) — 모두 공유 스냅샷의 값
+        self._catalog = None
+
+    @property
+    def material_total(self):
+        return self.unit_total + self.part_total
+
+    # 카탈로그나 단가가 바뀌었으면 남아 있는 줄의 이름/단가를 다시 맞추고 합계를 새로 계산한다.
+    # 카탈로그에서 지워진 유닛/부품 줄은 버린다. 같은 버전, 같은 단가면 아무것도 하지 않는다.
+    #   version: 카탈로그 버전 (예: (리비전, Epoch)). 이름만 바뀌어도 엔진은 그대로 쓰이므로 따로 받는다
+    #   unit_names, part_names: 엔진과 같은 순서의 유닛명/부품명 Series (menu_df, ingredient_df 열)
+    def reprice(self, version, engine, prices, unit_names, part_names):
+        prices = as_minor_array(prices)
+        if self._catalog is not None and self._catalog[:2] == (version, engine) and np.array_equal(self._catalog[2], prices):
+            return False
+        unit_prices = engine.unit_prices(prices)
+        self._catalog = (version, engine, prices, unit_prices, unit_names, part_names)
+        self.units = _relink(self.units, engine.unit_positions(list(self.units)), unit_prices, unit_names)
+        self.parts = _relink(self.parts, engine.part_positions(list(self.parts)), prices, part_names)
+        included = list(self.included)
+        self.included = {part_id for part_id, pos in zip(included, engine.part_positions(included)) if pos >= 0}
+        self.unit_total = sum(line.total for line in self.units.values())
+        self.part_total = sum(line.total for line in self.parts.values())
+        return True
+
+    # 유닛 수량을 바꾼다 (0 이면 줄을 지운다). 합계는 바뀐 만큼만 고친다
+    def set_unit_quantity(self, unit_id, quantity):
+        _, engine, _, unit_prices, unit_names, _ = self._catalog
+        pos = _position(engine.unit_positions, unit_id)
+        self.unit_total += _set_line(self.units, unit_id, quantity, unit_names.iloc[pos], int(unit_prices[pos]))
+
+    # 직접 추가한 부품의 수량을 바꾼다 (0 이면 줄을 지운다)
+    def set_part_quantity(self, part_id, quantity):
+        _, engine, prices, _, _, part_names = self._catalog
+        pos = _position(engine.part_positions, part_id)
+        self.part_total += _set_line(self.parts, part_id, quantity, part_names.iloc[pos], int(prices[pos]))
+
+    def set_included(self, part_id, included):
+        if included:
+            self.included.add(part_id)
+        else:
+            self.included.discard(part_id)
+
+    # 주문한 유닛에서 나오는 부품별 필요 수량: (부품 ID → 수량). 주문한 유닛의 BOM 항목만 계산한다
+    def unit_part_quantities(self):
+        return {part_id: milli / QUANTITY_SCALE for part_id, milli in self._unit_part_milli().items()}
+
+    def _unit_part_milli(self):
+        engine = self._catalog[1]
+        parts, milli = engine.sparse_part_milli(
+            engine.unit_positions(list(self.units)), [line.quantity for line in self.units.values()])
+        return dict(zip(engine.ingredient_ids[parts].tolist(), milli.tolist()))
+
+    # 선택한 유닛 표 (ID, MenuName, Price, Quantity, TotalCost). 입력한 순서
+    def units_frame(self):
+        lines = list(self.units.values())
+        return pd.DataFrame({
+            "ID": [line.item_id for line in lines],
+            "MenuName": [line.name for line in lines],
+            "Price": np.array([line.price for line in lines], dtype=np.int64),
+            "Quantity": [line.quantity for line in lines],
+            "TotalCost": np.array([line.total for line in lines], dtype=np.int64),
+        })
+
+    # 부품별 세부 표 (ID, IngredientName, Price, Quantity, TotalCost).
+    # 유닛에서 나온 수량과 직접 추가한 수량을 합쳐서, 수량이 있는 부품만 ingredient_df 순서로
+    def materials_frame(self, part_ids=None):
+        _, engine, prices, _, _, part_names = self._catalog
+        # 수량은 1/1000 단위 정수로 합친다 (실수로 더하면 0.8999999999999999 같은 값이 표와 세부 시트에 나온다)
+        milli = self._unit_part_milli()
+        for part_id, line in self.parts.items():
+            milli[part_id] = milli.get(part_id, 0) + to_milli(line.quantity)
+        if part_ids is not None:
+            milli = {part_id: milli.get(part_id, 0) for part_id in part_ids}
+        positions = engine.part_positions(list(milli))
+        order = np.argsort(positions, kind="stable")
+        positions = positions[order]
+        quantity = np.array(list(milli.values()), dtype=np.int64)[order]
+        return pd.DataFrame({
+            "ID": engine.ingredient_ids[positions],
+            "IngredientName": part_names.iloc[positions].to_numpy(),
+            "Price": prices[positions],
+            "Quantity": quantity / QUANTITY_SCALE,
+            "TotalCost": milli_amounts(quantity, prices[positions]),
+        })
+
+
+def _position(positions, item_id):
+    pos = positions([item_id])[0]
+    if pos < 0:
+        raise KeyError(f"카탈로그에 없는 ID: {item_id}")
+    return pos
+
+
+# 줄을 바꾸고 합계 변화량을 돌려준다
+def _set_line(lines, item_id, quantity, name, price):
+    old = lines.pop(item_id, None)
+    delta = -old.total if old is not None else 0
+    if quantity:
+        line = lines[item_id] = QuoteLine(item_id, name, quantity, price)
+        delta += line.total
+    return delta
+
+
+# 줄마다 새 위치의 이름/단가로 다시 만든다 (없어진 ID 는 버림)
+def _relink(lines, positions, prices, names):
+    return {
+        item_id: QuoteLine(item_id, names.iloc[pos], line.quantity, int(prices[pos]))
+        for (item_id, line), pos in zip(lines.items(), positions.tolist())
+        if pos >= 0
+    }
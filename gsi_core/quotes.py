@@ -0,0 +1,87 @@
+import hashlib
+import json
+import os
+from collections import namedtuple
+
+from .export import WORKBOOK_FORMAT_VERSION, QuoteDocument, material_rows, render, render_xlsx, selected_menu_rows
+
+# header: QuoteHeader, workbook: xlsx 바이트, cached: 통합문서를 캐시에서 꺼냈는지
+IssuedQuote = namedtuple("IssuedQuote", "header workbook cached")
+# header: QuoteHeader, document: export.QuoteDocument (견적번호/날짜까지 채운 스냅샷), quote_hash: content_hash,
+# db_path: 견적을 저장한 DB (프로젝트) 의 절대 경로
+PreparedQuote = namedtuple("PreparedQuote", "header document quote_hash db_path")
+
+
+# 견적 입력 전체를 정해진 순서의 JSON 으로 만들어 해시한다
+# 같은 부품/수량/단가/인원/고객/마진/세율로 다시 누르면 같은 값이 나와서 이미 발행한 견적서를 다시 쓴다
+def content_hash(materials, totals, labor_cost_per_person, selected_menus, num_people, customer, project,
+                 price_as_of=None, labor_lines=()):
+    payload = {
+        "materials": [list(row) for row in materials],
+        "selected_menus": [list(row) for row in selected_menus],
+        "totals": totals._asdict(),
+        "labor_cost_per_person": labor_cost_per_person,
+        "num_people": num_people,
+        "customer": customer,
+        "project": project,
+        "price_as_of": None if price_as_of is None else str(price_as_of),
+    }
+    # 인건비 모델 행이 없는 견적은 예전과 같은 해시가 나오도록 키를 넣지 않는다
+    if labor_lines:
+        payload["labor_lines"] = [list(row) for row in labor_lines]
+    # numpy 스칼라가 섞여 있어도 파이썬 값으로 바꿔서 직렬화
+    text = json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=lambda o: o.item())
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+# 통합문서 캐시 키: 견적을 저장한 DB + 견적 내용 + 견적번호 + 통합문서 형식 버전
+# (캐시 폴더는 프로세스 전체가 같이 쓰므로 DB 경로를 넣어 프로젝트끼리 섞이지 않게 한다)
+def workbook_key(db_path, quote_hash, quote_number):
+    text = f"{db_path}:{quote_hash}:{quote_number}:{WORKBOOK_FORMAT_VERSION}"
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+# 견적을 발행한다. 같은 내용의 견적이 이미 있으면 그 번호를 그대로 쓰고,
+# 없으면 견적번호를 새로 받아 Quotes/QuoteLines 에 저장한다. 문서는 만들지 않고 그릴 값만 돌려준다
+#   totals: money.QuoteTotals (금액은 최소 단위 정수)
+#   labor_lines: 인건비 모델의 역할별/간접비 행 (labor.LaborModel.lines)
+def prepare_quote(repo, materials_df, totals, labor_cost_per_person, selected_menus_df, num_people,
+                  customer="고객명", project="과제명", price_as_of=None, labor_lines=()):
+    materials = list(material_rows(materials_df))
+    selected_menus = selected_menu_rows(selected_menus_df)
+    labor_lines = list(labor_lines)
+    quote_hash = content_hash(materials, totals, labor_cost_per_person, selected_menus, num_people, customer, project,
+                              price_as_of, labor_lines)
+
+    header = repo.find_quote(quote_hash)
+    if header is None:
+        lines = [(menu_id, *row) for menu_id, row in zip(selected_menus_df["ID"].tolist(), selected_menus)]
+        header = repo.save_quote(customer, project, num_people, labor_cost_per_person, totals,
+                                 None if price_as_of is None else str(price_as_of), quote_hash, lines)
+
+    document = QuoteDocument(materials, totals, labor_cost_per_person, selected_menus, num_people, customer, project,
+                             header.quote_number, header.created_at[:10], labor_lines)
+    return PreparedQuote(header, document, quote_hash, os.path.abspath(repo.pool.path))
+
+
+# 형식별 문서 만드는 함수 ({형식: build()}, export_queue.ExportQueue.submit 에 넘긴다).
+# xlsx 는 통합문서 캐시를 거친다
+def export_tasks(prepared, formats, cache=None):
+    key = workbook_key(prepared.db_path, prepared.quote_hash, prepared.header.quote_number)
+
+    def task(format_name):
+        if format_name == "xlsx" and cache is not None:
+            return lambda: cache.get_or_build(key, lambda: render_xlsx(prepared.document))[0]
+        return lambda: render(prepared.document, format_name)
+
+    return {format_name: task(format_name) for format_name in formats}
+
+
+# 견적서를 발행하고 통합문서를 바로 만든다 (배치/CLI 용. 화면은 prepare_quote + export_tasks 를 대기열에 넣는다)
+def issue_quote(repo, cache, materials_df, totals, labor_cost_per_person, selected_menus_df, num_people,
+                customer="고객명", project="과제명", price_as_of=None, labor_lines=()):
+    prepared = prepare_quote(repo, materials_df, totals, labor_cost_per_person, selected_menus_df, num_people,
+                             customer, project, price_as_of, labor_lines)
+    key = workbook_key(prepared.db_path, prepared.quote_hash, prepared.header.quote_number)
+    workbook, cached = cache.get_or_build(key, lambda: render_xlsx(prepared.document))
+    return IssuedQuote(prepared.header, workbook, cached)
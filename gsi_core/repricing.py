@@ -0,0 +1,165 @@
+import argparse
+import os
+import sys
+import time
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from .bulk_import import _column_positions, _parse_part, iter_table_rows
+from .catalog_cache import get_catalog_cache
+from .money import amounts, format_won, from_minor
+from .projects import resolve_db
+
+# 사용법: python -m gsi_core.repricing 단가표.csv            (영향만 계산)
+#         python -m gsi_core.repricing 단가표.csv --apply --report-dir 영향
+# 단가표는 bulk_import 의 parts 형식 (부품명, 단가)
+
+# 단가 일괄 변경의 영향 (금액은 모두 최소 단위 정수)
+#   parts: ID, IngredientName, OldPrice, NewPrice, Units — 단가가 바뀌는 부품과 그 부품을 쓰는 유닛 수
+#   units: ID, MenuName, OldPrice, NewPrice, Delta — 영향 받는 유닛의 1개 비용 (하위 유닛 포함), 차이가 큰 순
+#   quotes: QuoteID, QuoteNumber, Customer, Project, Lines, Delta — 발행한 견적의 유닛 줄을
+#           현재 단가와 새 단가로 계산한 부품비 차이 (직접 추가한 부품 줄은 견적에 남아 있지 않아 빠진다)
+#   applied: DB 에 반영했는지, seconds: 계산(과 반영)에 걸린 시간
+RepricingReport = namedtuple("RepricingReport", "parts units quotes applied seconds")
+
+
+# 부품명 → 부품 ID ((부품명, 새 단가) 목록). 같은 이름이 여러 개면 화면과 같이 첫 번째 부품
+# 반환값: ((부품 ID, 새 단가) 목록, 찾지 못한 부품명 목록)
+def changes_by_name(ingredient_df, rows):
+    ids = {}
+    for name, ingredient_id in zip(ingredient_df["IngredientName"].tolist(), ingredient_df["ID"].tolist()):
+        ids.setdefault(name, ingredient_id)
+    changes = [(ids[name], price) for name, price in rows if name in ids]
+    return changes, [name for name, _ in rows if name not in ids]
+
+
+# 단가 변경의 영향을 계산하고, apply=True 이면 한 트랜잭션으로 DB 에 반영한다.
+#   cache: catalog_cache.CatalogCache, changes: (부품 ID, 새 단가) 목록 (최소 단위)
+# 부품 → 유닛 역색인(CostEngine.where_used)으로 영향 받는 유닛만 찾아서 그 유닛들의 BOM 항목만 다시 계산한다.
+# 반영 뒤에는 공유 스냅샷을 새로 고치며, 구성이 그대로라 엔진도 바뀐 유닛만 다시 계산한다
+def reprice(cache, changes, apply=False):
+    start = time.perf_counter()
+    snapshot = cache.get()
+    engine = snapshot.engine
+    changes = dict(changes)
+
+    ids = np.fromiter(changes, dtype=np.int64, count=len(changes))
+    positions = engine.part_positions(ids)
+    if (positions < 0).any():
+        raise ValueError(f"알 수 없는 부품 ID: {', '.join(map(str, ids[positions < 0]))}")
+    old_prices = snapshot.ingredient_df["Price"].to_numpy()
+    new_prices = old_prices.copy()
+    new_prices[positions] = np.fromiter(changes.values(), dtype=np.int64, count=len(changes))
+    moved = new_prices[positions] != old_prices[positions]
+    positions = positions[moved]
+
+    part_index, units = engine.where_used(positions)
+    affected = np.unique(units)
+    old_unit = engine.unit_prices(old_prices)[affected]
+    new_unit = engine.unit_price_matrix(new_prices[:, None], affected)[:, 0]
+
+    parts = pd.DataFrame({
+        "ID": engine.ingredient_ids[positions],
+        "IngredientName": snapshot.ingredient_df["IngredientName"].to_numpy()[positions],
+        "OldPrice": old_prices[positions],
+        "NewPrice": new_prices[positions],
+        "Units": np.bincount(part_index, minlength=len(positions)),
+    })
+    units = pd.DataFrame({
+        "ID": engine.menu_ids[affected],
+        "MenuName": snapshot.menu_df["MenuName"].to_numpy()[affected],
+        "OldPrice": old_unit,
+        "NewPrice": new_unit,
+        "Delta": new_unit - old_unit,
+    })
+    units = units.iloc[np.argsort(-np.abs(units["Delta"].to_numpy()), kind="stable")].reset_index(drop=True)
+    quotes = _quote_impact(cache.repo, units[units["Delta"] != 0])
+
+    if apply and len(parts):
+        cache.repo.update_prices(zip(parts["ID"].tolist(), parts["NewPrice"].tolist()))
+        cache.get()
+    return RepricingReport(parts, units, quotes, bool(apply), time.perf_counter() - start)
+
+
+# 발행한 견적 중 영향 받는 유닛이 들어 있는 견적별 부품비 차이 (줄마다 money 규칙대로 반올림)
+def _quote_impact(repo, units):
+    columns = ["QuoteID", "QuoteNumber", "Customer", "Project", "MenuID", "Quantity"]
+    lines = pd.DataFrame(repo.quote_lines_for_menus(units["ID"].tolist()) if len(units) else [], columns=columns)
+    by_unit = units.set_index("ID")
+    quantities = lines["Quantity"].to_numpy(dtype=float)
+    lines["Delta"] = (amounts(quantities, by_unit["NewPrice"].reindex(lines["MenuID"]).to_numpy(dtype=np.int64))
+                      - amounts(quantities, by_unit["OldPrice"].reindex(lines["MenuID"]).to_numpy(dtype=np.int64)))
+    quotes = (lines.groupby(["QuoteID", "QuoteNumber", "Customer", "Project"], sort=False)
+              .agg(Lines=("MenuID", "size"), Delta=("Delta", "sum")).reset_index())
+    return quotes.iloc[np.argsort(-np.abs(quotes["Delta"].to_numpy()), kind="stable")].reset_index(drop=True)
+
+
+# 단가표 파일 → (부품명, 새 단가) 목록과 거부된 (행 번호, 사유) 목록
+def read_price_list(source, file_name=None, encoding="utf-8-sig"):
+    rows = iter_table_rows(source, file_name, encoding)
+    header = next(rows, None)
+    if header is None:
+        raise ValueError("빈 파일입니다.")
+    positions = _column_positions(header[1], "parts")
+    width = max(positions.values()) + 1
+    prices, rejected = [], []
+    for line, values in rows:
+        values = list(values) + [None] * (width - len(values))
+        if all(value in (None, "") for value in values):
+            continue
+        try:
+            prices.append(_parse_part(values, positions))
+        except ValueError as e:
+            rejected.append((line, str(e)))
+    return prices, rejected
+
+
+# 보고서의 금액 열을 원 단위로 바꾼 복사본 (화면/CSV 용)
+def in_won(frame):
+    money_columns = [column for column in ("OldPrice", "NewPrice", "Delta") if column in frame.columns]
+    return frame.assign(**{column: from_minor(frame[column]) for column in money_columns})
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="부품 단가를 한꺼번에 바꾸고 영향 받는 유닛과 견적을 보여 줍니다.")
+    parser.add_argument("file", help="단가표 (.csv 또는 .xlsx, 부품명/단가 머리글)")
+    parser.add_argument("--db", default=None, help="데이터베이스 경로 (기본: GSI_DB_PATH 또는 restaurant_menu.db)")
+    parser.add_argument("--project", default=None, help="프로젝트 이름 (GSI_PROJECTS_DIR 아래의 프로젝트 DB, --db 대신)")
+    parser.add_argument("--apply", action="store_true", help="DB 에 반영 (없으면 영향만 계산)")
+    parser.add_argument("--report-dir", default=None, help="parts.csv, units.csv, quotes.csv 를 저장할 폴더")
+    parser.add_argument("--top", type=int, default=10, help="화면에 보여 줄 유닛/견적 수")
+    parser.add_argument("--encoding", default="utf-8-sig")
+    args = parser.parse_args(argv)
+
+    try:
+        cache = get_catalog_cache(resolve_db(args.db, args.project))
+        rows, rejected = read_price_list(args.file, encoding=args.encoding)
+        changes, unknown = changes_by_name(cache.get().ingredient_df, rows)
+        report = reprice(cache, changes, apply=args.apply)
+    except (ValueError, OSError) as e:
+        print(f"단가 변경 실패: {e}", file=sys.stderr)
+        return 1
+
+    for line, reason in rejected:
+        print(f"  {line}행: {reason}", file=sys.stderr)
+    if unknown:
+        print(f"  없는 부품 {len(unknown)}개: {', '.join(unknown[:10])}{' ...' if len(unknown) > 10 else ''}", file=sys.stderr)
+    print(f"단가 변경 {len(report.parts)}건, 영향 유닛 {len(report.units)}개, 영향 견적 {len(report.quotes)}건 "
+          f"({report.seconds * 1000:.1f}ms, {'반영함' if report.applied else '반영 안 함'})")
+    for row in report.units.head(args.top).itertuples(index=False):
+        print(f"  유닛 {row.MenuName}: {format_won(row.OldPrice)} -> {format_won(row.NewPrice)} ({format_won(row.Delta)})")
+    for row in report.quotes.head(args.top).itertuples(index=False):
+        print(f"  견적 {row.QuoteNumber} ({row.Customer}): {format_won(row.Delta)}")
+
+    if args.report_dir:
+        os.makedirs(args.report_dir, exist_ok=True)
+        for name in ("parts", "units", "quotes"):
+            in_won(getattr(report, name)).to_csv(os.path.join(args.report_dir, f"{name}.csv"), index=False,
+                                                 encoding="utf-8-sig")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
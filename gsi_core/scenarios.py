@@ -0,0 +1,80 @@
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from .money import (QUANTITY_SCALE, apply_rate, as_minor_array, check_product, milli_amounts, quote_totals, round_div_array,
+                    to_milli_array)
+from .pricing import calculate_labor_cost
+
+# 수량/단가 시나리오 비교. 견적 하나(유닛 + 직접 추가한 부품)를 세트 수 여러 개와 단가 변동 여러 개의
+# 모든 조합으로 한 번에 계산한다. 금액은 모두 최소 단위 정수이고, 반올림 규칙은 화면 견적과 같다
+#   scales: 세트 수 (견적의 모든 수량에 곱한다), price_changes: 단가 변동 (bp)
+#   totals: money.QuoteTotals. 금액 필드는 (세트 수 × 단가 변동) int64 배열
+ScenarioSweep = namedtuple("ScenarioSweep", "scales price_changes totals")
+
+
+# 부품 단가 × 단가 변동 목록 → 부품 위치 × 시나리오 단가 행렬 (최소 단위로 반올림)
+# changed_parts 를 주면 그 부품 위치들의 단가만 바꾼다 (예: 한 공급사의 부품)
+def price_matrix(prices, price_changes, changed_parts=None):
+    prices = as_minor_array(prices)
+    changes = np.asarray(price_changes, dtype=np.int64)
+    matrix = np.repeat(prices[:, None], len(changes), axis=1)
+    rows = slice(None) if changed_parts is None else np.asarray(changed_parts, dtype=np.intp)
+    matrix[rows] += apply_rate(matrix[rows], changes[None, :])
+    return matrix
+
+
+# (시나리오 × 줄) 수량(1/1000 단위)과 (줄 × 단가 시나리오) 단가 → 시나리오별 줄 금액의 합.
+# 수량이 모두 정수면 줄마다 반올림할 것이 없으므로 정수 행렬 곱 한 번으로 끝난다
+def _line_totals(milli, prices):
+    if not (milli % QUANTITY_SCALE).any():
+        whole = milli // QUANTITY_SCALE
+        # 행 합계 × 최대 단가로 int64 범위를 확인
+        check_product(np.abs(whole).sum(axis=1), prices)
+        return whole @ prices
+    return milli_amounts(milli[:, :, None], prices[None, :, :]).sum(axis=1)
+
+
+# 견적 하나를 세트 수 × 단가 변동의 모든 조합으로 계산한다
+#   units, unit_quantities: 견적의 유닛 위치와 1세트 수량
+#   parts, part_quantities: 직접 추가한 부품 위치와 1세트 수량
+#   changed_parts: 단가 변동을 적용할 부품 위치 (None 이면 전체)
+#   labor: labor.LaborModel (없으면 인원 수 × 1인당 인건비). 인원 수는 세트 수와 상관없이 같다
+def sweep(engine, prices, units, unit_quantities, scales, price_changes, parts=(), part_quantities=(),
+          changed_parts=None, labor=None, num_people=0, margin_rate=0, tax_rate=0):
+    units = np.asarray(units, dtype=np.intp)
+    parts = np.asarray(parts, dtype=np.intp)
+    scales = np.asarray(scales, dtype=float)
+    matrix = price_matrix(prices, price_changes, changed_parts)
+
+    # 세트 수별 유닛/부품 수량 (세트 수 × 줄)
+    unit_scenarios = scales[:, None] * np.asarray(unit_quantities, dtype=float)
+    part_scenarios = scales[:, None] * np.asarray(part_quantities, dtype=float)
+    # 유닛 1개 비용은 단가 시나리오마다 BOM 항목 단위로 한 번에 계산 (유닛 × 단가 변동)
+    material = (_line_totals(to_milli_array(unit_scenarios), engine.unit_price_matrix(matrix, units))
+                + _line_totals(to_milli_array(part_scenarios), matrix[parts]))
+
+    if labor is None:
+        labor_total = np.full(len(scales), calculate_labor_cost(num_people), dtype=np.int64)
+    else:
+        labor_total = np.broadcast_to(labor.evaluate(unit_scenarios, num_people, units=units).total, len(scales))
+    labor_total = np.broadcast_to(labor_total[:, None], material.shape)
+    return ScenarioSweep(scales, np.asarray(price_changes, dtype=np.int64),
+                         quote_totals(material, labor_total, margin_rate, tax_rate))
+
+
+# 시나리오 비교표 (조합마다 한 행): Scale, PriceChange(bp), Material, Labor, Margin, Tax, Total, PerSet
+# PerSet 은 1세트당 합계 (최소 단위로 반올림)
+def scenario_frame(result):
+    n_scales, n_changes = len(result.scales), len(result.price_changes)
+    totals = result.totals
+    per_set = round_div_array(totals.total * QUANTITY_SCALE, np.maximum(to_milli_array(result.scales), 1)[:, None])
+    return pd.DataFrame({
+        "Scale": np.repeat(result.scales, n_changes),
+        "PriceChange": np.tile(result.price_changes, n_scales),
+        **{name: np.asarray(getattr(totals, field)).ravel()
+           for name, field in (("Material", "material"), ("Labor", "labor"), ("Margin", "margin"), ("Tax", "tax"),
+                               ("Total", "total"))},
+        "PerSet": per_set.ravel(),
+    })
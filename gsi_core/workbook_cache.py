@@ -0,0 +1,120 @@
+import os
+import tempfile
+import threading
+
+# 만든 견적서 통합문서를 입력 해시로 디스크에 보관하는 캐시
+# (환경변수 GSI_WORKBOOK_CACHE_DIR, GSI_WORKBOOK_CACHE_MB 로 위치와 크기 변경 가능)
+CACHE_DIR = os.environ.get("GSI_WORKBOOK_CACHE_DIR", "workbook_cache")
+CACHE_MAX_BYTES = int(float(os.environ.get("GSI_WORKBOOK_CACHE_MB", "256")) * 1024 * 1024)
+
+SUFFIX = ".xlsx"
+
+
+# 파일 하나가 항목 하나. 최근 사용 시각은 파일 mtime 으로 기록해서 (atime 은 꺼져 있는 경우가 많음)
+# 여러 프로세스(배치 작업자, Streamlit 서버)가 같은 폴더를 함께 써도 LRU 순서가 맞는다.
+# 용량을 넘으면 오래 안 쓴 파일부터 지운다.
+class WorkbookCache:
+    def __init__(self, directory=CACHE_DIR, max_bytes=CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # 마지막으로 폴더를 훑었을 때의 총 용량 + 그 뒤에 이 프로세스가 쓴 양 (None 이면 아직 안 훑음)
+        self._estimated_bytes = None
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key):
+        if not key.isalnum():
+            raise ValueError(f"캐시 키는 영문자/숫자만 가능합니다: {key!r}")
+        return os.path.join(self.directory, key + SUFFIX)
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)
+        except FileNotFoundError:
+            # 다른 프로세스가 방금 지웠을 수도 있다
+            return None
+        return data
+
+    # 임시 파일에 쓴 뒤 이름을 바꿔서, 읽는 쪽이 반쯤 쓰인 파일을 보지 않게 한다
+    def put(self, key, data):
+        path = self._path(key)
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        with self._lock:
+            if self._estimated_bytes is not None:
+                self._estimated_bytes += len(data)
+            # 추정 용량이 한도 안쪽이면 폴더를 다시 훑지 않는다
+            if self._estimated_bytes is not None and self._estimated_bytes <= self.max_bytes:
+                return
+        self.evict()
+
+    # (통합문서 바이트, 캐시 적중 여부). 없으면 build() 로 만들어서 저장한다
+    def get_or_build(self, key, build):
+        data = self.get(key)
+        hit = data is not None
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if not hit:
+            data = build()
+            self.put(key, data)
+        return data, hit
+
+    # 총 용량이 max_bytes 를 넘으면 최근에 쓰지 않은 파일부터 지운다. 지운 파일 수를 돌려준다
+    def evict(self):
+        entries, total = [], 0
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if not entry.name.endswith(SUFFIX):
+                    continue
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+                total += stat.st_size
+        removed = 0
+        if total > self.max_bytes:
+            for _, size, path in sorted(entries):
+                try:
+                    os.unlink(path)
+                except FileNotFoundError:
+                    pass
+                total -= size
+                removed += 1
+                if total <= self.max_bytes:
+                    break
+        with self._lock:
+            self._estimated_bytes = total
+        return removed
+
+    def size(self):
+        with os.scandir(self.directory) as it:
+            return sum(entry.stat().st_size for entry in it if entry.name.endswith(SUFFIX))
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+# 폴더별로 하나의 캐시 객체를 프로세스 전체에서 공유
+def get_workbook_cache(directory=None, max_bytes=None):
+    directory = os.path.abspath(directory or CACHE_DIR)
+    with _caches_lock:
+        cache = _caches.get(directory)
+        if cache is None:
+            cache = _caches[directory] = WorkbookCache(directory, CACHE_MAX_BYTES if max_bytes is None else max_bytes)
+        return cache
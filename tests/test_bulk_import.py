@@ -0,0 +1,79 @@
+import openpyxl
+import pytest
+
+from gsi_core import bulk_import, db
+from gsi_core.bulk_import import import_file
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "catalog.db")
+    yield path
+    db.get_pool(path).close()
+
+
+def write_csv(path, text):
+    path.write_text(text, encoding="utf-8-sig")
+    return str(path)
+
+
+def prices(repo):
+    return {name: price for _, name, price in repo.fetch_all()[1]}
+
+
+def test_chunks_commit_separately_and_later_rows_win(tmp_path, db_path):
+    source = write_csv(tmp_path / "parts.csv", "부품명,단가\n저항,5\n콘덴서,12.5\n\n저항,6\n다이오드,0.75\n")
+    repo = db.get_repository(db_path)
+    progress = []
+    result = import_file(repo, source, chunk_size=2, progress=progress.append)
+
+    # 빈 행은 세지 않지만 묶음은 파일의 행 단위로 자른다: [저항, 콘덴서] [빈 행, 저항] [다이오드]
+    assert progress == [2, 3, 4]
+    assert (result.rows, result.inserted, result.updated, result.unchanged) == (4, 3, 1, 0)
+    assert prices(repo) == {"저항": 600, "콘덴서": 1250, "다이오드": 75}
+
+
+def test_existing_parts_are_upserted_by_name(tmp_path, db_path):
+    repo = db.get_repository(db_path)
+    repo.insert_ingredient("저항", 500)
+    repo.insert_ingredient("콘덴서", 1200)
+    source = write_csv(tmp_path / "parts.csv", "IngredientName,Price\n저항,5\n콘덴서,\"1,300\"\n퓨즈,9.99\n")
+    result = import_file(repo, source)
+
+    assert (result.inserted, result.updated, result.unchanged, result.rejected) == (1, 1, 1, 0)
+    assert prices(repo) == {"저항": 500, "콘덴서": 130000, "퓨즈": 999}
+
+
+def test_bad_rows_are_reported(tmp_path, db_path):
+    repo = db.get_repository(db_path)
+    repo.insert_ingredient("저항", 500)
+    wb = openpyxl.Workbook()
+    wb.active.append(["유닛명", "부품명", "수량"])
+    for row in [["전원부", "저항", 2], ["전원부", "없는 부품", 1], ["전원부", "저항", "많이"], ["", "저항", 1],
+                ["통신부", "저항", -1], ["통신부"]]:
+        wb.active.append(row)
+    source = str(tmp_path / "units.xlsx")
+    wb.save(source)
+
+    result = import_file(repo, source, kind="units", chunk_size=4)
+    assert (result.rows, result.inserted, result.rejected) == (6, 1, 5)
+    lines = [line for line, _ in result.rejected_rows]
+    assert sorted(lines) == [3, 4, 5, 6, 7]
+    reasons = dict(result.rejected_rows)
+    assert "없는 부품" in reasons[3] and "숫자가 아닙니다" in reasons[4] and "올바르지 않습니다" in reasons[6]
+    # 엑셀의 짧은 행은 빈 칸으로 채워져서 읽힌다
+    assert "비어 있습니다" in reasons[5] and "비어 있습니다" in reasons[7]
+
+
+def test_cli_exit_codes(tmp_path, db_path, capsys):
+    good = write_csv(tmp_path / "parts.csv", "부품명,단가\n저항,5\n저항,abc\n퓨즈\n")
+    # 거부된 행이 있어도 가져오기는 성공
+    assert bulk_import.main([good, "--db", db_path]) == 0
+    out, err = capsys.readouterr()
+    assert "거부 2" in out
+    assert "3행: 단가 값이 숫자가 아닙니다" in err and "4행: 열 개수가 부족합니다" in err
+
+    missing_column = write_csv(tmp_path / "bad.csv", "이름,값\n저항,5\n")
+    assert bulk_import.main([missing_column, "--db", db_path]) == 1
+    assert bulk_import.main([str(tmp_path / "없는 파일.csv"), "--db", db_path]) == 1
+    assert "가져오기 실패" in capsys.readouterr().err
@@ -0,0 +1,37 @@
+import pytest
+
+from gsi_core import db
+from gsi_core.catalog_cache import CatalogCache
+
+
+@pytest.fixture
+def repo(tmp_path):
+    repo = db.get_repository(str(tmp_path / "catalog.db"))
+    resistor = repo.insert_ingredient("저항", 500)
+    capacitor = repo.insert_ingredient("콘덴서", 1200)
+    repo.insert_menu("전원부", "2024-01-01", [(resistor, 2.0), (capacitor, 1.0)])
+    yield repo
+    repo.pool.close()
+
+
+def test_unchanged_revision_returns_the_same_snapshot(repo):
+    cache = CatalogCache(repo, columns=False)
+    first = cache.get()
+    assert cache.get() is first
+
+
+def test_price_change_copies_only_changed_frames(repo):
+    cache = CatalogCache(repo, columns=False)
+    before = cache.get()
+    repo.update_prices([(1, 700)])
+    after = cache.get()
+
+    assert after.revision > before.revision
+    assert after.ingredient_df["Price"].tolist() == [700, 1200]
+    assert after.menu_ingredients_df["Price"].tolist() == [700, 1200]
+    # 세션들이 참조 중인 이전 스냅샷은 그대로 남는다
+    assert before.ingredient_df["Price"].tolist() == [500, 1200]
+    assert before.menu_ingredients_df["Price"].tolist() == [500, 1200]
+    # 바뀌지 않은 DataFrame 은 복사하지 않고 같은 객체를 넘긴다
+    assert after.menu_df is before.menu_df
+    assert after.menu_components_df is before.menu_components_df
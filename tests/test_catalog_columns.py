@@ -0,0 +1,97 @@
+import os
+import time
+
+import pandas as pd
+import pytest
+
+from gsi_core import catalog_columns, db
+from gsi_core.catalog_cache import CatalogCache
+from gsi_core.catalog_columns import DICTIONARY_COLUMNS, TABLE_COLUMNS, ColumnWriter, write_columns
+
+pytest.importorskip("pyarrow")
+
+
+def catalog_frames():
+    ingredients = pd.DataFrame({"ID": [1, 2], "IngredientName": ["저항", "콘덴서"], "Price": [500, 1200]})
+    menus = pd.DataFrame({"ID": [1], "MenuName": ["전원부"]})
+    mi = pd.DataFrame({"MenuID": [1, 1], "IngredientID": [1, 2], "Quantity": [2.0, 1.0]})
+    mi = mi.merge(menus.rename(columns={"ID": "MenuID"}), on="MenuID")
+    mi = mi.merge(ingredients.rename(columns={"ID": "IngredientID"}), on="IngredientID")
+    mc = pd.DataFrame({column: pd.Series([], dtype="int64") for column in TABLE_COLUMNS["menu_components_df"]})
+    frames = {"menu_df": menus, "ingredient_df": ingredients, "menu_ingredients_df": mi, "menu_components_df": mc}
+    return {table: frames[table].reindex(columns=columns) for table, columns in TABLE_COLUMNS.items()}
+
+
+def test_writer_keeps_running_after_a_failed_write(tmp_path, monkeypatch):
+    write_columns = catalog_columns.write_columns
+    calls = []
+
+    def fail_once(*args):
+        calls.append(args[1])
+        if len(calls) == 1:
+            raise ValueError("깨진 스냅샷")
+        return write_columns(*args)
+
+    monkeypatch.setattr(catalog_columns, "write_columns", fail_once)
+    writer = ColumnWriter(str(tmp_path / "columns"))
+    writer.submit(1, "epoch", catalog_frames())
+    writer.flush()
+    assert writer.written is None
+
+    writer.submit(2, "epoch", catalog_frames())
+    writer.flush()
+    assert calls == [1, 2]
+    assert writer.written == (2, "epoch")
+
+
+def test_write_keeps_previous_and_newer_snapshots(tmp_path):
+    directory = str(tmp_path / "columns")
+    now = time.time()
+    first = write_columns(directory, 1, "epoch", catalog_frames())
+    second = write_columns(directory, 2, "epoch", catalog_frames())
+    os.utime(os.path.join(directory, first), (now - 100, now - 100))
+    os.utime(os.path.join(directory, second), (now - 50, now - 50))
+    # 다른 프로세스가 아직 쓰고 있는 폴더
+    in_progress = os.path.join(directory, "epoch-9-other")
+    os.makedirs(in_progress)
+
+    third = write_columns(directory, 3, "epoch", catalog_frames())
+    remaining = {entry.name for entry in os.scandir(directory) if entry.is_dir()}
+    assert remaining == {second, third, "epoch-9-other"}
+
+
+# 열 스냅샷으로 차갑게 시작한 캐시에 변경분(새 유닛/부품, 이름/단가 변경)을 합쳐도 SQLite 에서 읽은 것과 같아야 한다
+def test_cold_start_keeps_categories_and_merges_changes(tmp_path):
+    repo = db.get_repository(str(tmp_path / "catalog.db"))
+    resistor = repo.insert_ingredient("저항", 500)
+    capacitor = repo.insert_ingredient("콘덴서", 1200)
+    repo.insert_menu("전원부", "2024-01-02", [(resistor, 2), (capacitor, 1)])
+    warm = CatalogCache(repo)
+    warm.get()
+    warm.columns.flush()
+
+    cold = CatalogCache(repo)
+    snapshot = cold.get()
+    assert isinstance(snapshot.menu_df["MenuName"].dtype, pd.CategoricalDtype)
+    assert isinstance(snapshot.ingredient_df["IngredientName"].dtype, pd.CategoricalDtype)
+    assert isinstance(snapshot.menu_ingredients_df["IngredientName"].dtype, pd.CategoricalDtype)
+
+    diode = repo.insert_ingredient("다이오드", 300)
+    repo.insert_menu("통신부", "2024-01-03", [(diode, 4), (resistor, 1)])
+    repo.upsert_ingredients([("저항", 700)])
+    with repo.pool.transaction() as conn:
+        conn.execute("UPDATE Menus SET MenuName = '전원 공급부' WHERE MenuName = '전원부'")
+        conn.execute("UPDATE Ingredients SET IngredientName = '세라믹 콘덴서' WHERE IngredientID = ?", (capacitor,))
+
+    merged = cold.get()
+    expected = CatalogCache(repo, columns=False).get()
+    for name in ("menu_df", "ingredient_df", "menu_ingredients_df", "menu_components_df"):
+        actual = getattr(merged, name)
+        for column in set(DICTIONARY_COLUMNS) & set(actual.columns):
+            assert isinstance(actual[column].dtype, pd.CategoricalDtype), (name, column)
+        pd.testing.assert_frame_equal(decoded(actual).reset_index(drop=True),
+                                      getattr(expected, name).reset_index(drop=True), check_dtype=False)
+
+
+def decoded(df):
+    return df.astype({column: str for column in df.columns if isinstance(df[column].dtype, pd.CategoricalDtype)})
@@ -0,0 +1,122 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from benchmarks.bench_cost_engine import legacy_menu_costs, legacy_part_rollup
+from gsi_core import db
+from gsi_core.cost_engine import CostEngine
+from gsi_core.money import QUANTITY_SCALE, from_minor, to_milli_array, to_minor_array
+
+# ID 순서와 BOM 행 순서를 일부러 섞어 둔 고정 카탈로그 (가격은 최소 단위)
+MENU_DF = pd.DataFrame({"ID": [3, 1, 2], "MenuName": ["제어부", "전원부", "통신부"], "Quantity": [2, 0, 3]})
+INGREDIENT_DF = pd.DataFrame({"ID": [10, 20, 30, 40], "IngredientName": ["저항", "콘덴서", "다이오드", "퓨즈"],
+                              "Price": [500, 1250, 80, 999]})
+MI_DF = pd.DataFrame({
+    "MenuID": [2, 3, 1, 3, 2, 3],
+    "IngredientID": [30, 10, 20, 30, 10, 20],
+    "Quantity": [1.5, 0.5, 2.0, 4.0, 0.25, 1.0],
+})
+
+
+@pytest.fixture
+def engine():
+    return CostEngine.from_frames(MENU_DF, MI_DF, INGREDIENT_DF)
+
+
+# 기존 calculate_menu_costs / main() 루프는 원 단위 실수 단가로 계산했다
+def won_ingredients():
+    return INGREDIENT_DF.assign(Price=from_minor(INGREDIENT_DF["Price"]))
+
+
+def test_unit_costs_match_legacy_loop(engine):
+    costs = engine.unit_costs(MENU_DF["Quantity"].to_numpy(), INGREDIENT_DF["Price"].to_numpy())
+    legacy = legacy_menu_costs(MENU_DF, MI_DF, won_ingredients())
+    assert costs.tolist() == to_minor_array(legacy).tolist() == [3640, 0, 735]
+
+
+def test_part_rollup_matches_legacy_loop(engine):
+    quantities, costs = engine.part_rollup(MENU_DF["Quantity"].to_numpy(), INGREDIENT_DF["Price"].to_numpy())
+    legacy_quantities, legacy_costs = legacy_part_rollup(MENU_DF, MI_DF, won_ingredients())
+    assert quantities.tolist() == (to_milli_array(legacy_quantities) / QUANTITY_SCALE).tolist() == [1.75, 2.0, 12.5, 0.0]
+    assert costs.tolist() == to_minor_array(legacy_costs).tolist() == [875, 2500, 1000, 0]
+
+
+def test_sparse_part_quantities_match_dense(engine):
+    unit_quantities = MENU_DF["Quantity"].to_numpy()
+    units = np.flatnonzero(unit_quantities)
+    parts, quantities = engine.sparse_part_quantities(units, unit_quantities[units])
+    dense = engine.part_quantities(unit_quantities)
+    assert parts.tolist() == np.flatnonzero(dense).tolist()
+    assert quantities.tolist() == dense[parts].tolist()
+
+
+def test_where_used_matches_bom_rows(engine):
+    part_ids = [30, 40, 10]
+    index, units = engine.where_used(engine.part_positions(part_ids))
+    expected = sorted(
+        (i, position)
+        for i, part_id in enumerate(part_ids)
+        for position in engine.unit_positions(MI_DF.loc[MI_DF["IngredientID"] == part_id, "MenuID"])
+    )
+    assert list(zip(index.tolist(), units.tolist())) == expected == [(0, 0), (0, 2), (2, 0), (2, 2)]
+
+
+# 제어반(1) ⊃ 제어부(2) × 2 ⊃ 전원부(3) × 3 ⊃ 저항 0.5. 하위 유닛이 상위 유닛보다 뒤에 오도록 둔다
+NESTED_MENU_DF = pd.DataFrame({"ID": [1, 2, 3], "MenuName": ["제어반", "제어부", "전원부"]})
+NESTED_MI_DF = pd.DataFrame({"MenuID": [1, 2, 3], "IngredientID": [20, 30, 10], "Quantity": [1.0, 4.0, 0.5]})
+NESTED_MC_DF = pd.DataFrame({"ParentMenuID": [1, 2], "ChildMenuID": [2, 3], "Quantity": [2.0, 3.0]})
+
+
+def test_three_level_bom_multiplies_quantities():
+    engine = CostEngine.from_frames(NESTED_MENU_DF, NESTED_MI_DF, INGREDIENT_DF, NESTED_MC_DF)
+    assert engine.depth == 3
+    # 제어반 1개: 저항 2 × 3 × 0.5 = 3, 콘덴서 1, 다이오드 2 × 4 = 8
+    assert engine.part_quantities([1, 0, 0]).tolist() == [3.0, 1.0, 8.0, 0.0]
+    assert engine.part_quantities([0, 1, 0]).tolist() == [1.5, 0.0, 4.0, 0.0]
+    prices = INGREDIENT_DF["Price"].to_numpy()
+    assert engine.unit_prices(prices).tolist() == [3 * 500 + 1250 + 8 * 80, 1.5 * 500 + 4 * 80, 250]
+    # 하위 유닛을 거쳐 저항을 쓰는 상위 유닛도 찾는다
+    assert engine.where_used(engine.part_positions([10]))[1].tolist() == [0, 1, 2]
+
+
+@pytest.fixture
+def repo(tmp_path):
+    repo = db.get_repository(str(tmp_path / "catalog.db"))
+    yield repo
+    repo.pool.close()
+
+
+def test_add_component_rejects_cycles(repo):
+    top = repo.insert_menu("제어반", "2024-01-01")
+    middle = repo.insert_menu("제어부", "2024-01-01")
+    bottom = repo.insert_menu("전원부", "2024-01-01")
+    repo.add_component(top, middle, 2)
+    repo.add_component(middle, bottom, 3)
+
+    with pytest.raises(ValueError):
+        repo.add_component(top, top, 1)
+    with pytest.raises(ValueError):
+        repo.add_component(middle, top, 1)
+    with pytest.raises(ValueError):
+        repo.add_component(bottom, top, 1)
+    # 거절된 구성은 남지 않고, 순환이 아닌 구성(같은 하위 유닛을 한 번 더)은 그대로 받는다
+    repo.add_component(top, bottom, 1)
+    with repo.pool.connection() as conn:
+        rows = conn.execute("SELECT ParentMenuID, ChildMenuID, Quantity FROM MenuComponents ORDER BY 1, 2").fetchall()
+    assert rows == [(top, middle, 2), (top, bottom, 1), (middle, bottom, 3)]
+
+
+def test_price_only_change_reuses_engine_memo():
+    engine = CostEngine.from_frames(NESTED_MENU_DF, NESTED_MI_DF, INGREDIENT_DF, NESTED_MC_DF)
+    engine.unit_prices(INGREDIENT_DF["Price"].to_numpy())
+
+    repriced = INGREDIENT_DF.assign(Price=[600, 1250, 80, 999])
+    reused = CostEngine.from_frames(NESTED_MENU_DF, NESTED_MI_DF, repriced, NESTED_MC_DF, previous=engine)
+    assert reused is engine
+    fresh = CostEngine.from_frames(NESTED_MENU_DF, NESTED_MI_DF, repriced, NESTED_MC_DF)
+    prices = repriced["Price"].to_numpy()
+    assert reused.unit_prices(prices).tolist() == fresh.unit_prices(prices).tolist()
+
+    # 구성이 바뀌면 새 엔진을 만든다
+    changed = NESTED_MC_DF.assign(Quantity=[2.0, 4.0])
+    assert CostEngine.from_frames(NESTED_MENU_DF, NESTED_MI_DF, repriced, changed, previous=engine) is not engine
@@ -0,0 +1,43 @@
+import threading
+
+from gsi_core import db
+
+
+# 한 데이터베이스를 업그레이드하는 동안에도 다른 데이터베이스는 바로 열리고,
+# 같은 데이터베이스를 동시에 열면 업그레이드는 한 번만 하고 같은 풀을 나눠 쓴다
+def test_schema_upgrade_runs_once_outside_the_global_lock(tmp_path, monkeypatch):
+    slow_path, other_path = str(tmp_path / "slow.db"), str(tmp_path / "other.db")
+    create_schema = db.CatalogRepository.create_schema
+    started, release = threading.Event(), threading.Event()
+    upgrades = []
+
+    def slow_create_schema(repo):
+        upgrades.append(repo.pool.path)
+        if repo.pool.path == slow_path:
+            started.set()
+            release.wait(10)
+        return create_schema(repo)
+
+    monkeypatch.setattr(db.CatalogRepository, "create_schema", slow_create_schema)
+    pools = []
+    threads = [threading.Thread(target=lambda: pools.append(db.get_pool(slow_path))) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    assert started.wait(10)
+
+    others = []
+    opener = threading.Thread(target=lambda: others.append(db.get_pool(other_path)))
+    opener.start()
+    opener.join(5)
+    # 느린 업그레이드가 끝나기 전에 열렸다
+    opened_while_upgrading = not opener.is_alive()
+    release.set()
+    opener.join(10)
+    for thread in threads:
+        thread.join(10)
+
+    assert opened_while_upgrading
+    assert len(pools) == 3 and all(pool is pools[0] for pool in pools)
+    assert upgrades.count(slow_path) == 1 and upgrades.count(other_path) == 1
+    pools[0].close()
+    others[0].close()
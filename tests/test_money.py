@@ -0,0 +1,73 @@
+import numpy as np
+import pytest
+
+from gsi_core.money import (QuoteTotals, amounts, apply_rate, as_minor_array, percent_to_bp, quote_totals,
+                            round_div_array, to_milli, to_minor)
+
+
+@pytest.mark.parametrize("won, minor", [
+    (0.005, 1),
+    (0.015, 2),
+    (1.005, 101),
+    (2.675, 268),
+    (-0.005, -1),
+    (-2.675, -268),
+    (0.004, 0),
+    (1234, 123400),
+])
+def test_to_minor_rounds_half_up(won, minor):
+    assert to_minor(won) == minor
+
+
+@pytest.mark.parametrize("quantity, milli", [
+    (0.0005, 1),
+    (1.0005, 1001),
+    (2.3335, 2334),
+    (-0.0005, -1),
+    (0.0004, 0),
+    (3, 3000),
+])
+def test_to_milli_rounds_half_up(quantity, milli):
+    assert to_milli(quantity) == milli
+
+
+def test_round_div_array_rounds_away_from_zero():
+    numerator = np.array([5, 15, 14, -5, -15, -14, 0, 2500])
+    assert round_div_array(numerator, 10).tolist() == [1, 2, 1, -1, -2, -1, 0, 250]
+
+
+def test_amounts_round_each_line():
+    # 0.3 × 3.33 원 = 0.999 원, 1.5 × 0.75 원 = 1.125 원
+    assert amounts(np.array([0.3, 1.5]), np.array([333, 75])).tolist() == [100, 113]
+
+
+@pytest.mark.parametrize("percent, bp", [(10, 1000), (2.5, 250), (0.005, 1), (0.004, 0), (12.345, 1235)])
+def test_percent_to_bp(percent, bp):
+    assert percent_to_bp(percent) == bp
+
+
+def test_apply_rate_rounds_half_up():
+    # 1 원 × 50% = 0.5 원, 0.03 원 × 50% = 0.015 원
+    assert apply_rate(100, 5000) == 50
+    assert apply_rate(3, 5000) == 2
+    assert apply_rate(-3, 5000) == -2
+    assert apply_rate(np.array([3, 1, -3]), 5000).tolist() == [2, 1, -2]
+
+
+def test_quote_totals_margin_then_tax():
+    totals = quote_totals(123_457, 50_000, margin_rate=1250, tax_rate=1000)
+    # 마진 = 173,457 × 12.5% = 21,682.125 → 21,682, 부가세 = (173,457 + 21,682) × 10% = 19,513.9 → 19,514
+    assert totals == QuoteTotals(123_457, 50_000, 173_457, 1250, 21_682, 1000, 19_514, 214_653)
+
+
+def test_quote_totals_for_several_quotes():
+    totals = quote_totals(np.array([100, 333]), np.array([0, 0]), margin_rate=500, tax_rate=1000)
+    assert totals.margin.tolist() == [5, 17]
+    assert totals.tax.tolist() == [11, 35]
+    assert totals.total.tolist() == [116, 385]
+
+
+def test_as_minor_array_rejects_floats():
+    with pytest.raises(TypeError):
+        as_minor_array(np.array([12.5, 3.0]))
+    assert as_minor_array([125, 30]).dtype == np.int64
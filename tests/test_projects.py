@@ -0,0 +1,58 @@
+import io
+
+import openpyxl
+import pandas as pd
+import pytest
+
+from gsi_core import db, projects
+from gsi_core.money import quote_totals
+from gsi_core.quotes import issue_quote
+from gsi_core.workbook_cache import WorkbookCache
+
+
+@pytest.fixture
+def project_dirs(tmp_path, monkeypatch):
+    monkeypatch.setattr(db, "DB_PATH", str(tmp_path / "default.db"))
+    monkeypatch.setattr(projects, "PROJECTS_DIR", str(tmp_path / "projects"))
+    return tmp_path
+
+
+# 두 프로젝트에서 내용이 똑같은 견적을 발행한다
+def issue_same_quote(path, cache):
+    materials = pd.DataFrame({"ID": [1], "IngredientName": ["저항"], "Quantity": [2.0], "Price": [500],
+                              "TotalCost": [1000]})
+    menus = pd.DataFrame({"ID": [None], "MenuName": ["전원부"], "Quantity": [1.0], "TotalCost": [1000]})
+    return issue_quote(db.get_repository(path), cache, materials, quote_totals(1000, 0), 0, menus, 1)
+
+
+def quote_number_in(workbook):
+    values = {cell for ws in openpyxl.load_workbook(io.BytesIO(workbook)) for row in ws.iter_rows(values_only=True)
+              for cell in row}
+    return {value for value in values if isinstance(value, str) and value.startswith("GSI")}
+
+
+def test_quote_numbers_are_unique_across_projects(project_dirs):
+    cache = WorkbookCache(str(project_dirs / "workbooks"))
+    default = issue_same_quote(projects.open_project(None), cache)
+    alpha = issue_same_quote(projects.open_project("alpha", create=True), cache)
+    beta = issue_same_quote(projects.open_project("beta", create=True), cache)
+
+    numbers = [quote.header.quote_number for quote in (default, alpha, beta)]
+    assert len(set(numbers)) == 3
+    assert numbers[0].startswith("GSI-") and numbers[0].endswith("-0001")
+    assert numbers[1].startswith("GSI-alpha-") and numbers[2].startswith("GSI-beta-")
+
+
+def test_workbook_cache_is_separate_per_project(project_dirs):
+    cache = WorkbookCache(str(project_dirs / "workbooks"))
+    alpha = issue_same_quote(projects.open_project("alpha", create=True), cache)
+    beta = issue_same_quote(projects.open_project("beta", create=True), cache)
+    assert not alpha.cached and not beta.cached
+    assert quote_number_in(alpha.workbook) == {alpha.header.quote_number}
+    assert quote_number_in(beta.workbook) == {beta.header.quote_number}
+
+    # 같은 프로젝트에서 다시 발행하면 같은 번호와 캐시된 통합문서
+    again = issue_same_quote(projects.project_db_path("alpha"), cache)
+    assert again.cached
+    assert again.header.quote_number == alpha.header.quote_number
+    assert again.workbook == alpha.workbook
@@ -0,0 +1,125 @@
+import sqlite3
+
+import pytest
+
+from gsi_core.db import (
+    SQL_SELECT_CREATES_CYCLE,
+    SQL_SELECT_INGREDIENTS_SINCE,
+    SQL_SELECT_MENU_COMPONENTS_SINCE,
+    SQL_SELECT_MENU_INGREDIENTS,
+    SQL_SELECT_MENU_INGREDIENTS_SINCE,
+    SQL_SELECT_PRICES_AS_OF,
+    SQL_SELECT_QUOTE_BY_HASH,
+    SQL_SELECT_QUOTE_LINES,
+    SQL_SELECT_QUOTE_LINES_FOR_MENUS,
+    SQL_SEARCH_INGREDIENTS_LIKE,
+    SQL_SEARCH_INGREDIENTS_MATCH,
+    get_repository,
+)
+from gsi_core.migrations import SCHEMA_VERSION
+
+# 기존(v0) 데이터베이스를 제자리에서 업그레이드한 뒤 주요 조회가 인덱스를 쓰는지 확인한다
+# (인덱스를 빠뜨리거나 조회를 바꿔서 전체 스캔이 되면 실패한다)
+
+# (설명, SQL, 파라미터, 쿼리 계획에 반드시 나와야 하는 문자열들)
+CHECKS = [
+    ("유닛별 부품 조회",
+     'SELECT IngredientID, Quantity FROM MenuIngredients WHERE MenuID = ?', (1,),
+     ["SEARCH MenuIngredients USING INDEX sqlite_autoindex_MenuIngredients_1"]),
+    ("부품별 사용 유닛 조회 (where-used)",
+     'SELECT MenuID, Quantity FROM MenuIngredients WHERE IngredientID = ?', (2,),
+     ["SEARCH MenuIngredients USING COVERING INDEX idx_menuingredients_ingredient"]),
+    ("부품 이름 조회",
+     'SELECT IngredientID FROM Ingredients WHERE IngredientName = ?', ("STM32",),
+     ["SEARCH Ingredients USING COVERING INDEX idx_ingredients_name"]),
+    ("유닛 이름 조회",
+     'SELECT MenuID FROM Menus WHERE MenuName = ?', ("Power Management",),
+     ["SEARCH Menus USING COVERING INDEX idx_menus_name"]),
+    ("get_data 조인",
+     SQL_SELECT_MENU_INGREDIENTS, (),
+     ["SEARCH m USING INTEGER PRIMARY KEY", "SEARCH i USING INTEGER PRIMARY KEY"]),
+    ("변경분 조회 (부품)",
+     SQL_SELECT_INGREDIENTS_SINCE, (1,),
+     ["SEARCH Ingredients USING INDEX idx_ingredients_revision"]),
+    ("변경분 조회 (유닛-부품)",
+     SQL_SELECT_MENU_INGREDIENTS_SINCE, (1,),
+     ["SEARCH mi USING INDEX idx_menuingredients_revision"]),
+    ("변경분 조회 (하위 유닛)",
+     SQL_SELECT_MENU_COMPONENTS_SINCE, (1,),
+     ["SEARCH MenuComponents USING INDEX idx_menucomponents_revision"]),
+    ("순환 구성 검사 (재귀 CTE)",
+     SQL_SELECT_CREATES_CYCLE, (2, 1),
+     ["SEARCH mc USING COVERING INDEX sqlite_autoindex_MenuComponents_1 (ParentMenuID=?)"]),
+    ("기준일 단가 조회",
+     SQL_SELECT_PRICES_AS_OF, ("2024-03-31 23:59:59",),
+     ["SEARCH h USING INDEX idx_pricehistory_lookup (IngredientID=? AND EffectiveFrom<?)",
+      "SEARCH h USING INDEX idx_pricehistory_lookup (IngredientID=?)"]),
+    ("같은 내용 견적 조회",
+     SQL_SELECT_QUOTE_BY_HASH, ("0" * 64,),
+     ["SEARCH Quotes USING INDEX idx_quotes_contenthash (ContentHash=?)"]),
+    ("견적 항목 조회",
+     SQL_SELECT_QUOTE_LINES, (1,),
+     ["SEARCH QuoteLines USING INDEX sqlite_autoindex_QuoteLines_1 (QuoteID=?)"]),
+    ("유닛이 들어 있는 견적 행 (단가 변경 영향)",
+     SQL_SELECT_QUOTE_LINES_FOR_MENUS.format("?, ?"), (1, 2),
+     ["SEARCH l USING INDEX idx_quotelines_menu (MenuID=?)", "SEARCH q USING INTEGER PRIMARY KEY"]),
+    ("부품 검색 (짧은 검색어, 이름순)",
+     SQL_SEARCH_INGREDIENTS_LIKE, ("%32%", 51, 0),
+     ["SCAN Ingredients USING INDEX idx_ingredients_name"]),
+    ("부품 검색 (FTS5)",
+     SQL_SEARCH_INGREDIENTS_MATCH, ('"stm32"', 51, 0),
+     ["SCAN s VIRTUAL TABLE INDEX", "SEARCH i USING INTEGER PRIMARY KEY"]),
+]
+
+
+def create_legacy_database(path):
+    conn = sqlite3.connect(path)
+    conn.executescript('''
+        CREATE TABLE Menus (MenuID INTEGER PRIMARY KEY AUTOINCREMENT, MenuName TEXT NOT NULL, DateSubmitted TEXT NOT NULL);
+        CREATE TABLE Ingredients (IngredientID INTEGER PRIMARY KEY AUTOINCREMENT, IngredientName TEXT NOT NULL, Price REAL NOT NULL);
+        CREATE TABLE MenuIngredients (MenuID INTEGER, IngredientID INTEGER, Quantity REAL NOT NULL,
+            FOREIGN KEY (MenuID) REFERENCES Menus(MenuID), FOREIGN KEY (IngredientID) REFERENCES Ingredients(IngredientID));
+        INSERT INTO Menus (MenuName, DateSubmitted) VALUES ('Microcontrollers and Processors', '2024-01-02'), ('Power Management', '2024-01-04');
+        INSERT INTO Ingredients (IngredientName, Price) VALUES ('ATmega328', 2.0), ('STM32', 0.5), ('ESP32', 0.3);
+        -- 중복 (1, 2) 행과 존재하지 않는 부품(99)을 가리키는 행 포함
+        INSERT INTO MenuIngredients VALUES (1, 1, 2.0), (1, 2, 0.5), (1, 2, 0.25), (2, 3, 0.1), (2, 99, 1.0);
+    ''')
+    conn.commit()
+    conn.close()
+
+
+@pytest.fixture(scope="module")
+def repo(tmp_path_factory):
+    path = str(tmp_path_factory.mktemp("plans") / "legacy.db")
+    create_legacy_database(path)
+    repo = get_repository(path)
+    yield repo
+    repo.pool.close()
+
+
+def query_plan(conn, sql, params):
+    return " | ".join(row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params))
+
+
+def test_legacy_database_is_migrated(repo):
+    with repo.pool.connection() as conn:
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+        assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+        rows = conn.execute("SELECT MenuID, IngredientID, Quantity FROM MenuIngredients ORDER BY MenuID, IngredientID").fetchall()
+        # 중복 행은 수량을 합치고, 없는 부품을 가리키는 행은 버린다
+        assert rows == [(1, 1, 2.0), (1, 2, 0.75), (2, 3, 0.1)]
+        with pytest.raises(sqlite3.IntegrityError):
+            conn.execute("INSERT INTO MenuIngredients (MenuID, IngredientID, Quantity) VALUES (1, 999, 1.0)")
+
+
+# 기존 부품도 검색 색인에 들어갔는지
+def test_legacy_parts_are_searchable(repo):
+    assert [row[1] for row in repo.search_ingredients("stm3").rows] == ["STM32"]
+
+
+@pytest.mark.parametrize("label, sql, params, expected", CHECKS, ids=[check[0] for check in CHECKS])
+def test_query_uses_index(repo, label, sql, params, expected):
+    with repo.pool.connection() as conn:
+        plan = query_plan(conn, sql, params)
+    for step in expected:
+        assert step in plan, f"{label}: {plan}"
@@ -0,0 +1,131 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from gsi_core.cost_engine import CostEngine
+from gsi_core.quote_state import QuoteState
+
+# 유닛 1 (전원부): 저항 0.3, 콘덴서 2 / 유닛 2 (통신부): 저항 0.6, 다이오드 1.5
+MENU_DF = pd.DataFrame({"ID": [1, 2], "MenuName": ["전원부", "통신부"]})
+INGREDIENT_DF = pd.DataFrame({"ID": [10, 20, 30], "IngredientName": ["저항", "콘덴서", "다이오드"],
+                              "Price": [333, 1250, 75]})
+MI_DF = pd.DataFrame({"MenuID": [1, 1, 2, 2], "IngredientID": [10, 20, 10, 30], "Quantity": [0.3, 2.0, 0.6, 1.5]})
+
+
+@pytest.fixture
+def quote():
+    engine = CostEngine.from_frames(MENU_DF, MI_DF, INGREDIENT_DF)
+    quote = QuoteState()
+    quote.reprice((1, "epoch"), engine, INGREDIENT_DF["Price"].to_numpy(), MENU_DF["MenuName"],
+                  INGREDIENT_DF["IngredientName"])
+    return quote
+
+
+# 0.3 + 0.6 은 실수로 더하면 0.8999999999999999 가 되지만 표에는 0.9 가 나와야 한다
+def test_fractional_bom_quantities_are_exact(quote):
+    quote.set_unit_quantity(1, 1)
+    quote.set_unit_quantity(2, 1)
+    assert quote.unit_part_quantities() == {10: 0.9, 20: 2.0, 30: 1.5}
+
+    materials = quote.materials_frame()
+    assert materials["Quantity"].tolist() == [0.9, 2.0, 1.5]
+    # 0.9 × 3.33 원 = 2.997 원 → 3 원, 2 × 12.5 원, 1.5 × 0.75 원 = 1.125 원 → 1.13 원
+    assert materials["TotalCost"].tolist() == [300, 2500, 113]
+
+    quote.set_part_quantity(10, 0.1)
+    materials = quote.materials_frame()
+    assert materials["Quantity"].tolist() == [1.0, 2.0, 1.5]
+    assert materials["TotalCost"].tolist() == [333, 2500, 113]
+
+
+def test_engine_part_rollup_is_on_the_milli_grid():
+    engine = CostEngine.from_frames(MENU_DF, MI_DF, INGREDIENT_DF)
+    quantities, costs = engine.part_rollup(np.array([1, 3]), INGREDIENT_DF["Price"].to_numpy())
+    # 0.3 × 1 + 0.6 × 3 = 2.1 (실수 계산은 2.0999999999999996)
+    assert quantities.tolist() == [2.1, 2.0, 4.5]
+    assert costs.tolist() == [699, 2500, 338]
+
+
+# 유닛 1개 비용: 전원부 = 0.3 × 3.33 원 (→ 1 원) + 2 × 12.5 원 = 26 원, 통신부 = 0.6 × 3.33 원 (→ 2 원) + 1.5 × 0.75 원 (→ 1.13 원) = 3.13 원
+def test_set_quantities_update_totals(quote):
+    quote.set_unit_quantity(1, 2)
+    quote.set_unit_quantity(2, 3)
+    assert quote.unit_total == 2 * 2600 + 3 * 313
+    quote.set_part_quantity(30, 4)
+    assert quote.part_total == 300
+    assert quote.material_total == 2 * 2600 + 3 * 313 + 300
+
+    quote.set_unit_quantity(1, 1)
+    assert quote.unit_total == 2600 + 3 * 313
+    assert quote.units[1].quantity == 1 and quote.units[1].total == 2600
+
+
+def test_zero_quantity_drops_the_line(quote):
+    quote.set_unit_quantity(1, 2)
+    quote.set_unit_quantity(2, 1)
+    quote.set_part_quantity(30, 4)
+
+    quote.set_unit_quantity(1, 0)
+    quote.set_part_quantity(30, 0)
+    assert list(quote.units) == [2] and quote.parts == {}
+    assert (quote.unit_total, quote.part_total) == (313, 0)
+    assert quote.units_frame()["ID"].tolist() == [2]
+    assert quote.materials_frame()["ID"].tolist() == [10, 30]
+
+
+def test_reprice_after_catalog_change(quote):
+    quote.set_unit_quantity(1, 1)
+    quote.set_part_quantity(30, 2)
+    quote.set_included(30, True)
+    engine = quote._catalog[1]
+    assert not quote.reprice((1, "epoch"), engine, INGREDIENT_DF["Price"].to_numpy(), MENU_DF["MenuName"],
+                             INGREDIENT_DF["IngredientName"])
+
+    # 저항 단가 인상 (3.33 원 → 4 원)과 유닛 이름 변경
+    prices = np.array([400, 1250, 75])
+    assert quote.reprice((2, "epoch"), engine, prices, pd.Series(["전원부 A", "통신부"]), INGREDIENT_DF["IngredientName"])
+    assert (quote.units[1].name, quote.units[1].price) == ("전원부 A", 120 + 2500)
+    assert quote.unit_total == 2620 and quote.part_total == 150
+
+    # 다이오드가 카탈로그에서 지워지면 직접 추가한 줄과 선택도 사라진다
+    ingredient_df = INGREDIENT_DF.iloc[:2].assign(Price=[400, 1250])
+    mi_df = MI_DF[MI_DF["IngredientID"] != 30]
+    engine = CostEngine.from_frames(MENU_DF, mi_df, ingredient_df)
+    quote.reprice((3, "epoch"), engine, ingredient_df["Price"].to_numpy(), MENU_DF["MenuName"],
+                  ingredient_df["IngredientName"])
+    assert quote.parts == {} and quote.included == set()
+    assert (quote.unit_total, quote.part_total) == (2620, 0)
+
+
+def test_frame_row_order(quote):
+    quote.set_part_quantity(30, 1)
+    quote.set_unit_quantity(2, 1)
+    quote.set_unit_quantity(1, 2)
+    # 유닛 표는 입력한 순서, 부품 표는 ingredient_df 순서
+    units = quote.units_frame()
+    assert units["ID"].tolist() == [2, 1]
+    assert units["TotalCost"].tolist() == [313, 5200]
+    assert quote.materials_frame()["ID"].tolist() == [10, 20, 30]
+    # part_ids 를 주면 그 부품만 ingredient_df 순서로
+    selected = quote.materials_frame([30, 20])
+    assert selected["ID"].tolist() == [20, 30]
+    assert selected["Quantity"].tolist() == [4.0, 2.5]
+
+    # 수량이 없는 부품은 0 으로 나온다
+    quote.set_part_quantity(30, 0)
+    quote.set_unit_quantity(2, 0)
+    assert quote.materials_frame([30])["Quantity"].tolist() == [0.0]
+
+
+def test_unit_and_direct_part_quantities_merge_into_one_row(quote):
+    quote.set_unit_quantity(1, 2)
+    quote.set_part_quantity(10, 1.4)
+    quote.set_part_quantity(20, 1)
+
+    materials = quote.materials_frame()
+    assert materials["ID"].tolist() == [10, 20]
+    # 저항 0.3 × 2 + 1.4 = 2, 콘덴서 2 × 2 + 1 = 5 (한 줄씩)
+    assert materials["Quantity"].tolist() == [2.0, 5.0]
+    assert materials["TotalCost"].tolist() == [666, 6250]
+    # 유닛에서 나온 수량만 따로
+    assert quote.unit_part_quantities() == {10: 0.6, 20: 4.0}
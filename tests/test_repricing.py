@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+
+from gsi_core import db
+from gsi_core.catalog_cache import CatalogCache
+from gsi_core.cost_engine import CostEngine
+from gsi_core.repricing import reprice
+
+
+@pytest.fixture
+def cache(tmp_path):
+    repo = db.get_repository(str(tmp_path / "catalog.db"))
+    resistor = repo.insert_ingredient("저항", 333)
+    capacitor = repo.insert_ingredient("콘덴서", 1250)
+    diode = repo.insert_ingredient("다이오드", 75)
+    power = repo.insert_menu("전원부", "2024-01-01", [(resistor, 0.3), (capacitor, 2)])
+    repo.insert_menu("통신부", "2024-01-01", [(diode, 1.5)])
+    # 제어부는 저항을 전원부를 거쳐서만 쓴다
+    repo.insert_menu("제어부", "2024-01-01", [(capacitor, 1)], [(power, 2)])
+    repo.insert_menu("퓨즈함", "2024-01-01", [(diode, 1)])
+    yield CatalogCache(repo, columns=False)
+    repo.pool.close()
+
+
+# 전체 카탈로그로 엔진을 새로 만들어 유닛 1개 비용을 처음부터 계산한다
+def full_unit_prices(snapshot, prices):
+    engine = CostEngine.from_frames(snapshot.menu_df, snapshot.menu_ingredients_df, snapshot.ingredient_df,
+                                    snapshot.menu_components_df)
+    return dict(zip(engine.menu_ids.tolist(), engine.unit_prices(prices).tolist()))
+
+
+def test_price_change_matches_full_recompute(cache):
+    before = cache.get()
+    old_prices = before.ingredient_df["Price"].to_numpy()
+    new_prices = np.where(before.ingredient_df["IngredientName"] == "저항", 400, old_prices)
+    report = reprice(cache, [(1, 400)])
+
+    old = full_unit_prices(before, old_prices)
+    new = full_unit_prices(before, new_prices)
+    changed = {unit_id for unit_id in old if new[unit_id] != old[unit_id]}
+    names = dict(zip(before.menu_df["ID"].tolist(), before.menu_df["MenuName"].tolist()))
+    assert {names[unit_id] for unit_id in changed} == {"전원부", "제어부"}
+
+    assert set(report.units["ID"]) == changed
+    for row in report.units.itertuples(index=False):
+        assert (row.OldPrice, row.NewPrice, row.Delta) == (old[row.ID], new[row.ID], new[row.ID] - old[row.ID])
+    assert report.parts["Units"].tolist() == [2]
+    assert not report.applied and cache.get() is before
+
+    # 반영하면 새 스냅샷의 유닛 비용이 보고서의 새 비용과 같다
+    assert reprice(cache, [(1, 400)], apply=True).applied
+    after = cache.get()
+    assert after.ingredient_df["Price"].tolist() == new_prices.tolist()
+    current = full_unit_prices(after, after.ingredient_df["Price"].to_numpy())
+    assert current == new
+    assert dict(zip(after.menu_df["ID"].tolist(), after.engine.unit_prices(new_prices).tolist())) == new